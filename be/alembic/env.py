@@ -13,10 +13,18 @@ from sqlalchemy import engine_from_config, pool
 from app.config import settings
 from app.database import Base
 
-# Importar todos los modelos para que Alembic los detecte
+# Importar todos los modelos para que Alembic los detecte (autogenerate)
+from app.models.email_outbox import EmailOutbox  # noqa: F401
+from app.models.inventory import Inventory  # noqa: F401
+from app.models.inventory_movement import InventoryMovement  # noqa: F401
+from app.models.inventory_snapshot_checkpoint import InventorySnapshotCheckpoint  # noqa: F401
+from app.models.inventory_stock_snapshot import InventoryStockSnapshot  # noqa: F401
+from app.models.password_reset_token import PasswordResetToken  # noqa: F401
+from app.models.rate_limit_bucket import RateLimitBucket  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
 from app.models.role import Role  # noqa: F401
+from app.models.type_document import TypeDocument  # noqa: F401
 from app.models.user import User  # noqa: F401
-from app.models.password_reset_token import PasswordResetToken  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,450 @@
+"""Línea base: esquema de db/init antes de versionar (tablas, índices, triggers y catálogos)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+Reproduce db/init/01_create_tables.sql, 02_triggers_and_indexes.sql y
+99_seed_type_documents.sql (sin comentarios) tal como estaban antes de la
+primera migración: sin `users.token_version`, `refresh_tokens`, `email_outbox`
+ni `rate_limit_buckets`, y con el token de recuperación en claro. Los cambios
+posteriores son las revisiones siguientes.
+
+Una BD existente creada con ese db/init (o con `create_all` en esa versión) se
+marca con `alembic stamp 0001_baseline` y luego `alembic upgrade head`. Una BD
+nueva creada por Docker con el db/init actual ya queda en la última revisión
+(db/init/03_schema_version.sql).
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# ────────────────────────────
+# 🏷️ Extensiones y tipos ENUM
+# ────────────────────────────
+TYPES_SQL = r"""
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+CREATE TYPE occupation_type AS ENUM (
+    'jefe', 'cortador', 'guarnecedor', 'solador', 'emplantillador'
+);
+
+CREATE TYPE supplies_movement_type AS ENUM ('entrada', 'salida');
+
+CREATE TYPE inventory_movement_type AS ENUM ('entrada', 'salida', 'ajuste');
+
+CREATE TYPE order_status AS ENUM ('pendiente', 'en_progreso', 'completado', 'cancelado');
+
+CREATE TYPE task_status AS ENUM ('pendiente', 'en_progreso', 'completado', 'cancelado');
+
+CREATE TYPE task_priority AS ENUM ('baja', 'media', 'alta');
+
+CREATE TYPE task_type AS ENUM ('corte', 'guarnicion', 'soladura', 'emplantillado');
+
+CREATE TYPE incidence_status AS ENUM ('abierta', 'en_progreso', 'resuelta', 'cerrada');
+
+CREATE TYPE notification_type AS ENUM ('info', 'advertencia', 'error', 'exito');
+"""
+
+# ────────────────────────────
+# 🗄️ Tablas e índices (db/init/01_create_tables.sql)
+# ────────────────────────────
+TABLES_SQL = r"""
+CREATE TABLE IF NOT EXISTS roles (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name VARCHAR(50) UNIQUE NOT NULL,
+    description VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+INSERT INTO roles (name, description) VALUES
+    ('admin', 'Administrador del sistema — acceso completo a código, configuración y datos'),
+    ('employee', 'Empleado de la fábrica — gestión de tareas, producción y operaciones'),
+    ('client', 'Cliente — gestión de pedidos, visualización de catálogo y seguimiento')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS type_document (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name VARCHAR(100) UNIQUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    email VARCHAR(255) UNIQUE NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    last_name VARCHAR(255) NOT NULL,
+    phone VARCHAR(20),
+    identity_document VARCHAR(20),
+    identity_document_type_id UUID REFERENCES type_document(id),
+    role_id UUID NOT NULL REFERENCES roles(id),
+    is_active BOOLEAN DEFAULT FALSE NOT NULL,
+    is_validated BOOLEAN DEFAULT FALSE NOT NULL,
+    must_change_password BOOLEAN DEFAULT FALSE NOT NULL,
+    business_name VARCHAR(255),
+    occupation occupation_type,
+    validated_by UUID REFERENCES users(id),
+    validated_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS password_reset_tokens (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token VARCHAR(255) UNIQUE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    used BOOLEAN DEFAULT FALSE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_password_reset_tokens_token ON password_reset_tokens(token);
+
+CREATE TABLE IF NOT EXISTS supplies (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS supplies_movement (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    supplies_id UUID NOT NULL REFERENCES supplies(id),
+    user_id UUID NOT NULL REFERENCES users(id),
+    type_of_movement supplies_movement_type NOT NULL,
+    amount NUMERIC(10, 2) NOT NULL,
+    colour VARCHAR(100),
+    size VARCHAR(50),
+    movement_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS brands (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS "references" (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    brand_id UUID NOT NULL REFERENCES brands(id),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    category_id UUID NOT NULL REFERENCES categories(id),
+    brand_id UUID NOT NULL REFERENCES brands(id),
+    reference_id UUID NOT NULL REFERENCES "references"(id),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    state BOOLEAN DEFAULT TRUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS inventory (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    product_id UUID NOT NULL REFERENCES products(id),
+    size VARCHAR(50) NOT NULL,
+    colour VARCHAR(100),
+    amount NUMERIC(10, 2) NOT NULL,
+    minimum_stock INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS inventory_movement (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    product_id UUID NOT NULL REFERENCES products(id),
+    user_id UUID NOT NULL REFERENCES users(id),
+    type_of_movement inventory_movement_type NOT NULL,
+    size VARCHAR(50),
+    colour VARCHAR(100),
+    amount NUMERIC(10, 2) NOT NULL,
+    reason VARCHAR(255),
+    movement_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    description TEXT NOT NULL,
+    priority task_priority NOT NULL,
+    type task_type NOT NULL,
+    status task_status DEFAULT 'pendiente' NOT NULL,
+    deadline TIMESTAMP WITH TIME ZONE,
+    assignment_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    customer_id UUID NOT NULL REFERENCES users(id),
+    total_pairs INTEGER NOT NULL,
+    state order_status DEFAULT 'pendiente' NOT NULL,
+    delivery_date TIMESTAMP WITH TIME ZONE,
+    creation_date TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS order_details (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    order_id UUID NOT NULL REFERENCES orders(id),
+    product_id UUID NOT NULL REFERENCES products(id),
+    size VARCHAR(50) NOT NULL,
+    colour VARCHAR(100),
+    amount INTEGER NOT NULL,
+    state order_status DEFAULT 'pendiente' NOT NULL,
+    order_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS vale (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    size VARCHAR(50),
+    colour VARCHAR(100),
+    amount NUMERIC(10, 2),
+    creation_date TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS detail_vale (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    task_id UUID NOT NULL REFERENCES tasks(id),
+    product_id UUID NOT NULL REFERENCES products(id),
+    user_id UUID NOT NULL REFERENCES users(id),
+    vale_id UUID NOT NULL REFERENCES vale(id),
+    size VARCHAR(50),
+    colour VARCHAR(100),
+    amount NUMERIC(10, 2),
+    creation_date TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS incidence (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    task_id UUID NOT NULL REFERENCES tasks(id),
+    type VARCHAR(100) NOT NULL,
+    description TEXT,
+    state incidence_status DEFAULT 'abierta' NOT NULL,
+    report_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id),
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    type notification_type DEFAULT 'info' NOT NULL,
+    state BOOLEAN DEFAULT FALSE NOT NULL,
+    creation_date TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_supplies_movement_supplies_id ON supplies_movement(supplies_id);
+CREATE INDEX IF NOT EXISTS idx_supplies_movement_user_id ON supplies_movement(user_id);
+CREATE INDEX IF NOT EXISTS idx_categories_name ON categories(name);
+CREATE INDEX IF NOT EXISTS idx_brands_name ON brands(name);
+CREATE INDEX IF NOT EXISTS idx_products_category_id ON products(category_id);
+CREATE INDEX IF NOT EXISTS idx_products_brand_id ON products(brand_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_product_id ON inventory(product_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_movement_product_id ON inventory_movement(product_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_movement_user_id ON inventory_movement(user_id);
+CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON orders(customer_id);
+CREATE INDEX IF NOT EXISTS idx_order_details_order_id ON order_details(order_id);
+CREATE INDEX IF NOT EXISTS idx_order_details_product_id ON order_details(product_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_incidence_task_id ON incidence(task_id);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id);
+CREATE INDEX IF NOT EXISTS idx_notifications_state ON notifications(state);
+"""
+
+# ────────────────────────────
+# ⚙️ Triggers, índices parciales y constraints (db/init/02_triggers_and_indexes.sql)
+# ────────────────────────────
+TRIGGERS_SQL = r"""
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER trg_roles_updated_at
+    BEFORE UPDATE ON roles
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+CREATE OR REPLACE TRIGGER trg_users_updated_at
+    BEFORE UPDATE ON users
+    FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_users_email_active
+    ON users (email)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_users_role_id_active
+    ON users (role_id)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_users_role_validated
+    ON users (role_id, is_validated)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_roles_name_active
+    ON roles (name)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_prt_token_unused
+    ON password_reset_tokens (token)
+    WHERE used = FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_prt_user_id
+    ON password_reset_tokens (user_id);
+
+CREATE INDEX IF NOT EXISTS idx_prt_expires_at
+    ON password_reset_tokens (expires_at);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_users_email_format'
+    ) THEN
+        ALTER TABLE users
+            ADD CONSTRAINT chk_users_email_format
+            CHECK (email LIKE '%@%');
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_users_phone_format'
+    ) THEN
+        ALTER TABLE users
+            ADD CONSTRAINT chk_users_phone_format
+            CHECK (phone IS NULL OR phone ~ '^[0-9\s\+\-\(\)]+$');
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_users_validated_consistency'
+    ) THEN
+        ALTER TABLE users
+            ADD CONSTRAINT chk_users_validated_consistency
+            CHECK (
+                (is_validated = FALSE) OR
+                (is_validated = TRUE AND validated_at IS NOT NULL)
+            );
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_prt_expires_after_created'
+    ) THEN
+        ALTER TABLE password_reset_tokens
+            ADD CONSTRAINT chk_prt_expires_after_created
+            CHECK (expires_at > created_at);
+    END IF;
+END $$;
+"""
+
+# ────────────────────────────
+# 🌱 Catálogo inicial de tipos de documento (db/init/99_seed_type_documents.sql)
+# ────────────────────────────
+SEED_SQL = r"""
+INSERT INTO type_document (id, name) VALUES
+  ('00000000-0000-0000-0000-000000000001', 'Cédula de Ciudadanía (CC)'),
+  ('00000000-0000-0000-0000-000000000002', 'Tarjeta de Identidad (TI)'),
+  ('00000000-0000-0000-0000-000000000003', 'Pasaporte'),
+  ('00000000-0000-0000-0000-000000000004', 'Cédula de Extranjería (CE)'),
+  ('00000000-0000-0000-0000-000000000005', 'Permiso por Protección Temporal (PPT)'),
+  ('00000000-0000-0000-0000-000000000006', 'Documento de Identificación Personal (DIPS)')
+ON CONFLICT (name) DO NOTHING;
+"""
+
+# Orden inverso de dependencias (las FK se eliminan con CASCADE)
+_TABLES = (
+    "notifications", "incidence", "detail_vale", "vale", "order_details", "orders",
+    "tasks", "inventory_movement", "inventory", "products", "references", "brands",
+    "categories", "supplies_movement", "supplies", "password_reset_tokens", "users",
+    "type_document", "roles",
+)
+_TYPES = (
+    "notification_type", "incidence_status", "task_type", "task_priority", "task_status",
+    "order_status", "inventory_movement_type", "supplies_movement_type", "occupation_type",
+)
+
+
+def _execute(sql: str) -> None:
+    # El SQL va tal cual al driver: sin interpretar `:nombre` ni `%` como parámetros
+    op.get_bind().exec_driver_sql(sql, execution_options={"no_parameters": True})
+
+
+def upgrade() -> None:
+    _execute(TYPES_SQL)
+    _execute(TABLES_SQL)
+    _execute(TRIGGERS_SQL)
+    _execute(SEED_SQL)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        _execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
+    for type_name in _TYPES:
+        _execute(f"DROP TYPE IF EXISTS {type_name}")
+    _execute("DROP FUNCTION IF EXISTS set_updated_at()")
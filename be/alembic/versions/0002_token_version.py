@@ -0,0 +1,31 @@
+"""Usuarios: versión de tokens para revocar los access tokens emitidos
+
+Revision ID: 0002_token_version
+Revises: 0001_baseline
+Create Date: 2026-10-17 00:00:00
+
+- users.token_version: viaja en el claim `ver` de los JWT; al incrementarla
+  (cambio de contraseña, sesiones revocadas) los tokens emitidos antes dejan
+  de ser válidos.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_token_version"
+down_revision: str | None = "0001_baseline"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,52 @@
+"""Refresh tokens guardados en la BD, con rotación y revocación por familia
+
+Revision ID: 0003_refresh_tokens
+Revises: 0002_token_version
+Create Date: 2026-10-17 00:00:00
+
+- refresh_tokens: un registro por refresh token emitido (`jti`); los de una
+  misma sesión comparten `family_id`.
+- idx_refresh_tokens_revoked: familias revocadas aún vigentes, que cada worker
+  carga al arrancar.
+
+Los refresh tokens emitidos antes de esta revisión no tienen registro: sus
+usuarios deben volver a iniciar sesión.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_refresh_tokens"
+down_revision: str | None = "0002_token_version"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE refresh_tokens (
+            jti UUID PRIMARY KEY,
+            family_id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            used_at TIMESTAMP WITH TIME ZONE,
+            revoked_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+        )
+        """
+    )
+    op.create_index("idx_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+    op.create_index("idx_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index(
+        "idx_refresh_tokens_revoked",
+        "refresh_tokens",
+        ["expires_at"],
+        postgresql_where=sa.text("revoked_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("refresh_tokens")
@@ -0,0 +1,50 @@
+"""Catálogos: NOTIFY al cambiar `type_document` o `roles`
+
+Revision ID: 0004_catalog_notify
+Revises: 0003_refresh_tokens
+Create Date: 2026-10-17 00:00:00
+
+- notify_catalog_changed(): envía `pg_notify('catalog_changed', <tabla>)`.
+- trg_type_document_notify y trg_roles_notify: un aviso por sentencia, para
+  que cada worker invalide su caché en memoria del catálogo.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_catalog_notify"
+down_revision: str | None = "0003_refresh_tokens"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION notify_catalog_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('catalog_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_FUNCTION_SQL)
+    for table in ("type_document", "roles"):
+        op.execute(
+            f"""
+            CREATE OR REPLACE TRIGGER trg_{table}_notify
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT
+            EXECUTE FUNCTION notify_catalog_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in ("type_document", "roles"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_notify ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_catalog_changed()")
@@ -0,0 +1,48 @@
+"""Outbox de emails enviados en segundo plano
+
+Revision ID: 0005_email_outbox
+Revises: 0004_catalog_notify
+Create Date: 2026-10-17 00:00:00
+
+- email_outbox: emails encolados en la misma transacción que los origina.
+- idx_email_outbox_pending: el despachador busca los pendientes por fecha de
+  intento.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_email_outbox"
+down_revision: str | None = "0004_catalog_notify"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE email_outbox (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            recipient VARCHAR(255) NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            status VARCHAR(20) DEFAULT 'pending' NOT NULL,
+            attempts INTEGER DEFAULT 0 NOT NULL,
+            next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+            last_error TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+        )
+        """
+    )
+    op.create_index(
+        "idx_email_outbox_pending",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("email_outbox")
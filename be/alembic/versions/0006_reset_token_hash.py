@@ -0,0 +1,50 @@
+"""Tokens de recuperación: se guarda el SHA-256 en lugar del token en claro
+
+Revision ID: 0006_reset_token_hash
+Revises: 0005_email_outbox
+Create Date: 2026-10-17 00:00:00
+
+- password_reset_tokens.token_hash (BYTEA, 32 bytes, único) reemplaza a `token`.
+  Los tokens existentes se convierten a su hash, así que los enlaces ya
+  enviados siguen funcionando hasta que venzan.
+- Se eliminan `token` y sus índices (idx_password_reset_tokens_token,
+  idx_prt_token_unused): la búsqueda usa el índice único de `token_hash`.
+
+El downgrade no puede recuperar los tokens en claro: elimina las filas.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_reset_token_hash"
+down_revision: str | None = "0005_email_outbox"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE password_reset_tokens ADD COLUMN token_hash BYTEA")
+    op.execute("UPDATE password_reset_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.execute(
+        "ALTER TABLE password_reset_tokens "
+        "ALTER COLUMN token_hash SET NOT NULL, "
+        "ADD CONSTRAINT password_reset_tokens_token_hash_key UNIQUE (token_hash), "
+        "ADD CONSTRAINT password_reset_tokens_token_hash_check "
+        "CHECK (octet_length(token_hash) = 32)"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_prt_token_unused")
+    op.execute("DROP INDEX IF EXISTS idx_password_reset_tokens_token")
+    op.drop_column("password_reset_tokens", "token")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM password_reset_tokens")
+    op.execute(
+        "ALTER TABLE password_reset_tokens ADD COLUMN token VARCHAR(255) UNIQUE NOT NULL"
+    )
+    op.create_index("idx_password_reset_tokens_token", "password_reset_tokens", ["token"])
+    op.execute(
+        "CREATE INDEX idx_prt_token_unused ON password_reset_tokens (token) WHERE used = FALSE"
+    )
+    op.drop_column("password_reset_tokens", "token_hash")
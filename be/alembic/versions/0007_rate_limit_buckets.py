@@ -0,0 +1,40 @@
+"""Contadores del limitador de intentos de login compartidos entre workers
+
+Revision ID: 0007_rate_limit_buckets
+Revises: 0006_reset_token_hash
+Create Date: 2026-10-17 00:00:00
+
+- rate_limit_buckets: una fila por clave (IP o email) y ventana fija; la usa
+  LOGIN_RATE_LIMIT_BACKEND=postgres.
+- idx_rate_limit_buckets_expires_at: elimina en bloque las filas vencidas.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_rate_limit_buckets"
+down_revision: str | None = "0006_reset_token_hash"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE rate_limit_buckets (
+            bucket_key VARCHAR(320) NOT NULL,
+            window_id BIGINT NOT NULL,
+            attempts INTEGER NOT NULL,
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (bucket_key, window_id)
+        )
+        """
+    )
+    op.create_index(
+        "idx_rate_limit_buckets_expires_at", "rate_limit_buckets", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
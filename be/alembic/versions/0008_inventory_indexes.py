@@ -0,0 +1,54 @@
+"""Inventario: índices compuestos de stock por variante e historial por fecha
+
+Revision ID: 0008_inventory
+Revises: 0007_rate_limit_buckets
+Create Date: 2026-10-17 00:00:00
+
+- idx_inventory_variant: único entre las filas activas de (product_id, size,
+  colour), con NULLS NOT DISTINCT (PostgreSQL 15+) para que la variante sin
+  color también sea única. Lo usan la búsqueda de stock y el upsert de entradas.
+- idx_inventory_movement_product_date: historial de un producto por fecha.
+- Se eliminan los índices de una columna sobre product_id: los compuestos
+  empiezan por product_id y los reemplazan.
+- chk_inventory_amount_non_negative: el stock nunca queda negativo.
+
+Falla si `inventory` ya tiene variantes activas duplicadas o stock negativo;
+en ese caso hay que consolidarlas antes de migrar.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_inventory"
+down_revision: str | None = "0007_rate_limit_buckets"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_inventory_variant",
+        "inventory",
+        ["product_id", "size", "colour"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "idx_inventory_movement_product_date",
+        "inventory_movement",
+        ["product_id", "movement_date", "id"],
+    )
+    op.drop_index("idx_inventory_product_id", table_name="inventory")
+    op.drop_index("idx_inventory_movement_product_id", table_name="inventory_movement")
+    op.create_check_constraint("chk_inventory_amount_non_negative", "inventory", "amount >= 0")
+
+
+def downgrade() -> None:
+    op.drop_constraint("chk_inventory_amount_non_negative", "inventory", type_="check")
+    op.create_index("idx_inventory_movement_product_id", "inventory_movement", ["product_id"])
+    op.create_index("idx_inventory_product_id", "inventory", ["product_id"])
+    op.drop_index("idx_inventory_movement_product_date", table_name="inventory_movement")
+    op.drop_index("idx_inventory_variant", table_name="inventory")
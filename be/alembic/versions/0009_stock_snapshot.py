@@ -0,0 +1,78 @@
+"""Inventario: snapshot de stock con checkpoint y refresco incremental
+
+Revision ID: 0009_stock_snapshot
+Revises: 0008_inventory
+Create Date: 2026-10-17 00:00:00
+
+- inventory_movement.xid (xid8): transacción que insertó el movimiento, asignada
+  por la BD. El job de services/stock_snapshot.py suma solo los movimientos con
+  xid menor que el xmin del snapshot actual (transacciones ya terminadas), así
+  que ninguno se salta por confirmarse tarde.
+- idx_inventory_movement_xid: recorre los movimientos posteriores al checkpoint.
+- inventory_stock_snapshot: stock por variante hasta el checkpoint.
+- inventory_snapshot_checkpoint: una fila con el último (xid, id) sumado.
+
+Agregar `xid` con un DEFAULT volátil reescribe `inventory_movement` bajo un
+lock exclusivo: en una tabla grande, migrar en una ventana de mantenimiento.
+Las filas existentes quedan con el xid de la migración y se suman en el primer
+refresco.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_stock_snapshot"
+down_revision: str | None = "0008_inventory"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE inventory_movement "
+        "ADD COLUMN xid xid8 NOT NULL DEFAULT pg_current_xact_id()"
+    )
+    op.create_index("idx_inventory_movement_xid", "inventory_movement", ["xid", "id"])
+
+    op.execute(
+        """
+        CREATE TABLE inventory_stock_snapshot (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            product_id UUID NOT NULL REFERENCES products(id),
+            size VARCHAR(50),
+            colour VARCHAR(100),
+            amount NUMERIC(14, 2) NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+        )
+        """
+    )
+    op.create_index(
+        "idx_inventory_stock_snapshot_variant",
+        "inventory_stock_snapshot",
+        ["product_id", "size", "colour"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+    op.execute(
+        """
+        CREATE TABLE inventory_snapshot_checkpoint (
+            id SMALLINT PRIMARY KEY DEFAULT 1,
+            movement_xid xid8 NOT NULL DEFAULT '0',
+            movement_id UUID NOT NULL DEFAULT '00000000-0000-0000-0000-000000000000',
+            movements_folded BIGINT NOT NULL DEFAULT 0,
+            refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+            CONSTRAINT chk_inventory_snapshot_checkpoint_single_row CHECK (id = 1)
+        )
+        """
+    )
+    op.execute("INSERT INTO inventory_snapshot_checkpoint DEFAULT VALUES")
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_snapshot_checkpoint")
+    op.drop_index("idx_inventory_stock_snapshot_variant", table_name="inventory_stock_snapshot")
+    op.drop_table("inventory_stock_snapshot")
+    op.drop_index("idx_inventory_movement_xid", table_name="inventory_movement")
+    op.drop_column("inventory_movement", "xid")
@@ -0,0 +1,61 @@
+"""Outbox de emails: plantillas que se arman al enviar
+
+Revision ID: 0010_email_outbox_template
+Revises: 0009_stock_snapshot
+Create Date: 2026-10-18 00:00:00
+
+- email_outbox.template / user_id: el email de recuperación se encola como
+  plantilla y usuario; el despachador emite el token y arma el enlace al
+  enviarlo, así que la tabla ya no guarda tokens en claro.
+- email_outbox.body pasa a ser opcional (solo los emails sin plantilla lo llevan).
+
+Los pendientes encolados antes con el enlace en el cuerpo se convierten a la
+plantilla (se envían con un token nuevo); los que no corresponden a ningún
+usuario se eliminan.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_email_outbox_template"
+down_revision: str | None = "0009_stock_snapshot"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE email_outbox
+            ADD COLUMN template VARCHAR(50),
+            ADD COLUMN user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+            ALTER COLUMN body DROP NOT NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE email_outbox o
+        SET template = 'password_reset', user_id = u.id, body = NULL
+        FROM users u
+        WHERE u.email = o.recipient AND o.body LIKE '%reset-password?token=%'
+        """
+    )
+    op.execute("DELETE FROM email_outbox WHERE body LIKE '%reset-password?token=%'")
+    op.create_check_constraint(
+        "email_outbox_body_check", "email_outbox", "body IS NOT NULL OR template IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    # Sin el despachador que las arma, las plantillas no pueden enviarse
+    op.execute("DELETE FROM email_outbox WHERE template IS NOT NULL")
+    op.drop_constraint("email_outbox_body_check", "email_outbox", type_="check")
+    op.execute(
+        """
+        ALTER TABLE email_outbox
+            DROP COLUMN user_id,
+            DROP COLUMN template,
+            ALTER COLUMN body SET NOT NULL
+        """
+    )
@@ -0,0 +1,34 @@
+"""Usuarios: índice de la lista paginada de pendientes de validación
+
+Revision ID: 0011_users_pending_validation
+Revises: 0010_email_outbox_template
+Create Date: 2026-10-18 00:00:00
+
+- idx_users_pending_validation: parcial sobre los usuarios activos sin validar,
+  con (role_id, created_at, id). Cubre el filtro por rol y el orden keyset de
+  GET /api/v1/admin/users/pending-validation, así que cada página lee solo sus
+  filas en lugar de ordenar todos los pendientes del rol.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_users_pending_validation"
+down_revision: str | None = "0010_email_outbox_template"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_users_pending_validation",
+        "users",
+        ["role_id", "created_at", "id"],
+        postgresql_where=sa.text("deleted_at IS NULL AND is_validated = FALSE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_users_pending_validation", table_name="users")
@@ -0,0 +1,50 @@
+"""Inventario: el snapshot de stock resta los movimientos eliminados después
+
+Revision ID: 0012_stock_snapshot_deletes
+Revises: 0011_users_pending_validation
+Create Date: 2026-10-18 00:00:00
+
+- idx_inventory_movement_deleted: parcial sobre los movimientos eliminados
+  (soft delete). El snapshot ahora suma todos los movimientos y la consulta de
+  stock resta los eliminados hasta el checkpoint, así que eliminar un
+  movimiento ya sumado se refleja en el stock.
+- El snapshot se vacía y el checkpoint vuelve al inicio: lo sumado antes
+  excluía los eliminados y no encaja con la nueva regla. El job del backend
+  lo reconstruye en su siguiente vuelta.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_stock_snapshot_deletes"
+down_revision: str | None = "0011_users_pending_validation"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_RESET_SNAPSHOT = (
+    "DELETE FROM inventory_stock_snapshot",
+    (
+        "UPDATE inventory_snapshot_checkpoint SET movement_xid = '0', "
+        "movement_id = '00000000-0000-0000-0000-000000000000', "
+        "movements_folded = 0, refreshed_at = now()"
+    ),
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_inventory_movement_deleted",
+        "inventory_movement",
+        ["xid", "id"],
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    for statement in _RESET_SNAPSHOT:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_inventory_movement_deleted", table_name="inventory_movement")
+    for statement in _RESET_SNAPSHOT:
+        op.execute(statement)
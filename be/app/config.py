@@ -16,15 +16,116 @@ class Settings(BaseSettings):
     # 🗄️ Base de datos
     # ────────────────────────────
     DATABASE_URL: str
+    # Pool de conexiones (por proceso; aplica al engine sync y al async)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Segundos antes de reciclar una conexión (-1 = nunca)
+    DB_POOL_RECYCLE: int = 1800
+    # Segundos máximos esperando una conexión libre antes de fallar
+    DB_POOL_TIMEOUT: float = 30.0
+    # True = ping en cada checkout (pesimista, +1 round trip);
+    # False = optimista, confía en DB_POOL_RECYCLE para descartar conexiones viejas
+    DB_POOL_PRE_PING: bool = True
 
     # ────────────────────────────
     # 🔐 JWT y Seguridad
     # ────────────────────────────
     SECRET_KEY: str
+    # HS256 usa SECRET_KEY; RS256/ES256 usan llaves .pem (ver JWT_KEYS_DIR)
     ALGORITHM: str = "HS256"
+    # Directorio con una llave `<kid>.pem` por llave (solo RS*/ES*): privada la
+    # activa, las retiradas pueden ser solo la pública
+    JWT_KEYS_DIR: str = ""
+    # `kid` de la llave con la que se firman los tokens nuevos
+    JWT_ACTIVE_KID: str = ""
+    # Access tokens verificados que se recuerdan por worker
+    VERIFIED_TOKEN_CACHE_SIZE: int = 4096
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # ────────────────────────────
+    # 🧮 Hashing de contraseñas (bcrypt)
+    # ────────────────────────────
+    # Procesos dedicados a bcrypt; 0 = usar todos los CPUs disponibles.
+    PASSWORD_HASH_WORKERS: int = 2
+    # Trabajos en espera permitidos además de los que ya se ejecutan.
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    # Segundos sugeridos al cliente (Retry-After) cuando la cola está llena.
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+
+    # ────────────────────────────
+    # 🚦 Límite de intentos de login
+    # ────────────────────────────
+    # "memory" = conteos por worker; "postgres" = compartidos en `rate_limit_buckets`.
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    # Intentos por IP en la ventana (0 = sin límite por IP).
+    LOGIN_RATE_LIMIT_IP_ATTEMPTS: int = 30
+    LOGIN_RATE_LIMIT_IP_WINDOW_SECONDS: float = 60.0
+    # Fallos de credenciales por email en la ventana (0 = sin límite por email).
+    LOGIN_RATE_LIMIT_EMAIL_FAILURES: int = 5
+    LOGIN_RATE_LIMIT_EMAIL_WINDOW_SECONDS: float = 900.0
+    # Claves recordadas en memoria por contador (las menos recientes se descartan).
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100_000
+    # Proxies cuyo X-Forwarded-For se cree (IPs o redes separadas por comas, p. ej.
+    # "172.16.0.0/12"). Vacío = se usa la IP de la conexión (sin proxy delante).
+    TRUSTED_PROXIES: str = ""
+
+    # ────────────────────────────
+    # 📈 Acceso a /metrics y /api/v1/health/* (/api/v1/health sigue siendo público)
+    # ────────────────────────────
+    # Token Bearer de los recolectores (p. ej. `authorization` de Prometheus). Vacío = sin token.
+    MONITORING_TOKEN: str = ""
+    # Redes que acceden sin token; la IP del cliente respeta TRUSTED_PROXIES.
+    MONITORING_ALLOWED_NETWORKS: str = "127.0.0.1/32, ::1/128"
+
+    # ────────────────────────────
+    # ⚙️ Trabajos en segundo plano (forgot-password, etc.)
+    # ────────────────────────────
+    BACKGROUND_JOB_WORKERS: int = 4
+    # Trabajos en espera; con la cola llena se descartan (y se cuentan).
+    BACKGROUND_JOB_QUEUE_LIMIT: int = 1000
+
+    # ────────────────────────────
+    # 🧹 Limpieza de tokens vencidos
+    # ────────────────────────────
+    # Cada cuánto se eliminan tokens de recuperación vencidos o usados y refresh
+    # tokens expirados (0 = desactivado).
+    RESET_TOKEN_REAPER_INTERVAL_SECONDS: float = 3600.0
+    # Filas por DELETE (una transacción corta por lote).
+    RESET_TOKEN_REAPER_BATCH_SIZE: int = 1000
+
+    # ────────────────────────────
+    # 📦 Snapshot de stock (inventario)
+    # ────────────────────────────
+    # Cada cuánto se suman los movimientos nuevos al snapshot (0 = desactivado).
+    STOCK_SNAPSHOT_INTERVAL_SECONDS: float = 60.0
+    # Movimientos por lote (una transacción corta por lote).
+    STOCK_SNAPSHOT_BATCH_SIZE: int = 50_000
+
+    # ────────────────────────────
+    # 👤 Caché de usuarios autenticados
+    # ────────────────────────────
+    # Segundos que un usuario autenticado se reutiliza sin consultar la BD.
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+
+    # ────────────────────────────
+    # 🗂️ Caché de catálogos (tipos de documento)
+    # ────────────────────────────
+    # Recarga de respaldo por si se pierde un NOTIFY (la invalidación normal es por NOTIFY).
+    CATALOG_CACHE_TTL_SECONDS: float = 300.0
+    # max-age del header Cache-Control; luego el cliente revalida con If-None-Match.
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 60
+
+    # ────────────────────────────
+    # 📄 Paginación de listados administrativos
+    # ────────────────────────────
+    ADMIN_PAGE_SIZE_DEFAULT: int = 50
+    # Tope de filas por página aunque el cliente pida más.
+    ADMIN_PAGE_SIZE_MAX: int = 200
+    # Máximo de usuarios por solicitud de validación masiva.
+    ADMIN_BULK_VALIDATE_MAX: int = 500
+
     # ────────────────────────────
     # 📧 Email
     # ────────────────────────────
@@ -34,6 +135,63 @@ class Settings(BaseSettings):
     MAIL_PASSWORD: str = ""
     MAIL_FROM: str = "noreply@calzadojyr.com"
     MAIL_FROM_NAME: str = "CALZADO J&R"
+    # "console" imprime los emails (desarrollo); "smtp" los envía por MAIL_SERVER.
+    MAIL_BACKEND: str = "console"
+    MAIL_START_TLS: bool = True
+    MAIL_TIMEOUT_SECONDS: float = 10.0
+    # Conexiones SMTP abiertas y reutilizadas entre envíos.
+    MAIL_SMTP_POOL_SIZE: int = 4
+
+    # ────────────────────────────
+    # 📮 Outbox de emails
+    # ────────────────────────────
+    # Emails reclamados por vuelta del despachador.
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    # Revisión periódica de reintentos y de emails encolados por otros workers.
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    # Backoff exponencial: base * 2^(intento - 1), con tope.
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS: float = 3600.0
+    # Un email reclamado no se vuelve a reclamar hasta pasado este tiempo (caídas a mitad de envío).
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 120.0
+    # Un pendiente más viejo ya no se envía (una solicitud de recuperación así ya no es actual).
+    EMAIL_OUTBOX_MAX_AGE_SECONDS: float = 3600.0
+    # Los fallidos se conservan este tiempo para revisión.
+    EMAIL_OUTBOX_FAILED_RETENTION_SECONDS: float = 604800.0
+
+    # ────────────────────────────
+    # 🏭 Servidor de producción (python -m app.server)
+    # ────────────────────────────
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Workers (un event loop cada uno); 0 = uno por CPU de la cuota del contenedor.
+    SERVER_WORKERS: int = 0
+    # Conexiones pendientes de aceptar en el socket de escucha.
+    SERVER_BACKLOG: int = 2048
+    # Segundos que una conexión keep-alive inactiva queda abierta; debe ser menor
+    # que el idle timeout del balanceador para que sea el servidor quien la cierre.
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    # Segundos que un worker tiene para terminar sus requests al recibir SIGTERM.
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # Un worker que no reporta vida en este tiempo se reinicia.
+    SERVER_TIMEOUT_SECONDS: int = 60
+
+    # ────────────────────────────
+    # 📈 Métricas
+    # ────────────────────────────
+    # Header Server-Timing (tiempo total y de BD) en cada respuesta.
+    SERVER_TIMING_HEADER: bool = True
+
+    # ────────────────────────────
+    # 🔍 Inspector de consultas (desarrollo/pruebas)
+    # ────────────────────────────
+    # Registra las consultas de cada request, avisa N+1 y registra las lentas con su plan.
+    QUERY_INSPECTOR_ENABLED: bool = False
+    # Consultas más lentas que esto se registran con su EXPLAIN.
+    QUERY_INSPECTOR_SLOW_MS: float = 100.0
+    # Veces que una misma forma de consulta puede repetirse en una request antes de avisar.
+    QUERY_INSPECTOR_REPEAT_THRESHOLD: int = 5
 
     # ────────────────────────────
     # 🌐 URLs
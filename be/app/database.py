@@ -5,15 +5,80 @@ Descripción: Configuración de la conexión a PostgreSQL con SQLAlchemy 2.0.
 ¿Impacto? Este módulo es el puente entre Python y PostgreSQL.
 """
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import settings
+from app.utils.metrics import Histogram
+from app.utils.request_timing import instrument_engine
+
+
+def to_async_url(database_url: str) -> str:
+    """Convierte la URL de PostgreSQL al driver async (asyncpg).
+
+    `DATABASE_URL` se mantiene en formato `postgresql://` para psycopg2,
+    Alembic y los scripts; aquí se deriva la variante `postgresql+asyncpg://`.
+    """
+    url = make_url(database_url)
+    return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# ────────────────────────────
+# 📊 Pools instrumentados
+# ────────────────────────────
+
+
+class _CheckoutTimingMixin:
+    """Mide cuánto espera cada checkout hasta obtener una conexión del pool."""
+
+    wait_histogram: Histogram
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool (engine sync) con histograma de espera en el checkout."""
+
+    wait_histogram = Histogram()
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (engine async) con histograma de espera en el checkout."""
+
+    wait_histogram = Histogram()
+
+
+def _pool_options() -> dict:
+    """Opciones del pool comunes a ambos engines, tomadas de Settings."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
+# ────────────────────────────
+# 🔁 Engine síncrono (psycopg2)
+# ────────────────────────────
+# Lo usan los scripts, Alembic y los endpoints que aún no migran a async.
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    poolclass=InstrumentedQueuePool,
     echo=False,
+    **_pool_options(),
 )
 
 SessionLocal = sessionmaker(
@@ -22,7 +87,82 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# ────────────────────────────
+# ⚡ Engine asíncrono (asyncpg)
+# ────────────────────────────
+# Los endpoints async no ocupan hilos del threadpool de FastAPI mientras
+# esperan a PostgreSQL, así que el límite de ~40 hilos deja de ser el techo.
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    echo=False,
+    **_pool_options(),
+)
+
+# expire_on_commit=False: tras el commit los atributos siguen disponibles sin
+# volver a consultar la BD (en async un lazy-load implícito lanzaría error).
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# Consultas y tiempo de BD por request (ver utils/request_timing.py)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 
 class Base(DeclarativeBase):
     """Clase base para todos los modelos ORM del proyecto."""
     pass
+
+
+def pool_stats() -> dict:
+    """Estado en vivo de los pools de conexiones de este proceso."""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        stats[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checkout_wait_seconds": pool.wait_histogram.snapshot(),
+        }
+    return stats
+
+
+# ────────────────────────────
+# 🏷️ Versión del esquema
+# ────────────────────────────
+
+# Revisión de Alembic (alembic/versions) que espera este código. Al agregar una
+# migración, actualizar aquí y en db/init/03_schema_version.sql.
+SCHEMA_REVISION = "0012_stock_snapshot_deletes"
+
+
+class SchemaMismatchError(RuntimeError):
+    """La BD no está en la revisión de esquema que espera el código."""
+
+
+async def check_schema_revision() -> str:
+    """Verifica con una sola consulta que la BD esté en `SCHEMA_REVISION`.
+
+    Reemplaza a `create_all` en el arranque: no refleja tabla por tabla ni crea
+    nada; si el esquema no coincide, el worker no arranca.
+    """
+    async with async_engine.connect() as conn:
+        try:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except ProgrammingError:
+            current = None
+    if current != SCHEMA_REVISION:
+        raise SchemaMismatchError(
+            f"Esquema de la BD en revisión {current!r}, el código espera {SCHEMA_REVISION!r}. "
+            "Ejecute `alembic upgrade head` (una BD creada antes de versionar el "
+            "esquema, con el db/init o el create_all de entonces, se marca primero "
+            "con `alembic stamp 0001_baseline`)."
+        )
+    return current
@@ -6,19 +6,35 @@ Descripción: Dependencias inyectables de FastAPI.
           y validar el token JWT manualmente.
 """
 
-from collections.abc import Generator
+import hmac
+import uuid
+from collections.abc import AsyncGenerator, Callable, Coroutine, Generator
+from typing import Any
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
 from app.models.user import User
+from app.schemas.user import TokenClaims
+from app.services.principal_cache import (
+    cache_principal,
+    get_cached_principal,
+    invalidate_principal,
+)
+from app.services.role_registry import role_registry
+from app.services.token_versions import get_known_version, remember_token_version
+from app.utils.client_ip import client_ip, in_networks, parse_networks
 from app.utils.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+_monitoring_networks = parse_networks(settings.MONITORING_ALLOWED_NETWORKS)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Provee una sesión de base de datos para cada request."""
@@ -29,11 +45,21 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provee una sesión async de base de datos para cada request."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
-    """Obtiene el usuario autenticado a partir del access token JWT."""
+    """Obtiene el usuario autenticado a partir del access token JWT.
+
+    Primero consulta la caché de principals; va a la BD en un fallo o si el
+    token trae otra versión que la cacheada.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
@@ -51,10 +77,27 @@ def get_current_user(
     if not email:
         raise credentials_exception
 
-    stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = get_cached_principal(email)
+    # Con otra versión, el token puede ser más nuevo que la caché (contraseña
+    # cambiada en otro worker): se recarga el usuario una vez antes de rechazarlo
+    if user is not None and payload.get("ver", 0) != user.token_version:
+        invalidate_principal(email)
+        user = None
+
+    if user is None:
+        stmt = select(User).where(User.email == email)
+        user = (await db.execute(stmt)).scalar_one_or_none()
+
+        if not user:
+            raise credentials_exception
+
+        # Desligar de la sesión: la instancia se comparte entre requests
+        db.expunge(user)
+        cache_principal(email, user)
+        remember_token_version(user.id, user.token_version)
 
-    if not user:
+    # Un token emitido antes de incrementar token_version está revocado
+    if payload.get("ver", 0) != user.token_version:
         raise credentials_exception
 
     if not user.is_active:
@@ -64,3 +107,97 @@ def get_current_user(
         )
 
     return user
+
+
+def require_role(
+    *roles: str,
+) -> Callable[..., Coroutine[Any, Any, TokenClaims]]:
+    """Crea una dependencia que autoriza por rol usando solo los claims del JWT.
+
+    Solo consulta la BD cuando este worker no conoce la versión vigente de los
+    tokens del usuario o cuando el token trae una versión distinta (posible revocación).
+
+    Uso: `claims: TokenClaims = Depends(require_role("admin"))`
+    """
+
+    async def dependency(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> TokenClaims:
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        forbidden_exception = HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para acceder a este endpoint",
+        )
+
+        payload = decode_token(token)
+        if not payload or payload.get("type") != "access":
+            raise credentials_exception
+
+        try:
+            claims = TokenClaims(
+                sub=payload["sub"],
+                user_id=uuid.UUID(payload["uid"]),
+                role=payload["role"],
+                version=payload["ver"],
+            )
+        except (KeyError, TypeError, ValueError):
+            raise credentials_exception
+
+        if claims.role not in roles:
+            raise forbidden_exception
+
+        if get_known_version(claims.user_id) == claims.version:
+            return claims
+
+        # Versión desconocida o distinta: verificar contra la BD
+        stmt = select(User.token_version, User.is_active, User.role_id).where(
+            User.id == claims.user_id
+        )
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            raise credentials_exception
+
+        token_version, is_active, role_id = row
+        role_name = role_registry.name_for(role_id)
+        remember_token_version(claims.user_id, token_version)
+
+        if token_version != claims.version:
+            raise credentials_exception
+        if not is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cuenta desactivada",
+            )
+        if role_name not in roles:
+            raise forbidden_exception
+
+        return claims
+
+    return dependency
+
+
+async def require_monitoring_access(request: Request) -> None:
+    """Autoriza /metrics y los diagnósticos de /api/v1/health/*.
+
+    Pasa con `Authorization: Bearer <MONITORING_TOKEN>` o desde una red de
+    `MONITORING_ALLOWED_NETWORKS`: exponen contadores internos (cachés, pools,
+    intentos de login bloqueados) que no deben ser públicos.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if (
+        settings.MONITORING_TOKEN
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(token.encode(), settings.MONITORING_TOKEN.encode())
+    ):
+        return
+    if in_networks(client_ip(request), _monitoring_networks):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Acceso restringido a monitoreo",
+    )
@@ -5,31 +5,90 @@ Descripción: Punto de entrada de la aplicación FastAPI — configura y arranca
 ¿Impacto? Este es el archivo que Uvicorn ejecuta. Sin él, no hay servidor.
 """
 
-from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import engine, Base
-from app.routers.auth import router as auth_router
-from app.routers.users import router as users_router
+from app.database import async_engine, check_schema_revision
+
+# Importar modelos para que SQLAlchemy resuelva las relaciones entre ellos
+from app.models import (
+    email_outbox,  # noqa: F401
+    inventory,  # noqa: F401
+    inventory_movement,  # noqa: F401
+    inventory_snapshot_checkpoint,  # noqa: F401
+    inventory_stock_snapshot,  # noqa: F401
+    password_reset_token,  # noqa: F401
+    rate_limit_bucket,  # noqa: F401
+    refresh_token,  # noqa: F401
+    role,  # noqa: F401
+    type_document,  # noqa: F401
+    user,  # noqa: F401
+)
 from app.routers.admin import router as admin_router
+from app.routers.auth import router as auth_router
+from app.routers.health import router as health_router
+from app.routers.inventory import router as inventory_router
+from app.routers.metrics import router as metrics_router
 from app.routers.type_document import router as type_document_router
+from app.routers.users import router as users_router
+from app.routers.well_known import router as well_known_router
+from app.services.auth_service import render_password_reset_email
+from app.services.catalog_cache import CATALOG_CHANNEL, type_document_catalog
+from app.services.email_outbox import email_dispatcher
+from app.services.role_registry import role_registry
+from app.services.stock_snapshot import stock_snapshotter
+from app.services.token_reaper import reset_token_reaper
+from app.utils.audit import configure_audit_logging
+from app.utils.email import PASSWORD_RESET_TEMPLATE
+from app.utils.jobs import background_jobs
+from app.utils.pg_notify import pg_listener
+from app.utils.query_inspector import QueryInspectorMiddleware
+from app.utils.request_timing import TimingMiddleware
+from app.utils.security import key_ring, password_hasher
 
-# Importar modelos para que SQLAlchemy los registre en Base.metadata
-from app.models import role, user, password_reset_token, type_document  # noqa: F401
+
+def _on_catalog_changed(table: str) -> None:
+    """Invalida la caché del catálogo que cambió (payload = nombre de la tabla)."""
+    if table == "type_document":
+        type_document_catalog.invalidate()
+    elif table == "roles":
+        role_registry.schedule_reload()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Gestiona el ciclo de vida de la aplicación FastAPI."""
     print("🚀 CALZADO J&R — Backend iniciando...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Tablas verificadas / creadas correctamente.")
+    configure_audit_logging()
+    key_ring.load()
+    revision = await check_schema_revision()
+    print(f"✅ Esquema de la BD en la revisión esperada: {revision}")
+    roles = await role_registry.load()
+    print(f"👥 Roles cargados en memoria: {roles}")
+    pg_listener.subscribe(CATALOG_CHANNEL, _on_catalog_changed)
+    pg_listener.on_reconnect(type_document_catalog.invalidate)
+    pg_listener.on_reconnect(role_registry.schedule_reload)
+    pg_listener.start()
+    email_dispatcher.register_template(PASSWORD_RESET_TEMPLATE, render_password_reset_email)
+    email_dispatcher.start()
+    background_jobs.start()
+    reset_token_reaper.start()
+    stock_snapshotter.start()
+    print(f"📮 Despachador de emails iniciado (backend: {settings.MAIL_BACKEND})")
     print(f"📡 CORS habilitado para: {settings.FRONTEND_URL}")
     yield
+    await stock_snapshotter.stop()
+    await reset_token_reaper.stop()
+    await background_jobs.stop()
+    await email_dispatcher.stop()
+    await pg_listener.stop()
+    # Con los jobs detenidos ya nadie usa el pool: se cierran sus conexiones
+    await async_engine.dispose()
+    password_hasher.shutdown()
     print("🛑 CALZADO J&R — Backend cerrando...")
 
 
@@ -56,6 +115,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_INSPECTOR_ENABLED:
+    app.add_middleware(
+        QueryInspectorMiddleware,
+        repeat_threshold=settings.QUERY_INSPECTOR_REPEAT_THRESHOLD,
+    )
+
+# Agregado al final = capa más externa: mide también el trabajo de CORS
+app.add_middleware(TimingMiddleware, server_timing=settings.SERVER_TIMING_HEADER)
+
 # ────────────────────────────
 # 📍 Incluir routers
 # ────────────────────────────
@@ -63,7 +131,11 @@ app.add_middleware(
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(admin_router)
+app.include_router(inventory_router)
 app.include_router(type_document_router)
+app.include_router(health_router)
+app.include_router(well_known_router)
+app.include_router(metrics_router)
 
 # ────────────────────────────
 # 📍 Endpoint raíz de bienvenida
@@ -72,20 +144,3 @@ app.include_router(type_document_router)
 async def root():
     """Mensaje de bienvenida en la raíz de la API."""
     return {"message": "API de Calzado J&R funcionando. Visita /docs para la documentación."}
-
-
-# ────────────────────────────
-# 📍 Endpoint de salud (health check)
-# ────────────────────────────
-@app.get(
-    "/api/v1/health",
-    tags=["health"],
-    summary="Verificar estado del servidor",
-)
-async def health_check() -> dict[str, str]:
-    """Endpoint de verificación de salud del servidor."""
-    return {
-        "status": "healthy",
-        "project": "CALZADO J&R",
-        "version": "0.1.0",
-    }
@@ -0,0 +1,117 @@
+"""
+Módulo: models/email_outbox.py
+Descripción: Modelo ORM que representa la tabla `email_outbox` en PostgreSQL.
+¿Para qué? Encolar emails en la misma transacción que los origina para que un
+           despachador en segundo plano los envíe (patrón outbox).
+¿Impacto? Un reinicio del servidor no pierde emails: lo pendiente sigue en la tabla.
+          Los emails con secretos (recuperación) se guardan como plantilla y
+          usuario; el despachador los arma al enviarlos.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EmailOutbox(Base):
+    """Modelo ORM para la tabla `email_outbox`."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "idx_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        CheckConstraint(
+            "body IS NOT NULL OR template IS NOT NULL",
+            name="email_outbox_body_check",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    recipient: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    subject: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    # NULL si el email usa plantilla
+    body: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    # Plantilla que el despachador arma al enviar (ver EmailDispatcher.register_template)
+    template: Mapped[str | None] = mapped_column(
+        String(50),
+        nullable=True,
+    )
+
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    # 'pending' mientras quedan intentos; 'failed' al agotarlos o vencer
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default="pending",
+        server_default="pending",
+        nullable=False,
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"EmailOutbox(id={self.id}, recipient={self.recipient}, "
+            f"status={self.status}, attempts={self.attempts})"
+        )
@@ -0,0 +1,94 @@
+"""
+Módulo: models/inventory.py
+Descripción: Modelo ORM que representa la tabla `inventory` en PostgreSQL.
+¿Para qué? Guardar el stock actual de cada variante de producto (talla + color)
+           en bodega, con su stock mínimo.
+¿Impacto? Hay una sola fila activa por variante (índice único parcial): los
+          movimientos la actualizan con un UPDATE atómico (services/inventory_service.py).
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import CheckConstraint, DateTime, Index, Integer, Numeric, String, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Inventory(Base):
+    """Modelo ORM para la tabla `inventory`."""
+
+    __tablename__ = "inventory"
+    __table_args__ = (
+        # Búsqueda de stock por variante; único entre las filas activas para que
+        # las entradas puedan hacer upsert (colour NULL cuenta como un valor más)
+        Index(
+            "idx_inventory_variant",
+            "product_id",
+            "size",
+            "colour",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        CheckConstraint("amount >= 0", name="chk_inventory_amount_non_negative"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # FK a products en la BD (la tabla aún no tiene modelo ORM)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+
+    size: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+
+    colour: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2),
+        nullable=False,
+    )
+
+    minimum_stock: Mapped[int] = mapped_column(
+        Integer,
+        server_default="0",
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"Inventory(product_id={self.product_id}, size={self.size!r}, "
+            f"colour={self.colour!r}, amount={self.amount})"
+        )
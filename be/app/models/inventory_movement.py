@@ -0,0 +1,133 @@
+"""
+Módulo: models/inventory_movement.py
+Descripción: Modelo ORM que representa la tabla `inventory_movement` en PostgreSQL.
+¿Para qué? Registrar cada entrada, salida o ajuste de stock: quién, cuánto, de qué
+           variante y cuándo.
+¿Impacto? Es el historial del inventario; se consulta por producto y fecha
+          (índice `idx_inventory_movement_product_date`). Es de solo inserción: el
+          snapshot de stock (services/stock_snapshot.py) suma cada movimiento una vez.
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, String, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import UserDefinedType
+
+from app.database import Base
+
+# Valores del ENUM inventory_movement_type
+MOVEMENT_TYPES = ("entrada", "salida", "ajuste")
+
+
+class Xid8(UserDefinedType):
+    """Tipo `xid8` de PostgreSQL (id de transacción de 64 bits; asyncpg lo lee como int)."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
+
+
+class InventoryMovement(Base):
+    """Modelo ORM para la tabla `inventory_movement`."""
+
+    __tablename__ = "inventory_movement"
+    __table_args__ = (
+        # Historial de un producto por fecha; `id` desempata la paginación keyset
+        Index("idx_inventory_movement_product_date", "product_id", "movement_date", "id"),
+        # Movimientos posteriores al checkpoint del snapshot de stock
+        Index("idx_inventory_movement_xid", "xid", "id"),
+        # Eliminados (soft delete) que el snapshot ya sumó y la consulta resta
+        Index(
+            "idx_inventory_movement_deleted",
+            "xid",
+            "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # FK a products en la BD (la tabla aún no tiene modelo ORM)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id"),
+        index=True,
+        nullable=False,
+    )
+
+    type_of_movement: Mapped[str] = mapped_column(
+        Enum(*MOVEMENT_TYPES, name="inventory_movement_type"),
+        nullable=False,
+    )
+
+    size: Mapped[str | None] = mapped_column(
+        String(50),
+        nullable=True,
+    )
+
+    colour: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+
+    # Entradas y salidas en positivo; los ajustes llevan signo
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2),
+        nullable=False,
+    )
+
+    reason: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+    )
+
+    movement_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    # Transacción que insertó el movimiento (la asigna la BD). A diferencia de
+    # una fecha o un serial, permite saber qué movimientos ya están confirmados:
+    # todos los de xid menor que el xmin del snapshot de PostgreSQL.
+    xid: Mapped[int] = mapped_column(
+        Xid8(),
+        server_default=text("pg_current_xact_id()"),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"InventoryMovement(product_id={self.product_id}, type={self.type_of_movement}, "
+            f"amount={self.amount}, movement_date={self.movement_date})"
+        )
@@ -0,0 +1,64 @@
+"""
+Módulo: models/inventory_snapshot_checkpoint.py
+Descripción: Modelo ORM que representa la tabla `inventory_snapshot_checkpoint` en PostgreSQL.
+¿Para qué? Recordar hasta qué movimiento está sumado `inventory_stock_snapshot`:
+           la posición `(xid, id)` del último movimiento incluido.
+¿Impacto? Tiene una sola fila (id = 1). Se actualiza en la misma transacción que
+          el snapshot, así que una consulta siempre ve ambos en el mismo punto.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, SmallInteger, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.inventory_movement import Xid8
+
+
+class InventorySnapshotCheckpoint(Base):
+    """Modelo ORM para la tabla `inventory_snapshot_checkpoint`."""
+
+    __tablename__ = "inventory_snapshot_checkpoint"
+    __table_args__ = (
+        CheckConstraint("id = 1", name="chk_inventory_snapshot_checkpoint_single_row"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        SmallInteger,
+        primary_key=True,
+        server_default="1",
+    )
+
+    # Último movimiento sumado, en el orden (xid, id) de idx_inventory_movement_xid
+    movement_xid: Mapped[int] = mapped_column(
+        Xid8(),
+        server_default=text("'0'"),
+        nullable=False,
+    )
+
+    movement_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        server_default=text("'00000000-0000-0000-0000-000000000000'"),
+        nullable=False,
+    )
+
+    movements_folded: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default="0",
+        nullable=False,
+    )
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"InventorySnapshotCheckpoint(movement_xid={self.movement_xid}, "
+            f"movements_folded={self.movements_folded}, refreshed_at={self.refreshed_at})"
+        )
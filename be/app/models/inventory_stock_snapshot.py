@@ -0,0 +1,76 @@
+"""
+Módulo: models/inventory_stock_snapshot.py
+Descripción: Modelo ORM que representa la tabla `inventory_stock_snapshot` en PostgreSQL.
+¿Para qué? Guardar el stock de cada variante calculado desde el historial de
+           movimientos hasta el checkpoint (`inventory_snapshot_checkpoint`).
+¿Impacto? El stock según el historial es esta fila + los movimientos posteriores
+          al checkpoint, sin recorrer todo `inventory_movement`. Lo mantiene al día
+          el job de services/stock_snapshot.py.
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Index, Numeric, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class InventoryStockSnapshot(Base):
+    """Modelo ORM para la tabla `inventory_stock_snapshot`."""
+
+    __tablename__ = "inventory_stock_snapshot"
+    __table_args__ = (
+        # Una fila por variante (colour/size NULL cuentan como un valor más)
+        Index(
+            "idx_inventory_stock_snapshot_variant",
+            "product_id",
+            "size",
+            "colour",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # FK a products en la BD (la tabla aún no tiene modelo ORM)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+
+    size: Mapped[str | None] = mapped_column(
+        String(50),
+        nullable=True,
+    )
+
+    colour: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+
+    # Suma con signo de los movimientos de la variante hasta el checkpoint
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        nullable=False,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"InventoryStockSnapshot(product_id={self.product_id}, size={self.size!r}, "
+            f"colour={self.colour!r}, amount={self.amount})"
+        )
@@ -8,7 +8,7 @@ Descripción: Modelo ORM que representa la tabla `password_reset_tokens` en Post
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, LargeBinary, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,10 +32,10 @@ class PasswordResetToken(Base):
         nullable=False,
     )
 
-    token: Mapped[str] = mapped_column(
-        String(255),
+    # SHA-256 del token enviado por email; el token en claro no se guarda
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
         unique=True,
-        index=True,
         nullable=False,
     )
 
@@ -59,8 +59,8 @@ class PasswordResetToken(Base):
     user = relationship("User", lazy="selectin")
 
     def __repr__(self) -> str:
-        token_preview = self.token[:8] if self.token else "N/A"
+        token_preview = self.token_hash.hex()[:8] if self.token_hash else "N/A"
         return (
             f"PasswordResetToken(id={self.id}, user_id={self.user_id}, "
-            f"token={token_preview}..., used={self.used})"
+            f"token_hash={token_preview}..., used={self.used})"
         )
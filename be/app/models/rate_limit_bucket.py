@@ -0,0 +1,53 @@
+"""
+Módulo: models/rate_limit_bucket.py
+Descripción: Modelo ORM que representa la tabla `rate_limit_buckets` en PostgreSQL.
+¿Para qué? Compartir entre workers los conteos de ventana deslizante del limitador
+           de intentos de login (`LOGIN_RATE_LIMIT_BACKEND=postgres`).
+¿Impacto? Una fila por clave y ventana fija; se consulta y actualiza con SQL directo
+          (utils/rate_limit.py) y las filas vencidas se eliminan periódicamente.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RateLimitBucket(Base):
+    """Modelo ORM para la tabla `rate_limit_buckets`."""
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = (
+        Index("idx_rate_limit_buckets_expires_at", "expires_at"),
+    )
+
+    # Clave con prefijo del contador (ej. `login-ip:10.0.0.1`)
+    bucket_key: Mapped[str] = mapped_column(
+        String(320),
+        primary_key=True,
+    )
+
+    # Número de ventana fija: epoch // segundos de la ventana
+    window_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    # Pasada esta fecha la fila ya no entra en ninguna ventana deslizante
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimitBucket(bucket_key={self.bucket_key}, "
+            f"window_id={self.window_id}, attempts={self.attempts})"
+        )
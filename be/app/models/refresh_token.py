@@ -0,0 +1,72 @@
+"""
+Módulo: models/refresh_token.py
+Descripción: Modelo ORM que representa la tabla `refresh_tokens` en PostgreSQL.
+¿Para qué? Registrar cada refresh token emitido (por `jti`) y agruparlos por familia
+           (una familia = una sesión iniciada con login) para rotarlos y revocarlos.
+¿Impacto? Sin esta tabla un refresh token robado sería válido hasta expirar:
+          no habría revocación ni detección de reutilización.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """Modelo ORM para la tabla `refresh_tokens`."""
+
+    __tablename__ = "refresh_tokens"
+
+    # Claim `jti` del refresh token JWT
+    jti: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # Claim `fam`: todos los tokens rotados desde un mismo login
+    family_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        index=True,
+        nullable=False,
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    # Se marca al rotar; presentar de nuevo un token usado = reutilización
+    used_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"RefreshToken(jti={self.jti}, family_id={self.family_id}, "
+            f"user_id={self.user_id}, used_at={self.used_at}, revoked_at={self.revoked_at})"
+        )
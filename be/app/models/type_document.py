@@ -33,4 +33,6 @@ class TypeDocument(Base):
     )
 
     # Relación inversa con usuarios
-    users = relationship("User", back_populates="identity_document_type")
+    # lazy="raise": recorrer `users` de varios tipos sería un N+1; quien lo
+    # necesite debe pedirlo explícitamente (selectinload) o consultar `users`.
+    users = relationship("User", back_populates="identity_document_type", lazy="raise")
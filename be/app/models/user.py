@@ -9,7 +9,7 @@ Descripción: Modelo ORM que representa la tabla `users` en PostgreSQL.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -109,6 +109,14 @@ class User(Base):
         nullable=False,
     )
 
+    # Se incrementa para revocar todos los tokens emitidos (claim `ver`)
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
     # ────────────────────────────
     # 📋 Campos específicos por rol
     # ────────────────────────────
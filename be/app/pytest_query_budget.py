@@ -0,0 +1,47 @@
+"""
+Módulo: pytest_query_budget.py
+Descripción: Plugin de pytest con presupuesto de consultas SQL por prueba o por bloque.
+¿Para qué? Que una prueba falle si un endpoint pasa a ejecutar más consultas de las
+           esperadas (un N+1 nuevo, un selectin de más) aunque la respuesta sea correcta.
+¿Impacto? Se carga desde tests/conftest.py (`pytest_plugins`).
+          Funciona con TestClient y con httpx.AsyncClient: ambos propagan el contexto.
+
+Uso:
+    @pytest.mark.query_budget(3)
+    def test_listar_tipos_documento(client): ...
+
+    def test_login(client, query_budget):
+        with query_budget(2, max_repeats=1):
+            client.post("/api/v1/auth/login", json=...)
+"""
+
+import pytest
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, max_repeats=None): falla si la prueba ejecuta más "
+        "consultas SQL (o repite una misma forma más veces) de lo indicado",
+    )
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager `query_budget(max_queries, max_repeats=None)` para un bloque."""
+    from app.utils.query_inspector import query_budget
+
+    return query_budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    """Aplica `@pytest.mark.query_budget` al cuerpo de la prueba (no a sus fixtures)."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    from app.utils.query_inspector import query_budget
+
+    with query_budget(*marker.args, **marker.kwargs):
+        return (yield)
@@ -6,66 +6,197 @@ Descripción: Endpoints administrativos — validación de usuarios, gestión de
 """
 
 import uuid
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import any_, bindparam, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user, get_db
+from app.config import settings
+from app.dependencies import get_async_db, require_role
+from app.models.role import Role
+from app.models.type_document import TypeDocument
 from app.models.user import User
-from app.schemas.user import MessageResponse, UserResponse
+from app.schemas.serializers import (
+    ORJSONResponse,
+    json_response,
+    user_response,
+    user_responses_from_rows,
+)
+from app.schemas.user import (
+    BulkValidateRequest,
+    BulkValidateResponse,
+    BulkValidateResult,
+    MessageResponse,
+    TokenClaims,
+    UserPage,
+    UserResponse,
+)
+from app.services.auth_service import revoke_all_sessions
+from app.services.principal_cache import invalidate_principal
+from app.services.role_registry import role_registry
+from app.services.token_versions import forget_token_version
+from app.utils.audit import audit
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_rows
 
 router = APIRouter(
     prefix="/api/v1/admin",
     tags=["admin"],
 )
 
+require_admin = require_role("admin")
+
 
 @router.get(
     "/users/pending-validation",
-    response_model=list[UserResponse],
+    response_model=UserPage,
     summary="Listar usuarios pendientes de validación",
 )
-def get_pending_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> list[UserResponse]:
-    """Obtiene la lista de usuarios pendientes de validación por admin.
-    
+async def get_pending_users(
+    role: str | None = Query(None, description="Nombre del rol (ej. client)"),
+    created_from: datetime | None = Query(None, description="Registrados desde (inclusive)"),
+    created_to: datetime | None = Query(None, description="Registrados antes de (exclusivo)"),
+    identity_document_type_id: uuid.UUID | None = Query(None),
+    cursor: str | None = Query(None, description="`next_cursor` de la página anterior"),
+    limit: int = Query(settings.ADMIN_PAGE_SIZE_DEFAULT, ge=1),
+    current_user: TokenClaims = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+) -> ORJSONResponse:
+    """Obtiene una página de usuarios pendientes de validación por admin.
+
+    Paginación keyset sobre `(created_at, id)`: cada página continúa desde el
+    cursor anterior sin OFFSET. El tamaño de página se limita a `ADMIN_PAGE_SIZE_MAX`.
+    `total_estimate` solo se calcula en la primera página (sin cursor).
     Solo disponible para administradores.
     """
-    # Verificar que el usuario es admin
-    if current_user.role.name != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Solo administradores pueden acceder a este endpoint",
+    limit = min(limit, settings.ADMIN_PAGE_SIZE_MAX)
+
+    # Mismo predicado que el índice parcial idx_users_pending_validation, que
+    # también da el orden (role_id, created_at, id) de la paginación
+    filters = [User.deleted_at.is_(None), User.is_validated.is_(False)]
+    if role is not None:
+        role_id = role_registry.id_for(role)
+        if role_id is None:
+            empty = UserPage.model_construct(items=[], next_cursor=None, total_estimate=0)
+            return json_response(empty)
+        filters.append(User.role_id == role_id)
+    if created_from is not None:
+        filters.append(User.created_at >= created_from)
+    if created_to is not None:
+        filters.append(User.created_at < created_to)
+    if identity_document_type_id is not None:
+        filters.append(User.identity_document_type_id == identity_document_type_id)
+
+    # El EXPLAIN cuesta una ida a la BD: el cliente ya tiene la estimación de la primera página
+    total_estimate = None
+    if cursor is None:
+        total_estimate = await estimate_rows(db, select(User.id).where(*filters))
+    else:
+        try:
+            after_created_at, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido",
+            )
+        filters.append(tuple_(User.created_at, User.id) > tuple_(after_created_at, after_id))
+
+    # Una sola consulta con los nombres de rol y tipo de documento (sin cargas por fila)
+    stmt = (
+        select(
+            User.id,
+            User.email,
+            User.name,
+            User.last_name,
+            User.phone,
+            User.identity_document,
+            User.identity_document_type_id,
+            TypeDocument.name.label("identity_document_type_name"),
+            User.is_active,
+            User.is_validated,
+            User.must_change_password,
+            Role.name.label("role_name"),
+            User.business_name,
+            User.occupation,
+            User.created_at,
+            User.updated_at,
         )
-    
-    # Obtener usuarios no validados
-    pending_users = db.query(User).filter(
-        User.is_validated == False
-    ).all()
-    
-    return [
-        UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            last_name=user.last_name,
-            phone=user.phone,
-            identity_document=user.identity_document,
-            identity_document_type_id=user.identity_document_type_id,
-            identity_document_type_name=user.identity_document_type.name if user.identity_document_type else None,
-            is_active=user.is_active,
-            is_validated=user.is_validated,
-            must_change_password=user.must_change_password,
-            role_name=user.role.name if user.role else None,
-            business_name=user.business_name,
-            occupation=user.occupation,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+        .join(Role, Role.id == User.role_id)
+        .outerjoin(TypeDocument, TypeDocument.id == User.identity_document_type_id)
+        .where(*filters)
+        .order_by(User.created_at, User.id)
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return json_response(
+        UserPage.model_construct(
+            items=user_responses_from_rows(rows),
+            next_cursor=next_cursor,
+            total_estimate=total_estimate,
         )
-        for user in pending_users
-    ]
+    )
+
+
+@router.patch(
+    "/users/validate",
+    response_model=BulkValidateResponse,
+    summary="Validar varios usuarios como administrador",
+)
+async def validate_users(
+    data: BulkValidateRequest,
+    current_user: TokenClaims = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkValidateResponse:
+    """Valida y activa una lista de usuarios en un solo UPDATE y una sola transacción.
+
+    Retorna el resultado por cada id recibido (`validated` o `not_found`).
+    Solo disponible para administradores.
+    """
+    ids = bindparam("user_ids", data.user_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+    stmt = (
+        update(User)
+        .where(User.id == any_(ids))
+        .values(
+            is_validated=True,
+            is_active=True,
+            validated_by=current_user.user_id,
+            validated_at=func.now(),
+        )
+        .returning(User.id, User.email)
+    )
+    validated = (await db.execute(stmt)).all()
+    await db.commit()
+
+    for user_id, email in validated:
+        invalidate_principal(email)
+        forget_token_version(user_id)
+
+    validated_ids = {user_id for user_id, _ in validated}
+    audit(
+        "users.validate",
+        current_user.user_id,
+        validated=[str(user_id) for user_id, _ in validated],
+        not_found=[str(user_id) for user_id in data.user_ids if user_id not in validated_ids],
+    )
+
+    return BulkValidateResponse(
+        validated=len(validated_ids),
+        results=[
+            BulkValidateResult(
+                user_id=user_id,
+                status="validated" if user_id in validated_ids else "not_found",
+            )
+            for user_id in data.user_ids
+        ],
+    )
 
 
 @router.patch(
@@ -73,25 +204,19 @@ def get_pending_users(
     response_model=UserResponse,
     summary="Validar usuario como administrador",
 )
-def validate_user(
+async def validate_user(
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> UserResponse:
+    current_user: TokenClaims = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+) -> ORJSONResponse:
     """Valida un usuario cliente nuevo.
     
     Marca el usuario como validado y activa su cuenta.
     Solo disponible para administradores.
     """
-    # Verificar que el usuario es admin
-    if current_user.role.name != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Solo administradores pueden validar usuarios",
-        )
-    
     # Buscar el usuario a validar
-    user_to_validate = db.query(User).filter(User.id == user_id).first()
+    stmt = select(User).where(User.id == user_id)
+    user_to_validate = (await db.execute(stmt)).scalar_one_or_none()
     if not user_to_validate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,32 +226,15 @@ def validate_user(
     # Validar el usuario
     user_to_validate.is_validated = True
     user_to_validate.is_active = True
-    user_to_validate.validated_by = current_user.id
-    
-    from datetime import datetime, timezone
-    user_to_validate.validated_at = datetime.now(timezone.utc)
+    user_to_validate.validated_by = current_user.user_id
+    user_to_validate.validated_at = datetime.now(UTC)
     
-    db.commit()
-    db.refresh(user_to_validate)
+    await db.commit()
+    await db.refresh(user_to_validate)
+    invalidate_principal(user_to_validate.email)
+    forget_token_version(user_to_validate.id)
     
-    return UserResponse(
-        id=user_to_validate.id,
-        email=user_to_validate.email,
-        name=user_to_validate.name,
-        last_name=user_to_validate.last_name,
-        phone=user_to_validate.phone,
-        identity_document=user_to_validate.identity_document,
-        identity_document_type_id=user_to_validate.identity_document_type_id,
-        identity_document_type_name=user_to_validate.identity_document_type.name if user_to_validate.identity_document_type else None,
-        is_active=user_to_validate.is_active,
-        is_validated=user_to_validate.is_validated,
-        must_change_password=user_to_validate.must_change_password,
-        role_name=user_to_validate.role.name if user_to_validate.role else None,
-        business_name=user_to_validate.business_name,
-        occupation=user_to_validate.occupation,
-        created_at=user_to_validate.created_at,
-        updated_at=user_to_validate.updated_at,
-    )
+    return json_response(user_response(user_to_validate))
 
 
 @router.patch(
@@ -134,25 +242,19 @@ def validate_user(
     response_model=MessageResponse,
     summary="Forzar cambio de contraseña",
 )
-def force_password_change(
+async def force_password_change(
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: TokenClaims = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
 ) -> MessageResponse:
     """Fuerza el cambio de contraseña en el próximo login.
     
     Útil para resets administrativos.
     Solo disponible para administradores.
     """
-    # Verificar que el usuario es admin
-    if current_user.role.name != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Solo administradores pueden forzar cambios de contraseña",
-        )
-    
     # Buscar el usuario
-    user = db.query(User).filter(User.id == user_id).first()
+    stmt = select(User).where(User.id == user_id)
+    user = (await db.execute(stmt)).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,7 +263,10 @@ def force_password_change(
     
     # Marcar que debe cambiar contraseña
     user.must_change_password = True
-    db.commit()
+    # Revocar las sesiones abiertas: el usuario debe volver a iniciar sesión
+    await revoke_all_sessions(db, user.id)
+    await db.commit()
+    invalidate_principal(user.email)
     
     return MessageResponse(
         message=f"Usuario {user.email} deberá cambiar contraseña en el próximo login"
@@ -6,11 +6,12 @@ Descripción: Endpoints de autenticación — registro, login, refresh, cambio y
 ¿Impacto? Este router es la puerta de entrada al sistema de auth de CALZADO J&R.
 """
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user, get_db
+from app.dependencies import get_async_db, get_current_user
 from app.models.user import User
+from app.schemas.serializers import ORJSONResponse, json_response
 from app.schemas.user import (
     ChangePasswordRequest,
     ForgotPasswordRequest,
@@ -23,6 +24,8 @@ from app.schemas.user import (
     UserResponse,
 )
 from app.services import auth_service
+from app.utils.client_ip import client_ip
+from app.utils.jobs import background_jobs
 
 router = APIRouter(
     prefix="/api/v1/auth",
@@ -36,33 +39,16 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     summary="Registrar nuevo cliente",
 )
-def register(
+async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-) -> UserResponse:
+    db: AsyncSession = Depends(get_async_db),
+) -> ORJSONResponse:
     """Registra un nuevo cliente en CALZADO J&R.
 
     La cuenta queda pendiente de validación por el administrador.
     """
-    user = auth_service.register_user(db=db, user_data=user_data)
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        name=user.name,
-        last_name=user.last_name,
-        phone=user.phone,
-        identity_document=user.identity_document,
-        identity_document_type_id=user.identity_document_type_id,
-        identity_document_type_name=user.identity_document_type.name if user.identity_document_type else None,
-        is_active=user.is_active,
-        is_validated=user.is_validated,
-        must_change_password=user.must_change_password,
-        role_name=user.role.name if user.role else None,
-        business_name=user.business_name,
-        occupation=user.occupation,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
+    user = await auth_service.register_user(db=db, user_data=user_data)
+    return json_response(user, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
@@ -70,12 +56,15 @@ def register(
     response_model=TokenResponse,
     summary="Iniciar sesión",
 )
-def login(
+async def login(
     login_data: UserLogin,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ) -> TokenResponse:
-    """Autentica un usuario y retorna tokens JWT."""
-    return auth_service.login_user(db=db, login_data=login_data)
+    """Autentica un usuario y retorna tokens JWT (429 + Retry-After ante abuso)."""
+    return await auth_service.login_user(
+        db=db, login_data=login_data, client_ip=client_ip(request)
+    )
 
 
 @router.post(
@@ -83,12 +72,12 @@ def login(
     response_model=TokenResponse,
     summary="Renovar access token",
 )
-def refresh_token(
+async def refresh_token(
     token_data: RefreshTokenRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TokenResponse:
     """Genera nuevos tokens usando un refresh token válido."""
-    return auth_service.refresh_access_token(
+    return await auth_service.refresh_access_token(
         db=db,
         refresh_token=token_data.refresh_token,
     )
@@ -99,18 +88,20 @@ def refresh_token(
     response_model=MessageResponse,
     summary="Cambiar contraseña (usuario autenticado)",
 )
-def change_password(
+async def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> MessageResponse:
     """Cambia la contraseña del usuario autenticado."""
-    auth_service.change_password(
+    await auth_service.change_password(
         db=db,
         user=current_user,
         password_data=password_data,
     )
-    return MessageResponse(message="Contraseña actualizada exitosamente")
+    return MessageResponse(
+        message="Contraseña actualizada exitosamente. Inicie sesión de nuevo"
+    )
 
 
 @router.post(
@@ -120,10 +111,17 @@ def change_password(
 )
 async def forgot_password(
     request_data: ForgotPasswordRequest,
-    db: Session = Depends(get_db),
 ) -> MessageResponse:
-    """Solicita un email de recuperación de contraseña."""
-    await auth_service.request_password_reset(db=db, email=request_data.email)
+    """Solicita un email de recuperación de contraseña.
+
+    Responde en tiempo constante: la búsqueda del usuario, el token y el email
+    se ejecutan en segundo plano, exista o no el email.
+    """
+    background_jobs.submit(
+        "password_reset_request",
+        auth_service.request_password_reset_job,
+        request_data.email,
+    )
     return MessageResponse(
         message="Si el email está registrado, recibirás un enlace de recuperación"
     )
@@ -134,10 +132,10 @@ async def forgot_password(
     response_model=MessageResponse,
     summary="Restablecer contraseña con token",
 )
-def reset_password(
+async def reset_password(
     reset_data: ResetPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> MessageResponse:
     """Restablece la contraseña usando un token de recuperación."""
-    auth_service.reset_password(db=db, reset_data=reset_data)
+    await auth_service.reset_password(db=db, reset_data=reset_data)
     return MessageResponse(message="Contraseña restablecida exitosamente")
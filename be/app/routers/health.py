@@ -0,0 +1,115 @@
+"""
+Módulo: routers/health.py
+Descripción: Endpoints de salud y diagnóstico del servidor.
+¿Para qué? Verificar que la API está viva y exponer el estado interno (pools, cachés)
+           para dimensionar la infraestructura con datos.
+¿Impacto? Lo consumen healthchecks de Docker/orquestadores y quien opera el sistema.
+          Solo `/api/v1/health` (liveness) es público; los diagnósticos exigen
+          acceso de monitoreo (`require_monitoring_access`).
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.database import pool_stats
+from app.dependencies import require_monitoring_access
+from app.services.catalog_cache import type_document_catalog
+from app.services.email_outbox import email_dispatcher
+from app.services.login_limiter import login_limiter
+from app.services.principal_cache import principal_cache
+from app.services.role_registry import role_registry
+from app.services.stock_snapshot import stock_snapshotter
+from app.services.token_reaper import reset_token_reaper
+from app.services.token_versions import token_version_stats
+from app.utils.jobs import background_jobs
+from app.utils.pg_notify import pg_listener
+from app.utils.security import verified_tokens
+
+router = APIRouter(
+    prefix="/api/v1/health",
+    tags=["health"],
+)
+
+# Diagnósticos internos: token de monitoreo o red permitida
+_monitoring = [Depends(require_monitoring_access)]
+
+
+@router.get(
+    "",
+    summary="Verificar estado del servidor",
+)
+async def health_check() -> dict[str, str]:
+    """Endpoint de verificación de salud del servidor."""
+    return {
+        "status": "healthy",
+        "project": "CALZADO J&R",
+        "version": "0.1.0",
+    }
+
+
+@router.get(
+    "/db",
+    dependencies=_monitoring,
+    summary="Estadísticas del pool de conexiones",
+)
+async def health_db() -> dict:
+    """Reporta el estado en vivo de los pools de conexiones de este worker.
+
+    Incluye conexiones en uso, overflow y el histograma de espera en el checkout.
+    Cada worker de Uvicorn tiene sus propios pools: los valores son por proceso.
+    """
+    return {"status": "healthy", "pools": pool_stats()}
+
+
+@router.get(
+    "/cache",
+    dependencies=_monitoring,
+    summary="Estadísticas de las cachés en memoria",
+)
+async def health_cache() -> dict:
+    """Reporta tamaño, aciertos y fallos de las cachés de este worker."""
+    return {
+        "status": "healthy",
+        "caches": {
+            "principals": principal_cache.stats(),
+            "token_versions": token_version_stats(),
+            "verified_tokens": verified_tokens.stats(),
+            "type_documents": type_document_catalog.stats(),
+            "roles": role_registry.stats(),
+        },
+        "pg_listener": pg_listener.stats(),
+    }
+
+
+@router.get(
+    "/email",
+    dependencies=_monitoring,
+    summary="Estado del despachador de emails",
+)
+async def health_email() -> dict:
+    """Reporta envíos, reintentos y el pool SMTP del despachador de este worker."""
+    return {"status": "healthy", "dispatcher": email_dispatcher.stats()}
+
+
+@router.get(
+    "/jobs",
+    dependencies=_monitoring,
+    summary="Métricas de los trabajos en segundo plano",
+)
+async def health_jobs() -> dict:
+    """Reporta cola, trabajos por resultado y duración, y los jobs periódicos, en este worker."""
+    return {
+        "status": "healthy",
+        "jobs": background_jobs.stats(),
+        "reset_token_reaper": reset_token_reaper.stats(),
+        "stock_snapshot": stock_snapshotter.stats(),
+    }
+
+
+@router.get(
+    "/rate-limit",
+    dependencies=_monitoring,
+    summary="Contadores del límite de intentos de login",
+)
+async def health_rate_limit() -> dict:
+    """Reporta intentos permitidos, bloqueados por IP/email y fallos en este worker."""
+    return {"status": "healthy", "login": login_limiter.stats()}
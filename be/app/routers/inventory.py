@@ -0,0 +1,151 @@
+"""
+Módulo: routers/inventory.py
+Descripción: Endpoints de stock de bodega y movimientos de inventario.
+¿Para qué? Que el personal consulte el stock por variante (talla + color),
+           registre entradas/salidas/ajustes y revise el historial de un producto.
+¿Impacto? Solo para administradores y empleados. La lógica y las consultas
+          están en services/inventory_service.py.
+"""
+
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.dependencies import get_async_db, require_role
+from app.schemas.inventory import (
+    InventoryMovementCreate,
+    InventoryMovementPage,
+    LedgerStockResponse,
+    StockChangeResponse,
+    StockResponse,
+)
+from app.schemas.user import TokenClaims
+from app.services.inventory_service import (
+    apply_movement,
+    get_variant_stock,
+    list_product_stock,
+    movement_history,
+)
+from app.services.stock_snapshot import ledger_stock
+from app.utils.audit import audit
+
+router = APIRouter(
+    prefix="/api/v1/inventory",
+    tags=["inventory"],
+)
+
+require_staff = require_role("admin", "employee")
+
+
+@router.get(
+    "/products/{product_id}/stock",
+    response_model=list[StockResponse],
+    summary="Stock de todas las variantes de un producto",
+)
+async def get_product_stock(
+    product_id: uuid.UUID,
+    current_user: TokenClaims = Depends(require_staff),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[StockResponse]:
+    """Lista el stock actual de cada talla y color activos del producto."""
+    return [StockResponse.model_validate(row) for row in await list_product_stock(db, product_id)]
+
+
+@router.get(
+    "/products/{product_id}/stock/ledger",
+    response_model=list[LedgerStockResponse],
+    summary="Stock de un producto según el historial de movimientos",
+)
+async def get_product_ledger_stock(
+    product_id: uuid.UUID,
+    current_user: TokenClaims = Depends(require_staff),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[LedgerStockResponse]:
+    """Suma de los movimientos por variante (snapshot + movimientos posteriores).
+
+    Sirve para conciliar con el stock actual: si difieren, hubo cambios en
+    `inventory` que no pasaron por un movimiento.
+    """
+    return [LedgerStockResponse.model_validate(row) for row in await ledger_stock(db, product_id)]
+
+
+@router.get(
+    "/products/{product_id}/stock/variant",
+    response_model=StockResponse,
+    summary="Stock de una variante (talla + color)",
+)
+async def get_product_variant_stock(
+    product_id: uuid.UUID,
+    size: str = Query(..., min_length=1, max_length=50),
+    colour: str | None = Query(None, min_length=1, max_length=100),
+    current_user: TokenClaims = Depends(require_staff),
+    db: AsyncSession = Depends(get_async_db),
+) -> StockResponse:
+    """Obtiene el stock de una talla y color; sin `colour` = variante sin color."""
+    stock = await get_variant_stock(db, product_id, size, colour)
+    if stock is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No hay stock registrado para esa variante",
+        )
+    return StockResponse.model_validate(stock)
+
+
+@router.post(
+    "/movements",
+    response_model=StockChangeResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Registrar un movimiento de inventario",
+)
+async def create_movement(
+    data: InventoryMovementCreate,
+    current_user: TokenClaims = Depends(require_staff),
+    db: AsyncSession = Depends(get_async_db),
+) -> StockChangeResponse:
+    """Registra una entrada, salida o ajuste y retorna el stock resultante.
+
+    Una salida (o ajuste negativo) mayor que el stock disponible se rechaza con 409,
+    igual que una entrada que dejaría el stock por encima de 99999999.99.
+    """
+    result = await apply_movement(db, data, current_user.user_id)
+    audit(
+        "inventory.movement",
+        current_user.user_id,
+        movement_id=result.movement.id,
+        product_id=data.product_id,
+        type=data.type_of_movement,
+        amount=data.amount,
+        stock=result.stock,
+    )
+    return result
+
+
+@router.get(
+    "/products/{product_id}/movements",
+    response_model=InventoryMovementPage,
+    summary="Historial de movimientos de un producto",
+)
+async def get_product_movements(
+    product_id: uuid.UUID,
+    date_from: datetime | None = Query(None, description="Movimientos desde (inclusive)"),
+    date_to: datetime | None = Query(None, description="Movimientos antes de (exclusivo)"),
+    cursor: str | None = Query(None, description="`next_cursor` de la página anterior"),
+    limit: int = Query(settings.ADMIN_PAGE_SIZE_DEFAULT, ge=1),
+    current_user: TokenClaims = Depends(require_staff),
+    db: AsyncSession = Depends(get_async_db),
+) -> InventoryMovementPage:
+    """Movimientos del más reciente al más antiguo, paginados por cursor.
+
+    El tamaño de página se limita a `ADMIN_PAGE_SIZE_MAX`.
+    """
+    return await movement_history(
+        db,
+        product_id,
+        limit=min(limit, settings.ADMIN_PAGE_SIZE_MAX),
+        cursor=cursor,
+        date_from=date_from,
+        date_to=date_to,
+    )
@@ -0,0 +1,45 @@
+"""
+Módulo: routers/metrics.py
+Descripción: Endpoint `/metrics` en formato de texto de Prometheus.
+¿Para qué? Que Prometheus (u otro recolector compatible) lea latencias por ruta,
+           requests en curso, códigos de estado, consultas SQL y esperas del pool.
+¿Impacto? Los valores son del worker que atiende el scrape: con varios workers,
+          cada proceso expone los suyos. Exige acceso de monitoreo (token Bearer
+          `MONITORING_TOKEN` o una red de `MONITORING_ALLOWED_NETWORKS`).
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.database import async_engine, engine
+from app.dependencies import require_monitoring_access
+from app.utils.metrics import prometheus_histogram
+from app.utils.request_timing import request_metrics
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_metrics() -> list[str]:
+    lines = [
+        "# HELP db_pool_checkout_wait_seconds Espera hasta obtener una conexión del pool.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        lines += prometheus_histogram(
+            "db_pool_checkout_wait_seconds", {"pool": name}, pool.wait_histogram.snapshot()
+        )
+    return lines
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_monitoring_access)],
+    summary="Métricas en formato Prometheus",
+)
+async def metrics() -> PlainTextResponse:
+    """Latencia y consultas por ruta, requests en curso y esperas del pool de este worker."""
+    body = request_metrics.render() + "\n".join(_pool_metrics()) + "\n"
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
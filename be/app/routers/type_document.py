@@ -7,12 +7,15 @@ Descripción: Endpoints para gestionar tipos de documentos de identidad.
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.config import settings
+from app.dependencies import get_async_db
 from app.models.type_document import TypeDocument
 from app.schemas.type_document import TypeDocumentCreate, TypeDocumentResponse
+from app.services.catalog_cache import etag_matches, type_document_catalog
 
 router = APIRouter(
     prefix="/api/v1/type-documents",
@@ -25,15 +28,23 @@ router = APIRouter(
     response_model=list[TypeDocumentResponse],
     summary="Listar todos los tipos de documentos",
 )
-def get_all_type_documents(
-    db: Session = Depends(get_db),
-) -> list[TypeDocumentResponse]:
-    """Obtiene la lista de todos los tipos de documentos disponibles."""
-    type_documents = db.query(TypeDocument).all()
-    return [
-        TypeDocumentResponse(id=td.id, name=td.name)
-        for td in type_documents
-    ]
+async def get_all_type_documents(
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Obtiene la lista de todos los tipos de documentos disponibles.
+
+    Se sirve desde la caché del catálogo; si el cliente envía el ETag vigente
+    en `If-None-Match` se responde 304 sin cuerpo.
+    """
+    catalog = await type_document_catalog.get(db)
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, catalog.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
 
 
 @router.get(
@@ -41,22 +52,21 @@ def get_all_type_documents(
     response_model=TypeDocumentResponse,
     summary="Obtener tipo de documento por ID",
 )
-def get_type_document(
+async def get_type_document(
     type_document_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TypeDocumentResponse:
     """Obtiene un tipo de documento específico por su ID."""
-    type_document = db.query(TypeDocument).filter(
-        TypeDocument.id == type_document_id
-    ).first()
-    
-    if not type_document:
+    catalog = await type_document_catalog.get(db)
+    name = catalog.items.get(type_document_id)
+
+    if name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tipo de documento no encontrado",
         )
-    
-    return TypeDocumentResponse(id=type_document.id, name=type_document.name)
+
+    return TypeDocumentResponse(id=type_document_id, name=name)
 
 
 @router.post(
@@ -65,25 +75,25 @@ def get_type_document(
     status_code=status.HTTP_201_CREATED,
     summary="Crear nuevo tipo de documento",
 )
-def create_type_document(
+async def create_type_document(
     type_document_data: TypeDocumentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TypeDocumentResponse:
     """Crea un nuevo tipo de documento."""
     # Verificar que no exista uno con el mismo nombre
-    existing = db.query(TypeDocument).filter(
-        TypeDocument.name == type_document_data.name
-    ).first()
-    
+    stmt = select(TypeDocument.id).where(TypeDocument.name == type_document_data.name)
+    existing = (await db.execute(stmt)).scalar_one_or_none()
+
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"El tipo de documento '{type_document_data.name}' ya existe",
         )
-    
+
     new_type_document = TypeDocument(name=type_document_data.name)
     db.add(new_type_document)
-    db.commit()
-    db.refresh(new_type_document)
-    
+    await db.commit()
+    # Los demás workers se enteran por el NOTIFY del trigger de type_document
+    type_document_catalog.invalidate()
+
     return TypeDocumentResponse(id=new_type_document.id, name=new_type_document.name)
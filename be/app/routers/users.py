@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends
 
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.schemas.serializers import ORJSONResponse, json_response, user_response
 from app.schemas.user import UserResponse
 
 router = APIRouter(
@@ -24,21 +25,6 @@ router = APIRouter(
 )
 def get_me(
     current_user: User = Depends(get_current_user),
-) -> UserResponse:
+) -> ORJSONResponse:
     """Retorna los datos del usuario autenticado."""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        name=current_user.name,
-        last_name=current_user.last_name,
-        phone=current_user.phone,
-        identity_document=current_user.identity_document,
-        is_active=current_user.is_active,
-        is_validated=current_user.is_validated,
-        must_change_password=current_user.must_change_password,
-        role_name=current_user.role.name if current_user.role else None,
-        business_name=current_user.business_name,
-        occupation=current_user.occupation,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
-    )
+    return json_response(user_response(current_user))
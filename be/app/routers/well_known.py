@@ -0,0 +1,27 @@
+"""
+Módulo: routers/well_known.py
+Descripción: Endpoints `/.well-known` — publicación de llaves públicas JWT (JWKS).
+¿Para qué? Que otros servicios (gateways, réplicas, servicios de borde) verifiquen
+           los tokens emitidos por esta API sin compartir ninguna llave secreta.
+¿Impacto? Solo expone llaves públicas; con ALGORITHM=HS256 la lista está vacía.
+"""
+
+from fastapi import APIRouter, Response
+
+from app.utils.security import key_ring
+
+router = APIRouter(
+    prefix="/.well-known",
+    tags=["well-known"],
+)
+
+
+@router.get(
+    "/jwks.json",
+    summary="Llaves públicas para verificar tokens (JWKS)",
+)
+async def get_jwks(response: Response) -> dict:
+    """Retorna el JWK Set con las llaves públicas vigentes (una por `kid`)."""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    key_ring.load()
+    return key_ring.jwks
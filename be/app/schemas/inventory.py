@@ -0,0 +1,90 @@
+"""
+Módulo: schemas/inventory.py
+Descripción: Schemas Pydantic para el stock de bodega y sus movimientos.
+¿Para qué? Validar los movimientos que registra el personal y dar forma a las
+           consultas de stock por variante y al historial por producto.
+¿Impacto? Las cantidades son Decimal con 2 decimales (NUMERIC(10, 2) en la BD).
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class InventoryMovementCreate(BaseModel):
+    """Schema para registrar un movimiento de inventario."""
+    product_id: uuid.UUID
+    type_of_movement: Literal["entrada", "salida", "ajuste"]
+    size: str = Field(..., min_length=1, max_length=50)
+    colour: str | None = Field(None, min_length=1, max_length=100)
+    # Entradas y salidas en positivo; un ajuste suma o resta según su signo
+    amount: Decimal = Field(..., max_digits=10, decimal_places=2)
+    reason: str | None = Field(None, max_length=255)
+
+    @model_validator(mode="after")
+    def validate_amount(self) -> "InventoryMovementCreate":
+        if self.type_of_movement == "ajuste":
+            if self.amount == 0:
+                raise ValueError("Un ajuste debe tener una cantidad distinta de cero")
+        elif self.amount <= 0:
+            raise ValueError("La cantidad de una entrada o salida debe ser positiva")
+        return self
+
+    @property
+    def delta(self) -> Decimal:
+        """Cambio que el movimiento aplica al stock."""
+        return -self.amount if self.type_of_movement == "salida" else self.amount
+
+
+class StockResponse(BaseModel):
+    """Stock de una variante (talla + color) de un producto."""
+    id: uuid.UUID
+    product_id: uuid.UUID
+    size: str
+    colour: str | None
+    amount: Decimal
+    minimum_stock: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LedgerStockResponse(BaseModel):
+    """Stock de una variante según el historial de movimientos."""
+    product_id: uuid.UUID
+    size: str | None
+    colour: str | None
+    amount: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryMovementResponse(BaseModel):
+    """Schema de respuesta de un movimiento de inventario."""
+    id: uuid.UUID
+    product_id: uuid.UUID
+    user_id: uuid.UUID
+    type_of_movement: str
+    size: str | None
+    colour: str | None
+    amount: Decimal
+    reason: str | None
+    movement_date: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockChangeResponse(BaseModel):
+    """Movimiento registrado y stock resultante de la variante."""
+    movement: InventoryMovementResponse
+    stock: Decimal
+
+
+class InventoryMovementPage(BaseModel):
+    """Página del historial de movimientos paginada por cursor."""
+    items: list[InventoryMovementResponse]
+    # Cursor para pedir la siguiente página; `None` si no hay más
+    next_cursor: str | None = None
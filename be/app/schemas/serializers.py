@@ -0,0 +1,85 @@
+"""
+Módulo: schemas/serializers.py
+Descripción: Capa única de serialización ORM/filas → respuestas de la API.
+¿Para qué? Que todos los endpoints construyan `UserResponse` de la misma forma y
+           sin validar de nuevo datos que ya vienen de la BD (confiables).
+¿Impacto? `model_construct` omite la validación de pydantic y `ORJSONResponse`
+          serializa con orjson; FastAPI no vuelve a validar un `Response` ya armado.
+          Usar solo con datos de la BD, nunca con entrada del cliente.
+"""
+
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+
+def _orjson_default(value: Any) -> Any:
+    """Tipos que orjson no serializa por sí mismo (ej. el UUID propio de asyncpg)."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """Respuesta JSON serializada con orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default)
+
+
+def user_response(user: User) -> UserResponse:
+    """Construye la respuesta de un usuario ORM (con rol y tipo de documento cargados)."""
+    document_type = user.identity_document_type
+    role = user.role
+    return UserResponse.model_construct(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        last_name=user.last_name,
+        phone=user.phone,
+        identity_document=user.identity_document,
+        identity_document_type_id=user.identity_document_type_id,
+        identity_document_type_name=document_type.name if document_type else None,
+        is_active=user.is_active,
+        is_validated=user.is_validated,
+        must_change_password=user.must_change_password,
+        role_name=role.name if role else None,
+        business_name=user.business_name,
+        occupation=user.occupation,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+
+def user_response_from_row(row: Row, **extra: Any) -> UserResponse:
+    """Construye la respuesta desde una fila cuyas columnas se llaman como los campos.
+
+    `extra` completa los campos que la fila no trae (ej. `role_name` desde una caché).
+    """
+    return UserResponse.model_construct(**row._mapping, **extra)
+
+
+def user_responses_from_rows(rows: Iterable[Row]) -> list[UserResponse]:
+    """Versión para listados de `user_response_from_row`."""
+    return [UserResponse.model_construct(**row._mapping) for row in rows]
+
+
+def json_response(
+    content: BaseModel | list[BaseModel],
+    status_code: int = 200,
+    **kwargs: Any,
+) -> ORJSONResponse:
+    """Serializa modelos ya construidos con orjson, sin pasar por la validación de FastAPI."""
+    if isinstance(content, list):
+        payload: Any = [item.model_dump() for item in content]
+    else:
+        payload = content.model_dump()
+    return ORJSONResponse(payload, status_code=status_code, **kwargs)
@@ -10,9 +10,11 @@ import re
 import uuid
 from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 
+from app.config import settings
 
 # ════════════════════════════════════════
 # 📋 ENUMS para valores predefinidos
@@ -127,6 +129,25 @@ class UserCreate(BaseModel):
         return v
 
 
+class BulkValidateRequest(BaseModel):
+    """Schema para validar varios usuarios en una sola solicitud (admin)."""
+    user_ids: list[uuid.UUID]
+
+    @field_validator("user_ids")
+    @classmethod
+    def validate_user_ids(cls, v: list[uuid.UUID]) -> list[uuid.UUID]:
+        """Elimina duplicados (conservando el orden) y aplica el máximo configurado."""
+        v = list(dict.fromkeys(v))
+        if not v:
+            raise ValueError("Debe indicar al menos un usuario")
+        if len(v) > settings.ADMIN_BULK_VALIDATE_MAX:
+            raise ValueError(
+                f"No se pueden validar más de {settings.ADMIN_BULK_VALIDATE_MAX} usuarios "
+                "por solicitud"
+            )
+        return v
+
+
 class UserLogin(BaseModel):
     """Schema para el login de un usuario."""
     email: EmailStr
@@ -210,6 +231,36 @@ class UserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPage(BaseModel):
+    """Página de usuarios paginada por cursor."""
+    items: list[UserResponse]
+    # Cursor para pedir la siguiente página; `None` si no hay más
+    next_cursor: str | None = None
+    # Estimación del planificador de PostgreSQL (no es un COUNT exacto); solo en
+    # la primera página (sin cursor), las siguientes traen `None`
+    total_estimate: int | None = None
+
+
+class BulkValidateResult(BaseModel):
+    """Resultado de la validación de un usuario dentro de una solicitud masiva."""
+    user_id: uuid.UUID
+    status: Literal["validated", "not_found"]
+
+
+class BulkValidateResponse(BaseModel):
+    """Schema de respuesta de la validación masiva."""
+    validated: int
+    results: list[BulkValidateResult]
+
+
+class TokenClaims(BaseModel):
+    """Claims de un access token ya verificado (autorización sin consultar la BD)."""
+    sub: str
+    user_id: uuid.UUID
+    role: str
+    version: int
+
+
 class TokenResponse(BaseModel):
     """Schema de respuesta con los tokens de autenticación."""
     access_token: str
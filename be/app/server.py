@@ -0,0 +1,126 @@
+"""
+Módulo: server.py
+Descripción: Lanzador de producción — Gunicorn como supervisor con workers Uvicorn.
+¿Para qué? Arrancar la API con la app importada una sola vez en el proceso maestro
+           antes del fork (los workers comparten esas páginas de memoria y arrancan
+           sin volver a importar), un worker por CPU de la cuota del contenedor,
+           uvloop + httptools y timeouts de keep-alive / apagado desde Settings.
+¿Impacto? Lo ejecuta el stage `prod` del Dockerfile (`python -m app.server`). En
+          desarrollo se sigue usando `uvicorn app.main:app --reload`. El lifespan
+          (conexiones, listeners, tareas de fondo) corre en cada worker, después
+          del fork; nada de eso existe todavía en el maestro.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import ClassVar
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from app.config import settings
+
+
+class Worker(UvicornWorker):
+    """Worker Uvicorn con el event loop y el parser HTTP en C."""
+
+    CONFIG_KWARGS: ClassVar[dict] = {"loop": "uvloop", "http": "httptools"}
+
+
+# ────────────────────────────
+# 🧮 Cantidad de workers
+# ────────────────────────────
+
+
+def cpu_quota() -> float | None:
+    """CPUs que permite la cuota del cgroup (límite de CPU del contenedor), o None."""
+    # cgroup v2: "<cuota> <periodo>" o "max <periodo>"
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1: cuota -1 = sin límite
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def default_workers() -> int:
+    """Un worker por CPU utilizable: cada worker es un event loop que ya atiende
+    muchas requests concurrentes, así que más workers que CPUs solo compiten
+    por el mismo tiempo de CPU (y multiplican los pools de conexiones a la BD).
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+# ────────────────────────────
+# 🍴 Hooks de Gunicorn
+# ────────────────────────────
+
+
+def _post_fork(server, worker) -> None:
+    """Descarta las conexiones heredadas del maestro sin cerrarlas (son del maestro)."""
+    from app.database import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+
+def _when_ready(server) -> None:
+    print(
+        f"🏭 Servidor de producción en {settings.SERVER_HOST}:{settings.SERVER_PORT} "
+        f"({server.num_workers} workers, app precargada)"
+    )
+
+
+def server_options() -> dict:
+    """Configuración de Gunicorn a partir de Settings."""
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": settings.SERVER_WORKERS or default_workers(),
+        "worker_class": "app.server.Worker",
+        "preload_app": True,
+        "backlog": settings.SERVER_BACKLOG,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        # Latidos de los workers en memoria compartida, no en el disco del contenedor
+        "worker_tmp_dir": "/dev/shm" if os.path.isdir("/dev/shm") else None,
+        "post_fork": _post_fork,
+        "when_ready": _when_ready,
+    }
+
+
+class ProductionServer(BaseApplication):
+    """Aplicación Gunicorn configurada desde código (sin gunicorn.conf.py)."""
+
+    def __init__(self, options: dict) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+def main() -> None:
+    ProductionServer(server_options()).run()
+
+
+if __name__ == "__main__":
+    main()
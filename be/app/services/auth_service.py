@@ -6,86 +6,169 @@ Descripción: Lógica de negocio para todas las operaciones de autenticación.
 """
 
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models.password_reset_token import PasswordResetToken
+from app.models.refresh_token import RefreshToken
 from app.models.role import Role
 from app.models.user import User
+from app.schemas.serializers import user_response_from_row
 from app.schemas.user import (
     ChangePasswordRequest,
     ResetPasswordRequest,
     TokenResponse,
     UserCreate,
     UserLogin,
+    UserResponse,
+)
+from app.services.catalog_cache import type_document_catalog
+from app.services.email_outbox import email_dispatcher, enqueue_template
+from app.services.login_limiter import login_limiter
+from app.services.principal_cache import invalidate_principal
+from app.services.role_registry import role_registry
+from app.services.token_versions import forget_token_version
+from app.utils.email import (
+    PASSWORD_RESET_SUBJECT,
+    PASSWORD_RESET_TEMPLATE,
+    OutgoingEmail,
+    password_reset_email,
 )
-from app.utils.email import send_password_reset_email
 from app.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    generate_reset_token,
+    hash_password_async,
+    hash_reset_token,
+    verify_password_async,
+)
+
+# Columnas de `users` que forman un UserResponse (sin los nombres de rol/tipo de documento)
+_USER_RESPONSE_COLUMNS = (
+    User.id,
+    User.email,
+    User.name,
+    User.last_name,
+    User.phone,
+    User.identity_document,
+    User.identity_document_type_id,
+    User.is_active,
+    User.is_validated,
+    User.must_change_password,
+    User.business_name,
+    User.occupation,
+    User.created_at,
+    User.updated_at,
 )
 
 
-def register_user(db: Session, user_data: UserCreate) -> User:
+def _token_data(user: User) -> dict:
+    """Claims comunes del access y refresh token.
+
+    `uid`, `role` y `ver` permiten autorizar por rol sin cargar el usuario
+    (ver `dependencies.require_role`).
+    """
+    return {
+        "sub": user.email,
+        "uid": str(user.id),
+        "role": user.role.name,
+        "ver": user.token_version,
+    }
+
+
+async def register_user(db: AsyncSession, user_data: UserCreate) -> UserResponse:
     """Registra un nuevo cliente en el sistema.
 
-    Flujo: verifica email duplicado → obtiene rol client → hashea password → crea en BD.
+    Flujo: obtiene rol client (en memoria) → hashea password → un solo
+    `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING`. Si no retorna fila, el
+    email ya existía (también bajo registros concurrentes con el mismo email).
     El cliente queda con is_active=False, is_validated=False hasta que un admin lo valide.
     """
-    # Verificar email duplicado
-    stmt = select(User).where(User.email == user_data.email)
-    existing_user = db.execute(stmt).scalar_one_or_none()
+    # Obtener el rol de cliente (registro en memoria; se recarga una vez si falta)
+    client_role_id = role_registry.id_for("client")
+    if client_role_id is None:
+        await role_registry.load()
+        client_role_id = role_registry.id_for("client")
 
-    if existing_user:
+    if client_role_id is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El email ya está registrado",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error de configuración: rol 'client' no encontrado",
         )
 
-    # Obtener el rol de cliente
-    stmt = select(Role).where(Role.name == "client")
-    client_role = db.execute(stmt).scalar_one_or_none()
+    # Nombre del tipo de documento desde la caché del catálogo (recarga una vez si falta)
+    document_type_name = None
+    if user_data.identity_document_type_id is not None:
+        catalog = await type_document_catalog.get(db)
+        if user_data.identity_document_type_id not in catalog.items:
+            type_document_catalog.invalidate()
+            catalog = await type_document_catalog.get(db)
+        document_type_name = catalog.items.get(user_data.identity_document_type_id)
+        if document_type_name is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Tipo de documento no válido",
+            )
 
-    if not client_role:
+    # Crear el usuario con cuenta inactiva (pendiente de validación)
+    stmt = (
+        pg_insert(User)
+        .values(
+            email=user_data.email,
+            name=user_data.name,
+            last_name=user_data.last_name,
+            phone=user_data.phone,
+            identity_document=user_data.identity_document,
+            identity_document_type_id=user_data.identity_document_type_id,
+            business_name=user_data.business_name,
+            occupation=user_data.occupation,
+            hashed_password=await hash_password_async(user_data.password),
+            role_id=client_role_id,
+            is_active=False,
+            is_validated=False,
+            must_change_password=False,
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(*_USER_RESPONSE_COLUMNS)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+
+    if row is None:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error de configuración: rol 'client' no encontrado",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El email ya está registrado",
         )
 
-    # Crear el usuario con cuenta inactiva (pendiente de validación)
-    new_user = User(
-        email=user_data.email,
-        name=user_data.name,
-        last_name=user_data.last_name,
-        phone=user_data.phone,
-        identity_document=user_data.identity_document,
-        identity_document_type_id=user_data.identity_document_type_id,
-        business_name=user_data.business_name,
-        occupation=user_data.occupation,
-        hashed_password=hash_password(user_data.password),
-        role_id=client_role.id,
-        is_active=False,
-        is_validated=False,
-    )
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
-
-
-def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
-    """Autentica un usuario y retorna tokens JWT."""
+    await db.commit()
+    return user_response_from_row(
+        row,
+        identity_document_type_name=document_type_name,
+        role_name="client",
+    )
+
+
+async def login_user(db: AsyncSession, login_data: UserLogin, client_ip: str) -> TokenResponse:
+    """Autentica un usuario y retorna tokens JWT.
+
+    El limitador se consulta antes de buscar el usuario y de correr bcrypt: una
+    ráfaga abusiva recibe 429 sin costo de BD ni de CPU.
+    """
+    await login_limiter.check(client_ip, login_data.email)
+
     stmt = select(User).where(User.email == login_data.email)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
+        await login_limiter.record_failure(login_data.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales inválidas",
@@ -98,8 +181,26 @@ def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
             detail="Cuenta pendiente de validación por el administrador.",
         )
 
-    access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    await login_limiter.record_success(login_data.email)
+
+    # Cada login abre una nueva familia de refresh tokens
+    family_id = uuid.uuid4()
+    jti = uuid.uuid4()
+    db.add(
+        RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user.id,
+            expires_at=_refresh_expiration(),
+        )
+    )
+    await db.commit()
+
+    token_data = _token_data(user)
+    access_token = create_access_token(data=token_data)
+    refresh_token = create_refresh_token(
+        data={**token_data, "jti": str(jti), "fam": str(family_id)}
+    )
 
     return TokenResponse(
         access_token=access_token,
@@ -107,35 +208,89 @@ def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
     )
 
 
-def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
-    """Genera un nuevo access token usando un refresh token válido."""
+def _refresh_expiration() -> datetime:
+    """Fecha de expiración de un refresh token emitido ahora."""
+    return datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenResponse:
+    """Rota un refresh token válido y emite un nuevo par de tokens.
+
+    Una sola sentencia marca el token como usado, inserta su sucesor y retorna los
+    datos del usuario; un token revocado, usado o expirado no rota (el UPDATE lo
+    filtra). Si el token ya había sido usado se trata como robo y se revoca la familia.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token inválido o expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
     payload = decode_token(refresh_token)
 
     if not payload or payload.get("type") != "refresh":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh token inválido o expirado",
-            headers={"WWW-Authenticate": "Bearer"},
+        raise invalid_exception
+
+    try:
+        jti = uuid.UUID(payload["jti"])
+        family_id = uuid.UUID(payload["fam"])
+    except (KeyError, TypeError, ValueError):
+        raise invalid_exception
+
+    # Rotación atómica: UPDATE (marcar usado) + INSERT (sucesor) + datos del usuario
+    new_jti = uuid.uuid4()
+    old = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
         )
-
-    email: str | None = payload.get("sub")
-    if not email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token sin identificador de usuario",
+        .values(used_at=func.now())
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .cte("old")
+    )
+    successor = (
+        insert(RefreshToken)
+        .from_select(
+            ["jti", "family_id", "user_id", "expires_at"],
+            select(
+                literal(new_jti, UUID(as_uuid=True)),
+                old.c.family_id,
+                old.c.user_id,
+                literal(_refresh_expiration()),
+            ),
         )
+        .returning(RefreshToken.user_id)
+        .cte("successor")
+    )
+    stmt = (
+        select(User.id, User.email, User.token_version, User.is_active, Role.name)
+        .join(successor, successor.c.user_id == User.id)
+        .join(Role, Role.id == User.role_id)
+    )
+    row = (await db.execute(stmt)).one_or_none()
 
-    stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
+    if row is None:
+        await _handle_failed_rotation(db, jti, family_id)
+        raise invalid_exception
 
-    if not user or not user.is_active:
+    user_id, email, token_version, is_active, role_name = row
+    if not is_active or payload.get("ver", 0) != token_version:
+        # Sin commit: la rotación se deshace al cerrar la sesión
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado o cuenta desactivada",
         )
 
-    new_access = create_access_token(data={"sub": user.email})
-    new_refresh = create_refresh_token(data={"sub": user.email})
+    await db.commit()
+
+    token_data = {"sub": email, "uid": str(user_id), "role": role_name, "ver": token_version}
+    new_access = create_access_token(data=token_data)
+    new_refresh = create_refresh_token(
+        data={**token_data, "jti": str(new_jti), "fam": str(family_id)}
+    )
 
     return TokenResponse(
         access_token=new_access,
@@ -143,77 +298,164 @@ def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
     )
 
 
-def change_password(db: Session, user: User, password_data: ChangePasswordRequest) -> None:
-    """Cambia la contraseña de un usuario autenticado."""
-    if not verify_password(password_data.current_password, user.hashed_password):
+async def _handle_failed_rotation(
+    db: AsyncSession,
+    jti: uuid.UUID,
+    family_id: uuid.UUID,
+) -> None:
+    """Si el token ya se había rotado (reutilización), revoca toda su familia."""
+    stmt = select(RefreshToken.used_at).where(RefreshToken.jti == jti)
+    used_at = (await db.execute(stmt)).scalar_one_or_none()
+    if used_at is None:
+        return
+
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+    await db.commit()
+
+
+async def revoke_all_sessions(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Revoca todas las sesiones de un usuario (refresh tokens y access tokens).
+
+    Incrementa `token_version` y marca como revocadas todas sus familias de
+    refresh tokens. No hace commit: el llamador lo hace junto con su propio cambio.
+    """
+    await db.execute(
+        update(User).where(User.id == user_id).values(token_version=User.token_version + 1)
+    )
+    await _revoke_refresh_families(db, user_id)
+    forget_token_version(user_id)
+
+
+async def _revoke_refresh_families(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Marca como revocadas las familias de refresh tokens activas del usuario."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+
+
+async def change_password(
+    db: AsyncSession,
+    user: User,
+    password_data: ChangePasswordRequest,
+) -> None:
+    """Cambia la contraseña de un usuario autenticado.
+
+    `user` puede venir de la caché de principals (desligado de la sesión), así que
+    el hash actual se lee de la BD y el cambio se escribe con un UPDATE explícito.
+    Como en `reset_password`, se revocan todas las sesiones abiertas con la
+    contraseña anterior (incluida la actual: hay que volver a iniciar sesión).
+    """
+    stmt = select(User.hashed_password).where(User.id == user.id)
+    current_hash = (await db.execute(stmt)).scalar_one()
+
+    if not await verify_password_async(password_data.current_password, current_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="La contraseña actual es incorrecta",
         )
 
-    user.hashed_password = hash_password(password_data.new_password)
-    db.commit()
+    new_hash = await hash_password_async(password_data.new_password)
+    await db.execute(
+        update(User).where(User.id == user.id).values(hashed_password=new_hash)
+    )
+    await revoke_all_sessions(db, user.id)
+    await db.commit()
+    invalidate_principal(user.email)
 
 
-async def request_password_reset(db: Session, email: str) -> None:
+async def request_password_reset(db: AsyncSession, email: str) -> None:
     """Solicita un email de recuperación de contraseña.
 
     SIEMPRE retorna éxito, incluso si el email no existe (previene enumeración).
+    El endpoint no la espera: se ejecuta como trabajo en segundo plano
+    (ver `request_password_reset_job`).
     """
     stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
 
     if not user:
         return
 
-    reset_token = str(uuid.uuid4())
+    # Se encola solo la plantilla: el token se emite al enviar el email
+    # (ver `render_password_reset_email`), así que la outbox no guarda secretos
+    enqueue_template(db, PASSWORD_RESET_TEMPLATE, user.email, PASSWORD_RESET_SUBJECT, user.id)
+    await db.commit()
+    email_dispatcher.wake()
 
-    token_record = PasswordResetToken(
-        user_id=user.id,
-        token=reset_token,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
-    )
 
-    db.add(token_record)
-    db.commit()
+async def render_password_reset_email(
+    db: AsyncSession, recipient: str, user_id: uuid.UUID
+) -> OutgoingEmail:
+    """Arma el email de recuperación al enviarlo (plantilla de la outbox).
 
-    await send_password_reset_email(email=user.email, token=reset_token)
+    Emite un token nuevo: en la BD solo queda su hash y el token en claro solo
+    existe en el email. La hora de validez corre desde el envío.
+    """
+    reset_token, token_hash = generate_reset_token()
+    db.add(
+        PasswordResetToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            expires_at=datetime.now(UTC) + timedelta(hours=1),
+        )
+    )
+    return password_reset_email(email=recipient, token=reset_token)
 
 
-def reset_password(db: Session, reset_data: ResetPasswordRequest) -> None:
-    """Restablece la contraseña usando un token de recuperación."""
-    stmt = select(PasswordResetToken).where(
-        PasswordResetToken.token == reset_data.token
-    )
-    token_record = db.execute(stmt).scalar_one_or_none()
+async def request_password_reset_job(email: str) -> None:
+    """Trabajo en segundo plano de forgot-password, con su propia sesión de BD."""
+    async with AsyncSessionLocal() as db:
+        await request_password_reset(db, email)
 
-    if not token_record:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Token de recuperación inválido",
-        )
 
-    if token_record.used:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Este token de recuperación ya fue utilizado",
-        )
+async def reset_password(db: AsyncSession, reset_data: ResetPasswordRequest) -> None:
+    """Restablece la contraseña usando un token de recuperación.
 
-    if token_record.expires_at < datetime.now(timezone.utc):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El token de recuperación ha expirado. Solicite uno nuevo.",
+    El token se canjea y la contraseña se actualiza en un solo statement: el
+    UPDATE sobre `password_reset_tokens` toma el lock de la fila, así que de dos
+    resets concurrentes con el mismo token solo uno encuentra `NOT used`.
+    Inválido, usado y expirado dan el mismo error (no se revela cuál fue).
+    """
+    # bcrypt fuera de la transacción: no retiene locks mientras hashea
+    new_hash = await hash_password_async(reset_data.new_password)
+
+    consumed = (
+        update(PasswordResetToken)
+        .where(
+            PasswordResetToken.token_hash == hash_reset_token(reset_data.token),
+            PasswordResetToken.used.is_(False),
+            PasswordResetToken.expires_at > func.now(),
         )
+        .values(used=True)
+        .returning(PasswordResetToken.user_id)
+        .cte("consumed")
+    )
+    stmt = (
+        update(User)
+        .where(User.id == consumed.c.user_id)
+        .values(hashed_password=new_hash, token_version=User.token_version + 1)
+        .returning(User.id, User.email)
+        # No hay objetos cargados en la sesión que sincronizar
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(stmt)).one_or_none()
 
-    stmt = select(User).where(User.id == token_record.user_id)
-    user = db.execute(stmt).scalar_one_or_none()
-
-    if not user:
+    if row is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Usuario no encontrado",
+            detail="Token de recuperación inválido o expirado",
         )
 
-    user.hashed_password = hash_password(reset_data.new_password)
-    token_record.used = True
-    db.commit()
+    # Revocar todas las sesiones abiertas con la contraseña anterior
+    # (token_version ya se incrementó arriba)
+    await _revoke_refresh_families(db, row.id)
+    await db.commit()
+    forget_token_version(row.id)
+    invalidate_principal(row.email)
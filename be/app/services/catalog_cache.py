@@ -0,0 +1,102 @@
+"""
+Módulo: services/catalog_cache.py
+Descripción: Caché en memoria del catálogo de tipos de documento, con ETag.
+¿Para qué? El formulario de registro pide el catálogo en cada carga de página y el
+           catálogo casi nunca cambia: se sirve el JSON ya renderizado y los clientes
+           que repiten la petición reciben 304 sin tocar la BD.
+¿Impacto? El ETag se deriva del contenido, así que todos los workers entregan el mismo
+          ETag para el mismo catálogo. Un cambio en `type_document` dispara un NOTIFY
+          (trigger en 02_triggers_and_indexes.sql) que invalida la caché en cada worker.
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.type_document import TypeDocument
+
+# Canal de NOTIFY compartido por las tablas de catálogo; el payload es el nombre de la tabla
+CATALOG_CHANNEL = "catalog_changed"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Catálogo cargado: filas, JSON renderizado y su ETag."""
+
+    items: dict[uuid.UUID, str]
+    body: bytes
+    etag: str
+    loaded_at: float
+
+
+class TypeDocumentCatalog:
+    """Catálogo de tipos de documento versionado por proceso."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self.version = 0
+        self.loads = 0
+        self.hits = 0
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """Retorna el catálogo vigente; lo carga de la BD si no está o expiró."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            self.hits += 1
+            return snapshot
+        async with self._lock:
+            # Otra corrutina pudo cargarlo mientras se esperaba el lock
+            if self._snapshot is not None and self._snapshot is not snapshot:
+                return self._snapshot
+            version = self.version
+            stmt = select(TypeDocument.id, TypeDocument.name).order_by(TypeDocument.name)
+            rows = (await db.execute(stmt)).all()
+            body = orjson.dumps([{"id": str(row.id), "name": row.name} for row in rows])
+            loaded = CatalogSnapshot(
+                items={row.id: row.name for row in rows},
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                loaded_at=time.monotonic(),
+            )
+            self.loads += 1
+            # Si llegó una invalidación durante la consulta, no se guarda lo leído
+            if version == self.version:
+                self._snapshot = loaded
+            return loaded
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """Descarta el catálogo cargado (handler de NOTIFY y de escrituras locales)."""
+        self.version += 1
+        self._snapshot = None
+
+    def stats(self) -> dict[str, int | bool]:
+        """Contadores para monitoreo."""
+        return {
+            "loaded": self._snapshot is not None,
+            "version": self.version,
+            "loads": self.loads,
+            "hits": self.hits,
+        }
+
+
+type_document_catalog = TypeDocumentCatalog(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evalúa el header `If-None-Match` (lista de ETags, débiles o `*`)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
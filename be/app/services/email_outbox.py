@@ -0,0 +1,284 @@
+"""
+Módulo: services/email_outbox.py
+Descripción: Outbox de emails — encolado transaccional y despachador en segundo plano.
+¿Para qué? Que ningún request espere un handshake SMTP: el email se inserta en
+           `email_outbox` junto con el dato que lo origina y se envía después, en
+           lotes, reutilizando conexiones SMTP y con reintentos con backoff.
+¿Impacto? Con varios workers cada uno corre su despachador; los lotes se reclaman con
+          `FOR UPDATE SKIP LOCKED` y un lease, así que un email no se envía dos veces
+          salvo que un worker caiga a mitad de envío (entrega al-menos-una-vez).
+          Los emails con secretos se encolan como plantilla (`enqueue_template`):
+          la tabla guarda la plantilla y el usuario, y el despachador arma el
+          email (p. ej. emite el token de recuperación) justo antes de enviarlo.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import timedelta
+
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.utils.email import Mailer, OutgoingEmail, create_mailer
+from app.utils.metrics import Histogram
+
+outbox_logger = logging.getLogger("app.email_outbox")
+
+# Arma un email de plantilla al enviarlo: (sesión, destinatario, user_id) -> email.
+# Lo que agregue a la sesión se confirma antes del envío.
+EmailRenderer = Callable[[AsyncSession, str, uuid.UUID], Awaitable[OutgoingEmail]]
+
+# Cada cuánto se marcan los pendientes vencidos y se eliminan los fallidos viejos
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+def enqueue_email(db: AsyncSession, email: OutgoingEmail) -> None:
+    """Agrega el email a la outbox en la transacción de `db` (no hace commit)."""
+    db.add(EmailOutbox(recipient=email.recipient, subject=email.subject, body=email.body))
+
+
+def enqueue_template(
+    db: AsyncSession, template: str, recipient: str, subject: str, user_id: uuid.UUID
+) -> None:
+    """Encola un email de plantilla en la transacción de `db` (no hace commit).
+
+    Solo se guardan la plantilla, el destinatario y el usuario: el cuerpo lo arma
+    el renderer registrado para `template` al momento de enviar.
+    """
+    db.add(EmailOutbox(recipient=recipient, subject=subject, template=template, user_id=user_id))
+
+
+def retry_delay(attempts: int) -> float:
+    """Segundos de espera antes del siguiente intento (backoff exponencial con tope)."""
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS)
+
+
+class EmailDispatcher:
+    """Tarea de fondo que vacía la outbox usando el mailer configurado."""
+
+    def __init__(self, batch_size: int, poll_seconds: float) -> None:
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.mailer: Mailer | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.send_histogram = Histogram()
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.expired = 0
+        self.purged = 0
+        self._next_purge = 0.0
+        self._renderers: dict[str, EmailRenderer] = {}
+
+    def register_template(self, template: str, renderer: EmailRenderer) -> None:
+        """Registra cómo armar los emails encolados con `enqueue_template(template, ...)`."""
+        self._renderers[template] = renderer
+
+    def start(self, mailer: Mailer | None = None) -> None:
+        """Lanza el despachador en el event loop actual."""
+        if self._task is not None:
+            return
+        self.mailer = mailer or create_mailer()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-dispatcher")
+
+    async def stop(self) -> None:
+        """Detiene el despachador y cierra las conexiones SMTP."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.mailer is not None:
+            await self.mailer.close()
+
+    def wake(self) -> None:
+        """Avisa que hay emails nuevos (no hace nada si el despachador no corre)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + _PURGE_INTERVAL_SECONDS
+                try:
+                    await self.purge_once()
+                except (SQLAlchemyError, OSError):  # se reintenta en la siguiente vuelta
+                    outbox_logger.exception("⚠️ Error limpiando la outbox de emails")
+            # Los errores SMTP de cada email los registra `dispatch_once`; aquí solo
+            # llegan los de la BD, y la tarea de fondo no debe morir por uno puntual
+            try:
+                claimed = await self.dispatch_once()
+            except (SQLAlchemyError, OSError):
+                outbox_logger.exception("⚠️ Error en el despachador de emails")
+                claimed = 0
+            # Lote completo: probablemente quedan más, seguir sin esperar
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """Reclama un lote, lo envía en paralelo y registra el resultado.
+
+        Retorna cuántos emails reclamó.
+        """
+        pending = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= func.now())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        claim = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(pending.scalar_subquery()))
+            .values(
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+            )
+            .returning(
+                EmailOutbox.id,
+                EmailOutbox.recipient,
+                EmailOutbox.subject,
+                EmailOutbox.body,
+                EmailOutbox.template,
+                EmailOutbox.user_id,
+                EmailOutbox.attempts,
+            )
+        )
+        async with AsyncSessionLocal() as db:
+            claimed = (await db.execute(claim)).all()
+            await db.commit()
+        if not claimed:
+            return 0
+
+        emails = await self._render(claimed)
+        results = await asyncio.gather(
+            *(self._send(email) for email in emails), return_exceptions=True
+        )
+
+        sent_ids = [row.id for row, error in zip(claimed, results) if error is None]
+        failures = [(row, error) for row, error in zip(claimed, results) if error is not None]
+        async with AsyncSessionLocal() as db:
+            if sent_ids:
+                await db.execute(delete(EmailOutbox).where(EmailOutbox.id.in_(sent_ids)))
+            for row, error in failures:
+                exhausted = row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+                values = {
+                    "next_attempt_at": func.now() + timedelta(seconds=retry_delay(row.attempts)),
+                    "last_error": f"{type(error).__name__}: {error}"[:1000],
+                }
+                if exhausted:
+                    values["status"] = "failed"
+                # Si venció mientras se enviaba, `purge_once` ya lo marcó 'failed'
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == row.id, EmailOutbox.status == "pending")
+                    .values(**values)
+                )
+                if exhausted:
+                    self.failed += 1
+                else:
+                    self.retried += 1
+            await db.commit()
+        self.sent += len(sent_ids)
+        return len(claimed)
+
+    async def purge_once(self) -> tuple[int, int]:
+        """Vence los pendientes viejos y elimina los fallidos pasada la retención.
+
+        Un pendiente más viejo que `EMAIL_OUTBOX_MAX_AGE_SECONDS` queda 'failed'.
+        Retorna (vencidos, eliminados).
+        """
+        now = func.now()
+        expire = (
+            update(EmailOutbox)
+            .where(
+                EmailOutbox.status == "pending",
+                EmailOutbox.created_at
+                < now - timedelta(seconds=settings.EMAIL_OUTBOX_MAX_AGE_SECONDS),
+            )
+            .values(status="failed", last_error="Vencido sin enviar")
+        )
+        purge = delete(EmailOutbox).where(
+            EmailOutbox.status == "failed",
+            EmailOutbox.created_at
+            < now - timedelta(seconds=settings.EMAIL_OUTBOX_FAILED_RETENTION_SECONDS),
+        )
+        async with AsyncSessionLocal() as db:
+            expired = (await db.execute(expire)).rowcount
+            purged = (await db.execute(purge)).rowcount
+            await db.commit()
+        self.expired += expired
+        self.purged += purged
+        return expired, purged
+
+    async def _render(self, claimed: Sequence[Row]) -> list[OutgoingEmail | Exception]:
+        """Arma los emails del lote; el error de una plantilla solo afecta a su email.
+
+        Lo que los renderers agregan a la BD (p. ej. el hash del token) se confirma
+        antes de enviar, para que el enlace ya sea válido al llegar. Si el envío
+        falla, el reintento arma el email de nuevo.
+        """
+        emails: list[OutgoingEmail | Exception] = []
+        async with AsyncSessionLocal() as db:
+            for row in claimed:
+                if row.template is None:
+                    emails.append(OutgoingEmail(row.recipient, row.subject, row.body))
+                    continue
+                renderer = self._renderers.get(row.template)
+                if renderer is None:
+                    emails.append(LookupError(f"Plantilla no registrada: {row.template}"))
+                    continue
+                try:
+                    async with db.begin_nested():
+                        email = await renderer(db, row.recipient, row.user_id)
+                except SQLAlchemyError as exc:
+                    emails.append(exc)
+                else:
+                    emails.append(email)
+            await db.commit()
+        return emails
+
+    async def _send(self, email: OutgoingEmail | Exception) -> None:
+        if isinstance(email, Exception):
+            raise email
+        start = time.perf_counter()
+        try:
+            await self.mailer.send(email)
+        finally:
+            self.send_histogram.observe(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        """Contadores para monitoreo."""
+        return {
+            "running": self._task is not None,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "expired": self.expired,
+            "purged": self.purged,
+            "mailer": self.mailer.stats() if self.mailer is not None else {},
+            "send_seconds": self.send_histogram.snapshot(),
+        }
+
+
+email_dispatcher = EmailDispatcher(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+)
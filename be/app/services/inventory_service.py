@@ -0,0 +1,230 @@
+"""
+Módulo: services/inventory_service.py
+Descripción: Stock de bodega por variante (producto + talla + color) y sus movimientos.
+¿Para qué? Consultar el stock y registrar entradas, salidas y ajustes sin leer y
+           reescribir la cantidad desde Python (dos movimientos concurrentes sobre la
+           misma variante no pueden pisarse ni dejar el stock negativo).
+¿Impacto? Cada movimiento es un solo statement: el cambio de stock (UPDATE o upsert
+          con `amount = amount ± x ... RETURNING`) va en un CTE y el registro del
+          movimiento se inserta desde su resultado. Si el stock no alcanza, el CTE
+          no retorna filas y no se inserta nada.
+"""
+
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.inventory import Inventory
+from app.models.inventory_movement import InventoryMovement
+from app.schemas.inventory import (
+    InventoryMovementCreate,
+    InventoryMovementPage,
+    InventoryMovementResponse,
+    StockChangeResponse,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# numeric_value_out_of_range: el stock resultante no cabe en NUMERIC(10, 2).
+# asyncpg no lo reporta como DataError sino como DBAPIError genérico.
+_NUMERIC_OUT_OF_RANGE = "22003"
+
+# FKs que puede violar un movimiento: el producto (en `inventory` solo en una
+# entrada que crea la variante) o el usuario, borrado después de emitir su token
+_PRODUCT_FKEYS = ("inventory_product_id_fkey", "inventory_movement_product_id_fkey")
+_USER_FKEY = "inventory_movement_user_id_fkey"
+
+
+def _variant_filter(product_id: uuid.UUID, size: str, colour: str | None) -> tuple:
+    """Predicado de una variante activa; coincide con el índice idx_inventory_variant."""
+    # `colour IS NULL` y no `IS NOT DISTINCT FROM`: este último no usa índices
+    colour_filter = Inventory.colour.is_(None) if colour is None else Inventory.colour == colour
+    return (
+        Inventory.product_id == product_id,
+        Inventory.size == size,
+        colour_filter,
+        Inventory.deleted_at.is_(None),
+    )
+
+
+async def get_variant_stock(
+    db: AsyncSession, product_id: uuid.UUID, size: str, colour: str | None
+) -> Inventory | None:
+    """Stock de una variante (una búsqueda por el índice único de variante)."""
+    stmt = select(Inventory).where(*_variant_filter(product_id, size, colour))
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def list_product_stock(db: AsyncSession, product_id: uuid.UUID) -> list[Inventory]:
+    """Stock de todas las variantes activas de un producto."""
+    stmt = (
+        select(Inventory)
+        .where(Inventory.product_id == product_id, Inventory.deleted_at.is_(None))
+        .order_by(Inventory.size, Inventory.colour)
+    )
+    return list((await db.execute(stmt)).scalars())
+
+
+async def apply_movement(
+    db: AsyncSession, data: InventoryMovementCreate, user_id: uuid.UUID
+) -> StockChangeResponse:
+    """Aplica un movimiento al stock y lo registra, en un solo statement atómico.
+
+    - Suma (entrada o ajuste positivo): upsert; la primera entrada crea la variante.
+    - Resta (salida o ajuste negativo): UPDATE solo si el stock alcanza; la fila
+      queda bloqueada hasta el commit, así que las salidas concurrentes se
+      serializan y ninguna deja el stock negativo.
+    """
+    delta = data.delta
+    if delta > 0:
+        stock = (
+            pg_insert(Inventory)
+            .values(product_id=data.product_id, size=data.size, colour=data.colour, amount=delta)
+            .on_conflict_do_update(
+                index_elements=[Inventory.product_id, Inventory.size, Inventory.colour],
+                index_where=Inventory.deleted_at.is_(None),
+                set_={"amount": Inventory.amount + delta, "updated_at": func.now()},
+            )
+            .returning(Inventory.amount)
+            .cte("stock")
+        )
+    else:
+        stock = (
+            update(Inventory)
+            .where(
+                *_variant_filter(data.product_id, data.size, data.colour),
+                Inventory.amount >= -delta,
+            )
+            .values(amount=Inventory.amount + delta, updated_at=func.now())
+            .returning(Inventory.amount)
+            .cte("stock")
+        )
+
+    movement_table = InventoryMovement.__table__
+    stmt = (
+        insert(movement_table)
+        .from_select(
+            [
+                "id",
+                "product_id",
+                "user_id",
+                "type_of_movement",
+                "size",
+                "colour",
+                "amount",
+                "reason",
+                "movement_date",
+            ],
+            select(
+                literal(uuid.uuid4(), UUID(as_uuid=True)),
+                literal(data.product_id, UUID(as_uuid=True)),
+                literal(user_id, UUID(as_uuid=True)),
+                literal(data.type_of_movement, movement_table.c.type_of_movement.type),
+                literal(data.size, movement_table.c.size.type),
+                literal(data.colour, movement_table.c.colour.type),
+                literal(data.amount, movement_table.c.amount.type),
+                literal(data.reason, movement_table.c.reason.type),
+                func.now(),
+            ).select_from(stock),
+        )
+        .returning(
+            *(movement_table.c[name] for name in InventoryMovementResponse.model_fields),
+            select(stock.c.amount).scalar_subquery().label("stock"),
+        )
+    )
+    try:
+        row = (await db.execute(stmt)).one_or_none()
+    except DBAPIError as exc:
+        await db.rollback()
+        if getattr(exc.orig, "sqlstate", None) == _NUMERIC_OUT_OF_RANGE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="El stock resultante supera el máximo permitido (99999999.99)",
+            )
+        constraint = getattr(exc.orig.__cause__, "constraint_name", None)
+        if constraint in _PRODUCT_FKEYS:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado",
+            )
+        if constraint == _USER_FKEY:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="No se pudieron validar las credenciales",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        raise
+
+    if row is None:
+        await db.rollback()
+        current = await get_variant_stock(db, data.product_id, data.size, data.colour)
+        if current is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No hay stock registrado para esa variante",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Stock insuficiente: hay {current.amount} y se pidieron {-delta}",
+        )
+
+    await db.commit()
+    return StockChangeResponse(
+        movement=InventoryMovementResponse.model_validate(row, from_attributes=True),
+        stock=row.stock,
+    )
+
+
+async def movement_history(
+    db: AsyncSession,
+    product_id: uuid.UUID,
+    limit: int,
+    cursor: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> InventoryMovementPage:
+    """Movimientos de un producto, del más reciente al más antiguo.
+
+    Paginación keyset sobre `(movement_date, id)`, el mismo orden que el índice
+    idx_inventory_movement_product_date (recorrido hacia atrás).
+    """
+    filters = [InventoryMovement.product_id == product_id, InventoryMovement.deleted_at.is_(None)]
+    if date_from is not None:
+        filters.append(InventoryMovement.movement_date >= date_from)
+    if date_to is not None:
+        filters.append(InventoryMovement.movement_date < date_to)
+    if cursor is not None:
+        try:
+            before_date, before_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido",
+            )
+        filters.append(
+            tuple_(InventoryMovement.movement_date, InventoryMovement.id)
+            < tuple_(before_date, before_id)
+        )
+
+    stmt = (
+        select(InventoryMovement)
+        .where(*filters)
+        .order_by(InventoryMovement.movement_date.desc(), InventoryMovement.id.desc())
+        .limit(limit + 1)
+    )
+    movements = list((await db.execute(stmt)).scalars())
+
+    next_cursor = None
+    if len(movements) > limit:
+        movements = movements[:limit]
+        next_cursor = encode_cursor(movements[-1].movement_date, movements[-1].id)
+
+    return InventoryMovementPage(
+        items=[InventoryMovementResponse.model_validate(m) for m in movements],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,147 @@
+"""
+Módulo: services/login_limiter.py
+Descripción: Limitador de intentos de login por IP y de fallos por email.
+¿Para qué? Cortar ráfagas de credential stuffing antes de consultar el usuario y de
+           verificar con bcrypt, que es lo que más CPU consume en cada login.
+¿Impacto? Por defecto los conteos viven en memoria (por worker: con N workers el
+          límite efectivo es hasta N veces mayor). `LOGIN_RATE_LIMIT_BACKEND=postgres`
+          los comparte en la tabla `rate_limit_buckets`; si la BD falla se usa el
+          contador en memoria en lugar de rechazar logins legítimos.
+"""
+
+import hashlib
+import time
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import async_engine
+from app.utils.jobs import background_jobs
+from app.utils.rate_limit import PgSlidingWindowCounter, SlidingWindowCounter, WindowCount
+
+
+def _email_key(email: str) -> str:
+    """Clave de tamaño fijo para un email (no se guardan emails en claro)."""
+    digest = hashlib.blake2b(email.strip().lower().encode(), digest_size=16).hexdigest()
+    return f"login-email:{digest}"
+
+
+class LoginRateLimiter:
+    """Intentos por IP (todos cuentan) y fallos por email (solo credenciales inválidas).
+
+    Un límite en 0 desactiva esa dimensión.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        ip_attempts: int,
+        ip_window_seconds: float,
+        email_failures: int,
+        email_window_seconds: float,
+        max_keys: int,
+    ) -> None:
+        self.backend = backend
+        self.ip_attempts = ip_attempts
+        self.email_failures = email_failures
+        self.by_ip = SlidingWindowCounter(ip_window_seconds, max_keys)
+        self.by_email = SlidingWindowCounter(email_window_seconds, max_keys)
+        self.shared_ip: PgSlidingWindowCounter | None = None
+        self.shared_email: PgSlidingWindowCounter | None = None
+        if backend == "postgres":
+            self.shared_ip = PgSlidingWindowCounter(async_engine, ip_window_seconds)
+            self.shared_email = PgSlidingWindowCounter(async_engine, email_window_seconds)
+        self._prune_interval = max(ip_window_seconds, 60.0)
+        self._last_prune = time.monotonic()
+        self.counters = {
+            "allowed": 0,
+            "blocked_ip": 0,
+            "blocked_email": 0,
+            "failures": 0,
+            "backend_errors": 0,
+        }
+
+    async def _hit(
+        self,
+        local: SlidingWindowCounter,
+        shared: PgSlidingWindowCounter | None,
+        key: str,
+        amount: int,
+    ) -> WindowCount:
+        if shared is not None:
+            try:
+                return await shared.hit(key, amount)
+            except (SQLAlchemyError, OSError) as exc:
+                self.counters["backend_errors"] += 1
+                print(f"⚠️ Limitador de login sin BD, usando memoria: {exc}")
+        return local.hit(key, amount)
+
+    def _reject(self, retry_after: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de inicio de sesión. Intente nuevamente más tarde.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def check(self, client_ip: str, email: str) -> None:
+        """Registra el intento y lanza 429 si la IP o el email superan su límite."""
+        self._maybe_prune()
+        if self.ip_attempts > 0:
+            count = await self._hit(self.by_ip, self.shared_ip, f"login-ip:{client_ip}", 1)
+            if count.estimate > self.ip_attempts:
+                self.counters["blocked_ip"] += 1
+                raise self._reject(count.retry_after(self.ip_attempts))
+
+        if self.email_failures > 0:
+            count = await self._hit(self.by_email, self.shared_email, _email_key(email), 0)
+            if count.estimate >= self.email_failures:
+                self.counters["blocked_email"] += 1
+                raise self._reject(count.retry_after(self.email_failures))
+
+        self.counters["allowed"] += 1
+
+    async def record_failure(self, email: str) -> None:
+        """Cuenta un fallo de credenciales para el email."""
+        self.counters["failures"] += 1
+        if self.email_failures > 0:
+            await self._hit(self.by_email, self.shared_email, _email_key(email), 1)
+
+    async def record_success(self, email: str) -> None:
+        """Un login correcto borra los fallos acumulados del email."""
+        if self.email_failures <= 0:
+            return
+        key = _email_key(email)
+        self.by_email.reset(key)
+        if self.shared_email is not None:
+            try:
+                await self.shared_email.reset(key)
+            except (SQLAlchemyError, OSError):
+                self.counters["backend_errors"] += 1
+
+    def _maybe_prune(self) -> None:
+        """Con el backend compartido, encola de vez en cuando la limpieza de filas vencidas."""
+        if self.shared_ip is None or time.monotonic() - self._last_prune < self._prune_interval:
+            return
+        self._last_prune = time.monotonic()
+        background_jobs.submit("rate_limit_prune", self.shared_ip.prune)
+
+    def stats(self) -> dict:
+        """Métricas para monitoreo."""
+        return {
+            "backend": self.backend,
+            "ip_attempts": self.ip_attempts,
+            "email_failures": self.email_failures,
+            **self.counters,
+            "memory": {"ip": self.by_ip.stats(), "email": self.by_email.stats()},
+        }
+
+
+login_limiter = LoginRateLimiter(
+    backend=settings.LOGIN_RATE_LIMIT_BACKEND,
+    ip_attempts=settings.LOGIN_RATE_LIMIT_IP_ATTEMPTS,
+    ip_window_seconds=settings.LOGIN_RATE_LIMIT_IP_WINDOW_SECONDS,
+    email_failures=settings.LOGIN_RATE_LIMIT_EMAIL_FAILURES,
+    email_window_seconds=settings.LOGIN_RATE_LIMIT_EMAIL_WINDOW_SECONDS,
+    max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
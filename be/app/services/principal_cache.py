@@ -0,0 +1,32 @@
+"""
+Módulo: services/principal_cache.py
+Descripción: Caché de usuarios autenticados (principals) indexada por el `sub` del JWT.
+¿Para qué? Evitar las 3 consultas (users + role + type_document) que `get_current_user`
+           hace en cada request autenticado.
+¿Impacto? En un acierto de caché el request no toca la BD. Cualquier cambio al
+          usuario que afecte la autorización debe llamar a `invalidate_principal`.
+"""
+
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_principal(subject: str) -> User | None:
+    """Retorna el usuario cacheado (desligado de toda sesión) o `None`."""
+    return principal_cache.get(subject)
+
+
+def cache_principal(subject: str, user: User) -> None:
+    """Guarda el usuario autenticado; debe estar desligado de la sesión (expunge)."""
+    principal_cache.set(subject, user)
+
+
+def invalidate_principal(subject: str) -> None:
+    """Descarta el usuario cacheado tras un cambio de estado, rol o contraseña."""
+    principal_cache.invalidate(subject)
@@ -0,0 +1,76 @@
+"""
+Módulo: services/role_registry.py
+Descripción: Registro en memoria de la tabla `roles` (id ↔ nombre).
+¿Para qué? Los roles son un conjunto fijo sembrado al iniciar la BD; consultarlos en
+           cada registro o verificación de rol es un viaje a la BD innecesario.
+¿Impacto? Se carga una vez en `main.lifespan` y se recarga cuando llega un NOTIFY
+          `catalog_changed` con payload `roles` (trigger en 02_triggers_and_indexes.sql).
+          Los scripts sin event loop usan `load_sync`.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import AsyncSessionLocal
+from app.models.role import Role
+
+_ROLES_QUERY = select(Role.id, Role.name).where(Role.deleted_at.is_(None))
+
+
+class RoleRegistry:
+    """Búsquedas O(1) de roles por nombre y por id."""
+
+    def __init__(self) -> None:
+        self._ids_by_name: dict[str, uuid.UUID] = {}
+        self._names_by_id: dict[uuid.UUID, str] = {}
+        self._reload_task: asyncio.Task | None = None
+        self._reload_pending = False
+        self.loads = 0
+
+    def _replace(self, rows) -> int:
+        # Se construyen diccionarios nuevos y se reemplazan de una vez:
+        # los lectores nunca ven un registro a medio cargar.
+        self._ids_by_name = {row.name: row.id for row in rows}
+        self._names_by_id = {row.id: row.name for row in rows}
+        self.loads += 1
+        return len(self._ids_by_name)
+
+    async def load(self) -> int:
+        """Carga (o recarga) los roles desde la BD; retorna cuántos hay."""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(_ROLES_QUERY)).all()
+        return self._replace(rows)
+
+    def load_sync(self, db: Session) -> int:
+        """Variante síncrona de `load` para scripts (ej. create_admin.py)."""
+        return self._replace(db.execute(_ROLES_QUERY).all())
+
+    def schedule_reload(self, payload: str | None = None) -> None:
+        """Programa una recarga en segundo plano (handler de NOTIFY / reconexión)."""
+        self._reload_pending = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.get_running_loop().create_task(self._reload())
+
+    async def _reload(self) -> None:
+        # Un aviso que llega durante una recarga en curso fuerza otra vuelta
+        while self._reload_pending:
+            self._reload_pending = False
+            await self.load()
+
+    def id_for(self, name: str) -> uuid.UUID | None:
+        """Id del rol con ese nombre, o `None` si no existe."""
+        return self._ids_by_name.get(name)
+
+    def name_for(self, role_id: uuid.UUID) -> str | None:
+        """Nombre del rol con ese id, o `None` si no existe."""
+        return self._names_by_id.get(role_id)
+
+    def stats(self) -> dict[str, int]:
+        """Contadores para monitoreo."""
+        return {"roles": len(self._ids_by_name), "loads": self.loads}
+
+
+role_registry = RoleRegistry()
@@ -0,0 +1,250 @@
+"""
+Módulo: services/stock_snapshot.py
+Descripción: Snapshot del stock por variante calculado desde `inventory_movement`,
+             con refresco incremental en segundo plano.
+¿Para qué? Obtener el stock según el historial de movimientos (para conciliarlo
+           con `inventory.amount` o auditarlo) sin sumar la tabla completa, que
+           crece con cada entrada y salida.
+¿Impacto? Stock = fila de `inventory_stock_snapshot` + movimientos posteriores al
+          checkpoint, en un solo statement. El job suma los movimientos nuevos en
+          lotes acotados (una transacción corta por lote que avanza el snapshot y
+          el checkpoint juntos). Solo suma movimientos de transacciones ya
+          terminadas (`xid < xmin` del snapshot de PostgreSQL): uno que se
+          confirma tarde no queda detrás del checkpoint. Una transacción muy
+          larga frena el refresco (no la consulta: la cola simplemente crece).
+          El snapshot suma todos los movimientos, incluso los eliminados (soft
+          delete): un movimiento puede eliminarse después de sumado, así que la
+          consulta resta los eliminados hasta el checkpoint (índice parcial
+          idx_inventory_movement_deleted). Los demás campos de un movimiento no
+          cambian: las correcciones se registran como ajustes.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_engine
+from app.utils.metrics import Histogram
+
+snapshot_logger = logging.getLogger("app.stock_snapshot")
+
+# Clave arbitraria y fija del advisory lock de esta tarea
+_SNAPSHOT_LOCK_KEY = 0x4A52_5353  # "JRSS"
+
+_TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)")
+_UNLOCK = text("SELECT pg_advisory_unlock(:key)")
+
+_CHECKPOINT = text(
+    "SELECT movement_xid, movement_id FROM inventory_snapshot_checkpoint WHERE id = 1"
+)
+
+# El checkpoint se lee antes y se pasa como parámetro: con valores conocidos el
+# planner estima bien `(xid, id) > (...)` y recorre idx_inventory_movement_xid
+# (leído en una subconsulta lo estima en un tercio de la tabla y la recorre entera).
+
+# Un lote: suma los siguientes movimientos confirmados en el orden (xid, id) y
+# avanza el checkpoint al último de ellos. Si el checkpoint ya no es el leído no
+# suma nada. Sin movimientos nuevos no actualiza nada y no retorna filas.
+_REFRESH_BATCH = text(
+    """
+    WITH cp AS (
+        SELECT 1
+        FROM inventory_snapshot_checkpoint
+        WHERE id = 1 AND movement_xid = :movement_xid AND movement_id = :movement_id
+        FOR UPDATE
+    ),
+    batch AS (
+        SELECT m.xid, m.id, m.product_id, m.size, m.colour,
+               CASE WHEN m.type_of_movement = 'salida' THEN -m.amount ELSE m.amount END AS delta
+        FROM inventory_movement m
+        WHERE EXISTS (SELECT 1 FROM cp)
+          AND (m.xid, m.id) > (:movement_xid, :movement_id)
+          AND m.xid < pg_snapshot_xmin(pg_current_snapshot())
+        ORDER BY m.xid, m.id
+        LIMIT :batch_size
+    ),
+    folded AS (
+        INSERT INTO inventory_stock_snapshot (product_id, size, colour, amount)
+        SELECT product_id, size, colour, sum(delta)
+        FROM batch
+        GROUP BY product_id, size, colour
+        ON CONFLICT (product_id, size, colour) DO UPDATE
+        SET amount = inventory_stock_snapshot.amount + EXCLUDED.amount,
+            updated_at = now()
+    ),
+    last AS (
+        SELECT xid, id FROM batch ORDER BY xid DESC, id DESC LIMIT 1
+    )
+    UPDATE inventory_snapshot_checkpoint AS c
+    SET movement_xid = last.xid,
+        movement_id = last.id,
+        movements_folded = c.movements_folded + (SELECT count(*) FROM batch),
+        refreshed_at = now()
+    FROM last
+    WHERE c.id = 1
+    RETURNING (SELECT count(*) FROM batch) AS folded
+    """
+)
+
+# Stock según el historial: snapshot + movimientos vigentes posteriores al
+# checkpoint - movimientos ya sumados que se eliminaron después. `current` es
+# falso si el checkpoint cambió desde que se leyó (un refresco en medio):
+# snapshot y cola ya no encajan y hay que repetir la consulta. Con
+# `current` verdadero y sin variantes retorna una fila con product_id NULL.
+_LEDGER_STOCK_SQL = """
+    SELECT guard.current, ledger.product_id, ledger.size, ledger.colour, ledger.amount
+    FROM (
+        SELECT EXISTS (
+            SELECT 1 FROM inventory_snapshot_checkpoint
+            WHERE id = 1 AND movement_xid = :movement_xid AND movement_id = :movement_id
+        ) AS current
+    ) AS guard
+    LEFT JOIN (
+        SELECT product_id, size, colour, sum(amount) AS amount
+        FROM (
+            SELECT product_id, size, colour, amount
+            FROM inventory_stock_snapshot
+            {snapshot_filter}
+            UNION ALL
+            SELECT m.product_id, m.size, m.colour,
+                   CASE WHEN m.type_of_movement = 'salida' THEN -m.amount ELSE m.amount END
+            FROM inventory_movement m
+            WHERE (m.xid, m.id) > (:movement_xid, :movement_id)
+              AND m.deleted_at IS NULL
+              {movement_filter}
+            UNION ALL
+            SELECT m.product_id, m.size, m.colour,
+                   CASE WHEN m.type_of_movement = 'salida' THEN m.amount ELSE -m.amount END
+            FROM inventory_movement m
+            WHERE (m.xid, m.id) <= (:movement_xid, :movement_id)
+              AND m.deleted_at IS NOT NULL
+              {movement_filter}
+        ) AS movements
+        GROUP BY product_id, size, colour
+    ) AS ledger ON guard.current
+    ORDER BY ledger.product_id, ledger.size, ledger.colour
+"""
+
+_LEDGER_STOCK = text(_LEDGER_STOCK_SQL.format(snapshot_filter="", movement_filter=""))
+_LEDGER_PRODUCT_STOCK = text(
+    _LEDGER_STOCK_SQL.format(
+        snapshot_filter="WHERE product_id = :product_id",
+        movement_filter="AND m.product_id = :product_id",
+    )
+)
+
+
+async def ledger_stock(db: AsyncSession, product_id: uuid.UUID | None = None) -> list:
+    """Stock por variante según el historial (de un producto, o de toda la bodega).
+
+    Retorna filas con `product_id`, `size`, `colour` y `amount`.
+    """
+    stmt = _LEDGER_STOCK if product_id is None else _LEDGER_PRODUCT_STOCK
+    while True:
+        checkpoint = (await db.execute(_CHECKPOINT)).one()
+        params = {"movement_xid": checkpoint.movement_xid, "movement_id": checkpoint.movement_id}
+        if product_id is not None:
+            params["product_id"] = product_id
+        rows = list(await db.execute(stmt, params))
+        if rows[0].current:
+            return [row for row in rows if row.product_id is not None]
+
+
+class StockSnapshotter:
+    """Suma los movimientos nuevos al snapshot de stock cada `interval_seconds`."""
+
+    def __init__(self, interval_seconds: float, batch_size: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self.duration = Histogram()
+        self.runs = 0
+        self.skipped = 0
+        self.movements_folded = 0
+        self.last_run_movements = 0
+
+    def start(self) -> None:
+        """Lanza la tarea periódica en el event loop actual."""
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="stock-snapshot")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (SQLAlchemyError, OSError):  # se reintenta en la siguiente vuelta
+                snapshot_logger.exception("Error refrescando el snapshot de stock")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> int | None:
+        """Suma lotes hasta alcanzar los movimientos confirmados más recientes.
+
+        Retorna los movimientos sumados, o `None` si otro worker tiene el lock.
+        """
+        start = time.perf_counter()
+        folded = 0
+        async with async_engine.connect() as conn:
+            locked = (
+                await conn.execute(_TRY_LOCK, {"key": _SNAPSHOT_LOCK_KEY})
+            ).scalar_one()
+            await conn.commit()
+            if not locked:
+                self.skipped += 1
+                return None
+            try:
+                while True:
+                    checkpoint = (await conn.execute(_CHECKPOINT)).one()
+                    params = {
+                        "movement_xid": checkpoint.movement_xid,
+                        "movement_id": checkpoint.movement_id,
+                        "batch_size": self.batch_size,
+                    }
+                    batch = (await conn.execute(_REFRESH_BATCH, params)).scalar_one_or_none() or 0
+                    await conn.commit()
+                    folded += batch
+                    if batch < self.batch_size:
+                        break
+            finally:
+                # Un lote fallido deja la transacción abortada: sin el rollback el
+                # unlock también falla y el lock queda tomado en la conexión del pool
+                await conn.rollback()
+                await conn.execute(_UNLOCK, {"key": _SNAPSHOT_LOCK_KEY})
+                await conn.commit()
+
+        self.duration.observe(time.perf_counter() - start)
+        self.runs += 1
+        self.movements_folded += folded
+        self.last_run_movements = folded
+        return folded
+
+    def stats(self) -> dict:
+        """Métricas para monitoreo."""
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "movements_folded": self.movements_folded,
+            "last_run_movements": self.last_run_movements,
+            "run_seconds": self.duration.snapshot(),
+        }
+
+
+stock_snapshotter = StockSnapshotter(
+    interval_seconds=settings.STOCK_SNAPSHOT_INTERVAL_SECONDS,
+    batch_size=settings.STOCK_SNAPSHOT_BATCH_SIZE,
+)
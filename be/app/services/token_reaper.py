@@ -0,0 +1,144 @@
+"""
+Módulo: services/token_reaper.py
+Descripción: Tarea periódica que elimina tokens vencidos: los de recuperación vencidos
+             o usados y los refresh tokens expirados.
+¿Para qué? `password_reset_tokens` y `refresh_tokens` crecían sin límite (y sus
+           índices con ellas); un token usado o vencido ya no sirve para nada.
+           Un refresh token expirado tampoco hace falta para detectar su
+           reutilización: su JWT ya expiró y se rechaza antes de consultar la BD.
+¿Impacto? Borra en lotes acotados (`DELETE ... WHERE ctid IN (SELECT ... LIMIT n)`),
+          una transacción corta por lote, para no bloquear las tablas ni generar un
+          pico de WAL. Con varios workers, un advisory lock garantiza que solo uno
+          limpie a la vez.
+"""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import async_engine
+from app.utils.metrics import Histogram
+
+reaper_logger = logging.getLogger("app.token_reaper")
+
+# Clave arbitraria y fija del advisory lock de esta tarea
+_REAPER_LOCK_KEY = 0x4A52_5052  # "JRPR"
+
+_TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)")
+_UNLOCK = text("SELECT pg_advisory_unlock(:key)")
+
+_REAP_BATCHES = (
+    text(
+        """
+        DELETE FROM password_reset_tokens
+        WHERE ctid IN (
+            SELECT ctid FROM password_reset_tokens
+            WHERE used OR expires_at < now()
+            LIMIT :batch_size
+        )
+        """
+    ),
+    # Una familia desaparece cuando expira su último token (el más reciente)
+    text(
+        """
+        DELETE FROM refresh_tokens
+        WHERE ctid IN (
+            SELECT ctid FROM refresh_tokens
+            WHERE expires_at < now()
+            LIMIT :batch_size
+        )
+        """
+    ),
+)
+
+
+class TokenReaper:
+    """Limpia `password_reset_tokens` y `refresh_tokens` cada `interval_seconds`."""
+
+    def __init__(self, interval_seconds: float, batch_size: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self.duration = Histogram()
+        self.runs = 0
+        self.skipped = 0
+        self.rows_reaped = 0
+        self.last_run_rows = 0
+
+    def start(self) -> None:
+        """Lanza la tarea periódica en el event loop actual."""
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="reset-token-reaper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (SQLAlchemyError, OSError):  # se reintenta en la siguiente vuelta
+                reaper_logger.exception("Error limpiando tokens vencidos")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> int | None:
+        """Elimina lotes hasta que no queden tokens por limpiar.
+
+        Retorna las filas eliminadas, o `None` si otro worker tiene el lock.
+        """
+        start = time.perf_counter()
+        reaped = 0
+        async with async_engine.connect() as conn:
+            locked = (await conn.execute(_TRY_LOCK, {"key": _REAPER_LOCK_KEY})).scalar_one()
+            await conn.commit()
+            if not locked:
+                self.skipped += 1
+                return None
+            try:
+                for reap_batch in _REAP_BATCHES:
+                    while True:
+                        result = await conn.execute(reap_batch, {"batch_size": self.batch_size})
+                        await conn.commit()
+                        reaped += result.rowcount
+                        if result.rowcount < self.batch_size:
+                            break
+            finally:
+                # Si un lote falló, su transacción quedó abortada y el unlock
+                # fallaría también: el lock (de sesión) viajaría de vuelta al pool
+                # con la conexión y todos los workers se saltarían la limpieza.
+                await conn.rollback()
+                await conn.execute(_UNLOCK, {"key": _REAPER_LOCK_KEY})
+                await conn.commit()
+
+        self.duration.observe(time.perf_counter() - start)
+        self.runs += 1
+        self.rows_reaped += reaped
+        self.last_run_rows = reaped
+        return reaped
+
+    def stats(self) -> dict:
+        """Métricas para monitoreo."""
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "rows_reaped": self.rows_reaped,
+            "last_run_rows": self.last_run_rows,
+            "run_seconds": self.duration.snapshot(),
+        }
+
+
+reset_token_reaper = TokenReaper(
+    interval_seconds=settings.RESET_TOKEN_REAPER_INTERVAL_SECONDS,
+    batch_size=settings.RESET_TOKEN_REAPER_BATCH_SIZE,
+)
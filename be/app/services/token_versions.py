@@ -0,0 +1,38 @@
+"""
+Módulo: services/token_versions.py
+Descripción: Registro en memoria de la versión vigente de tokens (`users.token_version`).
+¿Para qué? Que `require_role` autorice solo con los claims del JWT y consulte la BD
+           únicamente cuando no conoce la versión o el token trae una versión vieja.
+¿Impacto? Incrementar `token_version` en la BD revoca todos los tokens del usuario;
+          este registro debe invalidarse en el mismo momento (`forget_token_version`).
+"""
+
+import uuid
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+_token_versions = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_known_version(user_id: uuid.UUID) -> int | None:
+    """Versión vigente conocida por este worker, o `None` si no la conoce."""
+    return _token_versions.get(user_id)
+
+
+def remember_token_version(user_id: uuid.UUID, version: int) -> None:
+    """Registra la versión leída de la BD."""
+    _token_versions.set(user_id, version)
+
+
+def forget_token_version(user_id: uuid.UUID) -> None:
+    """Olvida la versión conocida (tras revocar tokens o cambiar el rol/estado)."""
+    _token_versions.invalidate(user_id)
+
+
+def token_version_stats() -> dict[str, int]:
+    """Contadores para monitoreo."""
+    return _token_versions.stats()
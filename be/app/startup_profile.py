@@ -0,0 +1,122 @@
+"""
+Módulo: startup_profile.py
+Descripción: Reporte del tiempo de import de la app, por módulo y por paquete.
+¿Para qué? Ver qué cuesta el arranque en frío (cada recarga de `--reload` y cada
+           worker nuevo importa `app.main`) y frenar regresiones: falla si el import
+           supera un presupuesto o si carga un módulo que debe importarse en el
+           primer uso (crypto, SMTP).
+¿Impacto? Cada corrida es un proceso nuevo con `python -X importtime`; necesita las
+          mismas variables de entorno que la app (Settings se valida al importar),
+          pero no se conecta a la BD.
+
+Uso: python -m app.startup_profile [--runs 5] [--top 20] [--budget-ms 1500]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+# Módulos que la app importa en el primer uso; si aparecen al importar app.main,
+# alguien volvió a importarlos a nivel de módulo.
+LAZY_MODULES = ("jose", "passlib", "bcrypt", "aiosmtplib")
+
+
+@dataclass(slots=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTime]:
+    """Parsea la salida de `-X importtime` (una línea por módulo importado)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        rows.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile_import(module: str) -> list[ImportTime]:
+    """Importa `module` en un proceso nuevo y retorna los tiempos de cada import."""
+    # Sin check=True: el error se reporta con el stderr del proceso, no con un traceback
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"❌ No se pudo importar {module}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def _ms(us: float) -> str:
+    return f"{us / 1000:>8.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tiempo de import de la app por módulo")
+    parser.add_argument("--module", default="app.main", help="módulo a importar")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="procesos a medir (se usa la mediana)"
+    )
+    parser.add_argument("--top", type=int, default=20, help="filas por tabla")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="falla si la mediana lo supera"
+    )
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.runs)]
+    totals = [next(r.cumulative_us for r in rows if r.module == args.module) for rows in runs]
+    median_total = statistics.median(totals)
+    # Tablas de la corrida con el total más cercano a la mediana
+    rows = min(zip(totals, runs), key=lambda pair: abs(pair[0] - median_total))[1]
+
+    by_package: dict[str, int] = defaultdict(int)
+    for row in rows:
+        by_package[row.module.split(".")[0]] += row.self_us
+
+    print(
+        f"📦 import {args.module}: mediana {_ms(median_total)} "
+        f"({args.runs} procesos, {len(rows)} módulos)"
+    )
+    print("\n⏱️ Paquetes (tiempo propio sumado)")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"   {_ms(self_us)}  {package}")
+    print("\n🧩 Módulos de la app (acumulado)")
+    app_rows = [r for r in rows if r.module.split(".")[0] == args.module.split(".")[0]]
+    for row in sorted(app_rows, key=lambda r: -r.cumulative_us)[: args.top]:
+        print(f"   {_ms(row.cumulative_us)}  {row.module}")
+    print("\n🐢 Módulos más lentos (tiempo propio)")
+    for row in sorted(rows, key=lambda r: -r.self_us)[: args.top]:
+        print(f"   {_ms(row.self_us)}  {row.module}")
+
+    failures = []
+    loaded = {r.module.split(".")[0] for r in rows}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        failures.append(
+            f"se importan al arrancar y deberían cargarse en el primer uso: {', '.join(eager)}"
+        )
+    if args.budget_ms is not None and median_total / 1000 > args.budget_ms:
+        failures.append(
+            f"el import tarda {median_total / 1000:.1f} ms "
+            f"(presupuesto: {args.budget_ms:.0f} ms)"
+        )
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Import dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Módulo: utils/audit.py
+Descripción: Registro de auditoría de acciones administrativas.
+¿Para qué? Dejar constancia de quién hizo qué y sobre cuántos registros, en una
+           sola línea estructurada (JSON) por acción.
+¿Impacto? Una acción masiva emite un único registro con todos los ids afectados,
+          no uno por usuario. Se escriben en stdout (junto a los logs del
+          servidor) salvo que el despliegue configure sus propios handlers.
+"""
+
+import json
+import logging
+import sys
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+audit_logger = logging.getLogger("app.audit")
+
+
+def configure_audit_logging() -> None:
+    """Envía los registros de auditoría a stdout (se llama al arrancar).
+
+    Sin configuración de logging el logger raíz solo muestra WARNING y los
+    registros INFO de auditoría se perdían. Si ya hay handlers en `app.audit`
+    no se toca nada.
+    """
+    if audit_logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    audit_logger.addHandler(handler)
+    audit_logger.setLevel(logging.INFO)
+    # Con handler propio no se duplica en el logger raíz si alguien lo configura
+    audit_logger.propagate = False
+
+
+def audit(action: str, actor_id: uuid.UUID, **details: Any) -> None:
+    """Emite un registro de auditoría estructurado."""
+    record = {
+        "action": action,
+        "actor_id": str(actor_id),
+        "at": datetime.now(UTC).isoformat(),
+        **details,
+    }
+    audit_logger.info(json.dumps(record, default=str))
@@ -0,0 +1,55 @@
+"""
+Módulo: utils/client_ip.py
+Descripción: IP real del cliente detrás de proxies de confianza (nginx, balanceador).
+¿Para qué? Detrás de un proxy, `request.client.host` es la IP del proxy: todos los
+           clientes compartirían el mismo contador del límite de login por IP.
+¿Impacto? `X-Forwarded-For` solo se lee si la conexión viene de una red listada en
+          `TRUSTED_PROXIES`; si no, un cliente podría falsificar su IP con el header.
+          Sin proxies configurados se usa siempre la IP de la conexión.
+"""
+
+import ipaddress
+
+from starlette.requests import Request
+
+from app.config import settings
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def parse_networks(value: str) -> tuple[IPNetwork, ...]:
+    """Convierte "10.0.0.0/8, 172.18.0.2" en redes (una IP sola es una red /32 o /128)."""
+    items = (item.strip() for item in value.split(","))
+    return tuple(ipaddress.ip_network(item, strict=False) for item in items if item)
+
+
+_trusted_proxies = parse_networks(settings.TRUSTED_PROXIES)
+
+
+def in_networks(host: str, networks: tuple[IPNetwork, ...]) -> bool:
+    """Si `host` es una IP dentro de alguna de las redes (un nombre nunca lo está)."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_ip(request: Request, trusted: tuple[IPNetwork, ...] | None = None) -> str:
+    """IP del cliente: la de la conexión, o la de `X-Forwarded-For` si la conexión
+    viene de un proxy de confianza.
+
+    `X-Forwarded-For` se recorre de derecha a izquierda (cada proxy agrega la IP
+    de quien le habló) saltando los proxies de confianza: la primera IP que no
+    lo es la escribió un proxy nuestro, así que el cliente no pudo falsificarla.
+    """
+    trusted = _trusted_proxies if trusted is None else trusted
+    peer = request.client.host if request.client else "unknown"
+    if not in_networks(peer, trusted):
+        return peer
+    headers = request.headers.getlist("x-forwarded-for")
+    hops = [hop.strip() for header in headers for hop in header.split(",")]
+    for hop in reversed(hops):
+        if hop and not in_networks(hop, trusted):
+            return hop
+    return peer
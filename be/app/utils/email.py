@@ -1,32 +1,210 @@
 """
 Módulo: utils/email.py
-Descripción: Utilidades para envío de emails (recuperación de contraseña).
-¿Para qué? Enviar enlaces de recuperación de contraseña al email del usuario.
-¿Impacto? Sin configuración SMTP válida, se imprime el enlace en la consola (desarrollo).
+Descripción: Composición y envío de emails (recuperación de contraseña).
+¿Para qué? Construir los mensajes y entregarlos por SMTP reutilizando conexiones,
+           o imprimirlos en la consola en desarrollo (`MAIL_BACKEND=console`).
+¿Impacto? Los endpoints no envían directamente: encolan en `email_outbox` y el
+          despachador (services/email_outbox.py) usa el mailer de este módulo.
+          aiosmtplib solo se importa si se crea el pool SMTP (`MAIL_BACKEND=smtp`).
 """
 
+import asyncio
+import re
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import TYPE_CHECKING
+
 from app.config import settings
 
+if TYPE_CHECKING:
+    import aiosmtplib
 
-async def send_password_reset_email(email: str, token: str) -> None:
-    """Envía un email de recuperación de contraseña.
 
-    En desarrollo, imprime el enlace en la consola del servidor.
-    En producción, se enviaría por SMTP real.
-    """
+@dataclass(frozen=True)
+class OutgoingEmail:
+    """Email listo para enviar (texto plano)."""
+
+    recipient: str
+    subject: str
+    body: str
+
+
+# Plantilla de la outbox: el token se emite al enviar (ver auth_service)
+PASSWORD_RESET_TEMPLATE = "password_reset"
+PASSWORD_RESET_SUBJECT = "CALZADO J&R — Recuperación de contraseña"
+
+# Tokens en enlaces (`?token=...`): no se imprimen en los logs
+_TOKEN_PATTERN = re.compile(r"(token=)[^\s&]+")
+
+
+def password_reset_email(email: str, token: str) -> OutgoingEmail:
+    """Email con el enlace de recuperación de contraseña."""
     reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
+    return OutgoingEmail(
+        recipient=email,
+        subject=PASSWORD_RESET_SUBJECT,
+        body=(
+            "Recibimos una solicitud para restablecer tu contraseña.\n\n"
+            f"Haz clic en el siguiente enlace (válido por 1 hora): {reset_url}\n\n"
+            "Si no fuiste tú, ignora este mensaje."
+        ),
+    )
+
+
+def build_message(email: OutgoingEmail) -> EmailMessage:
+    """Arma el mensaje MIME con el remitente configurado."""
+    message = EmailMessage()
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = email.recipient
+    message["Subject"] = email.subject
+    message.set_content(email.body)
+    return message
+
+
+# ────────────────────────────
+# 🖨️ Backend de consola (desarrollo)
+# ────────────────────────────
+
+
+class ConsoleMailer:
+    """Imprime los emails en la consola del servidor en lugar de enviarlos.
+
+    Los tokens de los enlaces se ocultan: la salida termina en logs. Para ver
+    el email completo en desarrollo, usar `scripts/smtp_stub.py --print`.
+    """
+
+    async def send(self, email: OutgoingEmail) -> None:
+        body = _TOKEN_PATTERN.sub(r"\1[oculto]", email.body)
+        print("=" * 60)
+        print(f"📧 {email.subject}")
+        print(f"   Para: {email.recipient}")
+        print(f"   {body}")
+        print("=" * 60)
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+
+# ────────────────────────────
+# 📨 Backend SMTP con pool de conexiones
+# ────────────────────────────
+
+
+class SMTPConnectionPool:
+    """Pool de conexiones SMTP autenticadas que se reutilizan entre envíos.
+
+    Evita el handshake (TCP + STARTTLS + AUTH) por cada email. Una conexión que
+    falla se descarta; si una conexión inactiva fue cerrada por el servidor, el
+    envío se reintenta una vez con una conexión nueva.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        start_tls: bool = True,
+        timeout: float = 10.0,
+        size: int = 4,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[aiosmtplib.SMTP] = []
+        self.connects = 0
+        self.sent = 0
+
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        import aiosmtplib
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.username:
+            await smtp.login(self.username, self.password)
+        self.connects += 1
+        return smtp
+
+    async def send(self, email: OutgoingEmail) -> None:
+        """Envía un email usando una conexión del pool (máximo `size` en paralelo)."""
+        import aiosmtplib
+
+        message = build_message(email)
+        async with self._slots:
+            reused = bool(self._idle)
+            smtp = self._idle.pop() if reused else await self._connect()
+            try:
+                try:
+                    await smtp.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    if not reused:
+                        raise
+                    # El servidor cerró la conexión inactiva: reintentar con una nueva
+                    smtp.close()
+                    smtp = await self._connect()
+                    await smtp.send_message(message)
+            except aiosmtplib.SMTPResponseException:
+                # El servidor rechazó el mensaje pero la conexión sigue sana
+                try:
+                    await smtp.rset()
+                    self._idle.append(smtp)
+                except (aiosmtplib.SMTPException, OSError):
+                    smtp.close()
+                raise
+            except BaseException:
+                smtp.close()
+                raise
+            self.sent += 1
+            self._idle.append(smtp)
+
+    async def close(self) -> None:
+        """Cierra las conexiones inactivas (QUIT)."""
+        import aiosmtplib
+
+        idle, self._idle = self._idle, []
+        for smtp in idle:
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+
+    def stats(self) -> dict[str, int]:
+        """Contadores para monitoreo."""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "sent": self.sent,
+        }
+
+
+Mailer = ConsoleMailer | SMTPConnectionPool
+
 
-    # En desarrollo, imprimir en consola en lugar de enviar email real
-    print("=" * 60)
-    print(f"📧 EMAIL DE RECUPERACIÓN DE CONTRASEÑA")
-    print(f"   Para: {email}")
-    print(f"   Enlace: {reset_url}")
-    print("=" * 60)
-
-    # TODO: Implementar envío real con aiosmtplib en producción
-    # from aiosmtplib import send
-    # message = MIMEText(f"Haz clic en el siguiente enlace: {reset_url}")
-    # message["From"] = settings.MAIL_FROM
-    # message["To"] = email
-    # message["Subject"] = "CALZADO J&R — Recuperación de contraseña"
-    # await send(message, hostname=settings.MAIL_SERVER, port=settings.MAIL_PORT)
+def create_mailer() -> Mailer:
+    """Crea el mailer según `MAIL_BACKEND`."""
+    if settings.MAIL_BACKEND == "smtp":
+        return SMTPConnectionPool(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            username=settings.MAIL_USERNAME,
+            password=settings.MAIL_PASSWORD,
+            start_tls=settings.MAIL_START_TLS,
+            timeout=settings.MAIL_TIMEOUT_SECONDS,
+            size=settings.MAIL_SMTP_POOL_SIZE,
+        )
+    return ConsoleMailer()
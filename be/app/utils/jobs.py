@@ -0,0 +1,104 @@
+"""
+Módulo: utils/jobs.py
+Descripción: Ejecutor de trabajos en segundo plano con concurrencia y cola acotadas.
+¿Para qué? Responder de inmediato en endpoints cuyo trabajo no debe influir en la
+           respuesta (ej. forgot-password: que el tiempo de respuesta no revele si
+           el email existe) y procesar ese trabajo fuera del request.
+¿Impacto? Los trabajos viven en memoria: si el proceso cae antes de ejecutarlos se
+          pierden. Con la cola llena el trabajo se descarta y se cuenta en `rejected`.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.config import settings
+from app.utils.metrics import Histogram
+
+jobs_logger = logging.getLogger("app.jobs")
+
+Job = tuple[str, Callable[..., Awaitable[Any]], tuple[Any, ...]]
+
+
+class JobRunner:
+    """Cola asyncio atendida por `workers` tareas en el event loop del proceso."""
+
+    def __init__(self, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.duration = Histogram()
+        self.counters: dict[str, dict[str, int]] = {}
+
+    def _count(self, name: str, outcome: str) -> None:
+        by_outcome = self.counters.setdefault(
+            name, {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        )
+        by_outcome[outcome] += 1
+
+    def start(self) -> None:
+        """Lanza las tareas trabajadoras en el event loop actual."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_limit)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Espera (hasta `timeout`) a que se vacíe la cola y detiene las tareas."""
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except TimeoutError:
+                print(f"⚠️ {self._queue.qsize()} trabajo(s) en segundo plano sin ejecutar al cerrar")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, name: str, func: Callable[..., Awaitable[Any]], *args: Any) -> bool:
+        """Encola `func(*args)` sin esperar; retorna False si la cola está llena o no corre."""
+        if self._queue is None or not self._tasks:
+            self._count(name, "rejected")
+            return False
+        try:
+            self._queue.put_nowait((name, func, args))
+        except asyncio.QueueFull:
+            self._count(name, "rejected")
+            return False
+        self._count(name, "submitted")
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            name, func, args = await self._queue.get()
+            start = time.perf_counter()
+            try:
+                await func(*args)
+                self._count(name, "completed")
+            except Exception:  # un trabajo fallido no debe detener al trabajador
+                self._count(name, "failed")
+                jobs_logger.exception("Trabajo en segundo plano '%s' falló", name)
+            finally:
+                self.duration.observe(time.perf_counter() - start)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        """Métricas para monitoreo."""
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_limit": self.queue_limit,
+            "jobs": self.counters,
+            "duration_seconds": self.duration.snapshot(),
+        }
+
+
+background_jobs = JobRunner(
+    workers=settings.BACKGROUND_JOB_WORKERS,
+    queue_limit=settings.BACKGROUND_JOB_QUEUE_LIMIT,
+)
@@ -0,0 +1,73 @@
+"""
+Módulo: utils/metrics.py
+Descripción: Primitivas de métricas en memoria (histogramas de latencia).
+¿Para qué? Medir tiempos (espera del pool, latencia por endpoint) sin depender de
+           librerías externas y exponerlos en endpoints de salud y en /metrics.
+¿Impacto? Permite dimensionar pools y workers con datos reales en lugar de suposiciones.
+"""
+
+import threading
+
+# Límites superiores (en segundos) por defecto: de 1 ms a 10 s
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos, seguro entre hilos."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Registra una observación (en segundos)."""
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        """Retorna buckets acumulados (`le`), total de observaciones y suma."""
+        with self._lock:
+            cumulative = 0
+            buckets: dict[str, int] = {}
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self._count
+            return {"buckets": buckets, "count": self._count, "sum": round(self._sum, 6)}
+
+
+# ────────────────────────────
+# 📈 Formato de exposición de Prometheus
+# ────────────────────────────
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """`{k="v",...}` con los valores escapados (vacío si no hay etiquetas)."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_histogram(name: str, labels: dict[str, str], snapshot: dict) -> list[str]:
+    """Líneas `_bucket`/`_sum`/`_count` de un `Histogram.snapshot()`."""
+    lines = [
+        f"{name}_bucket{format_labels({**labels, 'le': le})} {count}"
+        for le, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+    return lines
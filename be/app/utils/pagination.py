@@ -0,0 +1,45 @@
+"""
+Módulo: utils/pagination.py
+Descripción: Utilidades de paginación por cursor (keyset) y estimación de totales.
+¿Para qué? Recorrer listados grandes sin OFFSET: cada página continúa desde la
+           última fila vista `(created_at, id)`, con costo constante por página.
+¿Impacto? El cursor es opaco para el cliente (base64); un cursor alterado se
+          rechaza con 400. El total es una estimación del planificador, no un COUNT.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Codifica la posición de la última fila de una página."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decodifica un cursor; lanza `ValueError` si está mal formado."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), uuid.UUID(data["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Cursor inválido") from exc
+
+
+async def estimate_rows(db: AsyncSession, stmt: Select) -> int:
+    """Filas que el planificador de PostgreSQL estima para `stmt` (EXPLAIN, sin ejecutarla).
+
+    Los parámetros se renderizan como literales: usar solo con valores tipados
+    (UUID, fechas, booleanos), nunca con texto libre del cliente.
+    """
+    sql = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
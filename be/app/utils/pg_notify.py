@@ -0,0 +1,113 @@
+"""
+Módulo: utils/pg_notify.py
+Descripción: Escucha de notificaciones de PostgreSQL (LISTEN/NOTIFY) con asyncpg.
+¿Para qué? Que todos los workers de Uvicorn se enteren cuando otro proceso cambia
+           datos cacheados en memoria (catálogos), sin consultar la BD periódicamente.
+¿Impacto? Usa una conexión dedicada fuera del pool. Si se pierde, se reconecta con
+          backoff y avisa a `on_reconnect`: las notificaciones perdidas mientras
+          estuvo caída no se reciben, así que las cachés deben invalidarse completas.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+
+listener_logger = logging.getLogger("app.pg_notify")
+
+NotificationHandler = Callable[[str], None]
+
+
+class PgListener:
+    """Conexión LISTEN compartida por el proceso que despacha cada canal a sus handlers."""
+
+    def __init__(self, database_url: str, max_backoff_seconds: float = 30.0) -> None:
+        url = make_url(database_url).set(drivername="postgresql")
+        self._dsn = url.render_as_string(hide_password=False)
+        self._max_backoff = max_backoff_seconds
+        self._handlers: dict[str, list[NotificationHandler]] = {}
+        self._reconnect_handlers: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        self.connected = False
+        self.reconnects = 0
+        self.notifications = 0
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        """Registra `handler(payload)` para un canal; llamar antes de `start()`."""
+        handlers = self._handlers.setdefault(channel, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def on_reconnect(self, handler: Callable[[], None]) -> None:
+        """Registra un callback para cada (re)conexión, incluida la primera."""
+        if handler not in self._reconnect_handlers:
+            self._reconnect_handlers.append(handler)
+
+    def start(self) -> None:
+        """Lanza la tarea de escucha en el event loop actual."""
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    async def stop(self) -> None:
+        """Detiene la escucha y cierra la conexión."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.notifications += 1
+        for handler in self._handlers.get(channel, ()):
+            handler(payload)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _conn, ev=closed: ev.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+                self.connected = True
+                backoff = 1.0
+                for handler in self._reconnect_handlers:
+                    handler()
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncpg.PostgresError) as exc:
+                print(f"⚠️ LISTEN/NOTIFY sin conexión ({exc}); reintentando en {backoff:.0f}s")
+            except Exception:  # un handler o asyncpg no deben matar la escucha
+                listener_logger.exception("Error en LISTEN/NOTIFY; reintentando en %.0fs", backoff)
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close()
+                    except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                        # conexión rota: se descarta sin el cierre ordenado
+                        connection.terminate()
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self._max_backoff)
+
+    def stats(self) -> dict[str, int | bool]:
+        """Contadores para monitoreo."""
+        return {
+            "connected": self.connected,
+            "channels": len(self._handlers),
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
+
+
+pg_listener = PgListener(settings.DATABASE_URL)
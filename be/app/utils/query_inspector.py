@@ -0,0 +1,198 @@
+"""
+Módulo: utils/query_inspector.py
+Descripción: Detector de N+1 y de consultas lentas (modo desarrollo/pruebas).
+¿Para qué? Detectar a tiempo los endpoints que repiten la misma consulta por cada fila
+           (ej. una relación lazy recorrida en un bucle) o que tienen consultas lentas,
+           y fijar en las pruebas un presupuesto de consultas por endpoint.
+¿Impacto? Con `QUERY_INSPECTOR_ENABLED=false` (producción) solo queda activo
+          `query_budget()`, que no cuesta nada si no hay un registro abierto. Con
+          `true` se registran las consultas de cada request, se avisan las formas
+          repetidas y las consultas lentas se registran con su plan (EXPLAIN).
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+
+query_logger = logging.getLogger("app.queries")
+
+# Sentencias a las que se les puede pedir el plan sin ejecutarlas
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\([^()]*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normaliza una sentencia: sin literales ni espacios repetidos, `IN (...)` colapsado.
+
+    Dos consultas con la misma forma solo difieren en sus parámetros: muchas en
+    una misma request son la huella típica de un N+1.
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class RecordedQuery:
+    statement: str
+    seconds: float
+
+
+@dataclass
+class QueryRecorder:
+    """Consultas ejecutadas mientras el registro está abierto."""
+
+    queries: list[RecordedQuery] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(q.seconds for q in self.queries)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Formas de sentencia ejecutadas `threshold` veces o más, de mayor a menor."""
+        counts = Counter(statement_shape(q.statement) for q in self.queries)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        """Listado legible de las consultas (para mensajes de error y logs)."""
+        return "\n".join(
+            f"  {i:>3}. [{q.seconds * 1000:.1f} ms] {_WHITESPACE.sub(' ', q.statement)[:300]}"
+            for i, q in enumerate(self.queries, 1)
+        )
+
+
+# Registros abiertos en el contexto actual; se anidan (prueba → middleware → bloque)
+_recorders: ContextVar[tuple[QueryRecorder, ...]] = ContextVar("query_recorders", default=())
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Registra las consultas del contexto actual (incluye las de endpoints async).
+
+    Los registros se anidan: cada consulta cuenta en todos los que estén abiertos.
+    """
+    recorder = QueryRecorder()
+    token = _recorders.set((*_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un bloque ejecutó más consultas de las permitidas (o repitió una forma)."""
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None) -> Iterator[QueryRecorder]:
+    """Falla si el bloque ejecuta más de `max_queries` consultas.
+
+    Con `max_repeats`, también falla si una misma forma de sentencia se repite
+    más veces que eso (N+1), aunque el total quede dentro del presupuesto.
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if len(recorder) > max_queries:
+        raise QueryBudgetExceeded(
+            f"Se ejecutaron {len(recorder)} consultas (presupuesto: {max_queries}):\n"
+            f"{recorder.report()}"
+        )
+    if max_repeats is not None:
+        repeated = recorder.repeated(max_repeats + 1)
+        if repeated:
+            shape, count = repeated[0]
+            raise QueryBudgetExceeded(
+                f"Posible N+1: la misma consulta se ejecutó {count} veces "
+                f"(máximo {max_repeats}): {shape[:300]}"
+            )
+
+
+# ────────────────────────────
+# 🐢 Consultas lentas
+# ────────────────────────────
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """Plan de la sentencia por una conexión DBAPI cruda (no dispara los hooks del engine)."""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def observe_query(conn, statement: str, parameters, executemany: bool, seconds: float) -> None:
+    """Lo llaman los hooks del engine (utils/request_timing.py) tras cada sentencia."""
+    recorders = _recorders.get()
+    if recorders:
+        query = RecordedQuery(statement, seconds)
+        for recorder in recorders:
+            recorder.queries.append(query)
+
+    if not settings.QUERY_INSPECTOR_ENABLED or seconds * 1000 < settings.QUERY_INSPECTOR_SLOW_MS:
+        return
+    plan = "(sin plan)"
+    if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except conn.dialect.dbapi.Error as exc:  # el plan es informativo: no rompe la consulta
+            plan = f"(no se pudo obtener el plan: {exc})"
+    query_logger.warning(
+        "🐢 Consulta lenta (%.1f ms): %s\n%s",
+        seconds * 1000,
+        _WHITESPACE.sub(" ", statement),
+        plan,
+    )
+
+
+# ────────────────────────────
+# 🔍 Middleware (solo desarrollo)
+# ────────────────────────────
+
+
+class QueryInspectorMiddleware:
+    """Registra las consultas de cada request y avisa las formas repetidas (N+1)."""
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            await self.app(scope, receive, send)
+        route = getattr(scope.get("route"), "path", scope["path"])
+        for shape, count in recorder.repeated(self.repeat_threshold):
+            query_logger.warning(
+                "🔁 Posible N+1 en %s %s: %d consultas con la misma forma "
+                "(%d en total, %.1f ms en BD, %.1f ms la request): %s",
+                scope["method"],
+                route,
+                count,
+                len(recorder),
+                recorder.total_seconds * 1000,
+                (time.perf_counter() - start) * 1000,
+                shape[:300],
+            )
@@ -0,0 +1,164 @@
+"""
+Módulo: utils/rate_limit.py
+Descripción: Contadores de ventana deslizante (en memoria o compartidos en PostgreSQL).
+¿Para qué? Limitar cuántas veces ocurre algo por clave (IP, email) en los últimos
+           `window_seconds`, sin guardar un timestamp por evento.
+¿Impacto? Cada clave ocupa dos enteros: el conteo de la ventana fija actual y el de
+          la anterior. El conteo deslizante se aproxima ponderando la anterior por
+          la fracción que aún cae dentro de la ventana (error acotado, O(1) por hit).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class WindowCount:
+    """Conteos de una clave en la ventana fija actual y la anterior."""
+
+    previous: int
+    current: int
+    elapsed: float  # segundos transcurridos de la ventana actual
+    window: float
+
+    @property
+    def estimate(self) -> float:
+        """Eventos estimados en los últimos `window` segundos."""
+        return self.previous * (1 - self.elapsed / self.window) + self.current
+
+    def retry_after(self, limit: int) -> int:
+        """Segundos hasta que la estimación baje de `limit` (0 si ya está por debajo)."""
+        if self.estimate < limit:
+            return 0
+        if self.current >= limit:
+            # Hay que esperar a la próxima ventana y a que la actual pierda peso
+            wait = self.window - self.elapsed + self.window * (1 - limit / self.current)
+        else:
+            # previous * (1 - t / window) + current < limit
+            wait = self.window * (1 - (limit - self.current) / self.previous) - self.elapsed
+        return max(1, math.ceil(wait))
+
+
+def _window_position(window: float, now: float) -> tuple[int, float]:
+    """(número de ventana fija, segundos transcurridos dentro de ella)."""
+    window_id = int(now // window)
+    return window_id, now - window_id * window
+
+
+class SlidingWindowCounter:
+    """Contador por clave en memoria, acotado a `maxsize` claves (LRU)."""
+
+    def __init__(self, window_seconds: float, maxsize: int) -> None:
+        self.window = window_seconds
+        self.maxsize = maxsize
+        # clave -> [ventana, conteo anterior, conteo actual]
+        self._data: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def hit(self, key: str, amount: int = 1) -> WindowCount:
+        """Suma `amount` eventos a la clave (0 = solo consultar) y retorna sus conteos."""
+        window_id, elapsed = _window_position(self.window, time.time())
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                if amount == 0:
+                    return WindowCount(0, 0, elapsed, self.window)
+                entry = self._data[key] = [window_id, 0, 0]
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+            elif entry[0] != window_id:
+                previous = entry[2] if entry[0] == window_id - 1 else 0
+                entry[:] = [window_id, previous, 0]
+            entry[2] += amount
+            self._data.move_to_end(key)
+            return WindowCount(entry[1], entry[2], elapsed, self.window)
+
+    def reset(self, key: str) -> None:
+        """Olvida la clave (no falla si no existe)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Contadores para monitoreo."""
+        with self._lock:
+            return {"keys": len(self._data), "maxsize": self.maxsize, "evictions": self.evictions}
+
+
+# ────────────────────────────
+# 🐘 Contador compartido en PostgreSQL (varios workers)
+# ────────────────────────────
+
+# Un solo round trip: upsert de la ventana actual y lectura de la anterior
+_PG_HIT = text(
+    """
+    WITH cur AS (
+        INSERT INTO rate_limit_buckets (bucket_key, window_id, attempts, expires_at)
+        VALUES (:key, :window_id, :amount, :expires_at)
+        ON CONFLICT (bucket_key, window_id)
+        DO UPDATE SET attempts = rate_limit_buckets.attempts + EXCLUDED.attempts
+        RETURNING attempts
+    )
+    SELECT
+        COALESCE((SELECT attempts FROM rate_limit_buckets
+                  WHERE bucket_key = :key AND window_id = :window_id - 1), 0) AS previous,
+        (SELECT attempts FROM cur) AS current
+    """
+)
+
+_PG_PEEK = text(
+    """
+    SELECT
+        COALESCE(SUM(attempts) FILTER (WHERE window_id = :window_id - 1), 0) AS previous,
+        COALESCE(SUM(attempts) FILTER (WHERE window_id = :window_id), 0) AS current
+    FROM rate_limit_buckets
+    WHERE bucket_key = :key AND window_id IN (:window_id - 1, :window_id)
+    """
+)
+
+_PG_RESET = text("DELETE FROM rate_limit_buckets WHERE bucket_key = :key")
+
+_PG_PRUNE = text("DELETE FROM rate_limit_buckets WHERE expires_at < now()")
+
+
+class PgSlidingWindowCounter:
+    """Misma ventana deslizante, con los conteos en la tabla `rate_limit_buckets`.
+
+    Las claves deben llevar un prefijo por contador (ej. `ip:`, `email:`): la
+    tabla es compartida. Una fila deja de servir dos ventanas después de la suya
+    (`expires_at`) y `prune()` la elimina.
+    """
+
+    def __init__(self, engine: AsyncEngine, window_seconds: float) -> None:
+        self.engine = engine
+        self.window = window_seconds
+
+    async def hit(self, key: str, amount: int = 1) -> WindowCount:
+        """Suma `amount` eventos a la clave (0 = solo consultar) y retorna sus conteos."""
+        window_id, elapsed = _window_position(self.window, time.time())
+        params = {"key": key, "window_id": window_id}
+        async with self.engine.begin() as conn:
+            if amount == 0:
+                row = (await conn.execute(_PG_PEEK, params)).one()
+            else:
+                expires_at = datetime.fromtimestamp((window_id + 2) * self.window, tz=UTC)
+                params.update(amount=amount, expires_at=expires_at)
+                row = (await conn.execute(_PG_HIT, params)).one()
+        return WindowCount(row.previous, row.current, elapsed, self.window)
+
+    async def reset(self, key: str) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(_PG_RESET, {"key": key})
+
+    async def prune(self) -> int:
+        """Elimina las filas que ya no entran en ninguna ventana."""
+        async with self.engine.begin() as conn:
+            return (await conn.execute(_PG_PRUNE)).rowcount
@@ -0,0 +1,222 @@
+"""
+Módulo: utils/request_timing.py
+Descripción: Middleware ASGI de tiempos por request y conteo de consultas SQL por request.
+¿Para qué? Saber en qué endpoint se va el tiempo y cuánto de ese tiempo es BD:
+           latencia por ruta, requests en curso, códigos de estado, consultas y
+           tiempo de BD, expuestos en /metrics y en el header `Server-Timing`.
+¿Impacto? Las métricas son por proceso (cada worker expone las suyas). Las rutas se
+          etiquetan con su plantilla (`/api/v1/users/{id}`), no con la URL, para que
+          la cantidad de series no crezca con los datos.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import Histogram, format_labels, prometheus_histogram
+from app.utils.query_inspector import observe_query
+
+# Ruta de las requests que no coinciden con ningún endpoint (404)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Acumulado de la request en curso; los hooks del engine lo actualizan."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_current_request: ContextVar[RequestTiming | None] = ContextVar("current_request", default=None)
+
+
+# ────────────────────────────
+# 🗄️ Hooks del engine (consultas por request)
+# ────────────────────────────
+
+# Duración de cada sentencia SQL, dentro o fuera de una request
+query_duration = Histogram()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    query_duration.observe(elapsed)
+    timing = _current_request.get()
+    if timing is not None:
+        timing.queries += 1
+        timing.db_seconds += elapsed
+    observe_query(conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context) -> None:
+    # Una sentencia fallida no llega a after_cursor_execute
+    connection = exception_context.connection
+    starts = connection.info.get("query_start") if connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra los hooks de tiempo en un engine (para async: `async_engine.sync_engine`)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# ────────────────────────────
+# 📊 Registro de métricas HTTP
+# ────────────────────────────
+
+
+class RequestMetrics:
+    """Histogramas y contadores por (método, ruta)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        self.queries: dict[tuple[str, str], int] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(
+        self, method: str, route: str, status: int, seconds: float, timing: RequestTiming
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            latency = self.latency.get(key)
+            if latency is None:
+                latency = self.latency[key] = Histogram()
+                self.db_time[key] = Histogram()
+            self.queries[key] = self.queries.get(key, 0) + timing.queries
+            response_key = (method, route, status)
+            self.responses[response_key] = self.responses.get(response_key, 0) + 1
+            db_time = self.db_time[key]
+        latency.observe(seconds)
+        db_time.observe(timing.db_seconds)
+
+    def render(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus."""
+        with self._lock:
+            latency = list(self.latency.items())
+            db_time = list(self.db_time.items())
+            queries = list(self.queries.items())
+            responses = list(self.responses.items())
+            in_flight = self.in_flight
+
+        lines = [
+            "# HELP http_requests_in_flight Requests en curso en este worker.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP http_request_duration_seconds Latencia de las requests por ruta.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in latency:
+            lines += prometheus_histogram(
+                "http_request_duration_seconds",
+                {"method": method, "route": route},
+                histogram.snapshot(),
+            )
+        lines += [
+            "# HELP http_responses_total Respuestas por ruta y código de estado.",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route, status), count in responses:
+            labels = format_labels({"method": method, "route": route, "status": str(status)})
+            lines.append(f"http_responses_total{labels} {count}")
+        lines += [
+            "# HELP http_request_db_seconds Tiempo en la BD por request, por ruta.",
+            "# TYPE http_request_db_seconds histogram",
+        ]
+        for (method, route), histogram in db_time:
+            lines += prometheus_histogram(
+                "http_request_db_seconds", {"method": method, "route": route}, histogram.snapshot()
+            )
+        lines += [
+            "# HELP http_request_db_queries_total Sentencias SQL ejecutadas por ruta.",
+            "# TYPE http_request_db_queries_total counter",
+        ]
+        for (method, route), count in queries:
+            labels = format_labels({"method": method, "route": route})
+            lines.append(f"http_request_db_queries_total{labels} {count}")
+        lines += [
+            "# HELP db_query_duration_seconds Duración de cada sentencia SQL.",
+            "# TYPE db_query_duration_seconds histogram",
+        ]
+        lines += prometheus_histogram("db_query_duration_seconds", {}, query_duration.snapshot())
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+# ────────────────────────────
+# ⏱️ Middleware
+# ────────────────────────────
+
+
+class TimingMiddleware:
+    """Middleware ASGI puro (sin BaseHTTPMiddleware: no envuelve el body en otra tarea).
+
+    `Server-Timing` mide hasta que empieza la respuesta: `app` es el total y `db`
+    el tiempo en la BD, con la cantidad de consultas en `desc`.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_request.set(timing)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    app_ms = (time.perf_counter() - start) * 1000
+                    value = (
+                        f"app;dur={app_ms:.1f}, "
+                        f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.queries} queries"'
+                    )
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", value.encode()),
+                    ]
+            await send(message)
+
+        request_metrics.started()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = scope.get("route")
+            request_metrics.finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+                timing,
+            )
+            _current_request.reset(token)
@@ -3,26 +3,233 @@ Módulo: utils/security.py
 Descripción: Utilidades de seguridad — hashing de contraseñas y manejo de tokens JWT.
 ¿Para qué? Proveer funciones reutilizables de seguridad para todo el sistema de auth.
 ¿Impacto? Es la base de la seguridad del sistema. Un error aquí compromete toda la autenticación.
+          passlib/bcrypt y python-jose se importan en el primer uso, no al importar
+          la app (ver `python -m app.startup_profile`).
 """
 
+import asyncio
+import hashlib
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from fastapi import HTTPException, status
 
 from app.config import settings
+from app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+    from passlib.context import CryptContext
+
+_pwd_context: "CryptContext | None" = None
+
+
+def get_pwd_context() -> "CryptContext":
+    """Contexto de passlib, creado en el primer hash (en el proceso que lo usa)."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 
 def hash_password(password: str) -> str:
     """Hashea una contraseña en texto plano usando bcrypt."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica si una contraseña en texto plano coincide con su hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+# ────────────────────────────
+# 🧮 Pool de procesos para bcrypt
+# ────────────────────────────
+
+
+class PasswordHasherPool:
+    """Ejecuta bcrypt en un pool de procesos acotado, fuera del event loop.
+
+    bcrypt consume ~250 ms de CPU por operación; ejecutarlo dentro del request
+    bloquea al worker de Uvicorn completo. El pool limita cuántas operaciones
+    pueden estar en curso o en espera y rechaza el exceso con un 503 rápido.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int, retry_after: int) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.capacity = self.max_workers + max(queue_limit, 0)
+        self.retry_after = retry_after
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el executor en el primer uso (después del fork de los workers)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _acquire(self) -> None:
+        """Reserva un cupo en la cola o rechaza la operación con 503."""
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Servidor ocupado, intente nuevamente en unos segundos",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func, *args):
+        """Ejecuta `func(*args)` en el pool respetando el límite de la cola."""
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._release()
+
+    @property
+    def pending(self) -> int:
+        """Operaciones en curso o en espera."""
+        return self._pending
+
+    def shutdown(self) -> None:
+        """Detiene los procesos del pool (se llama al apagar la app)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Versión async de `hash_password` que corre en el pool de procesos."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versión async de `verify_password` que corre en el pool de procesos."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+# ────────────────────────────
+# 🔑 Llaves de firma JWT
+# ────────────────────────────
+
+
+class KeyRing:
+    """Llaves JWT parseadas una sola vez, identificadas por `kid`.
+
+    - HS*: una sola llave simétrica (`SECRET_KEY`), sin `kid` ni JWKS.
+    - RS*/ES*: un archivo `<kid>.pem` por llave en `JWT_KEYS_DIR`. Firma con la
+      llave privada de `JWT_ACTIVE_KID` y verifica con la parte pública de todas
+      las del directorio; las retiradas pueden ser solo la llave pública. Rotar =
+      agregar la nueva llave, cambiar `JWT_ACTIVE_KID`, dejar solo la pública de
+      la vieja y borrarla cuando expiren los refresh tokens firmados con ella.
+    """
+
+    def __init__(self) -> None:
+        self.algorithm = settings.ALGORITHM
+        self.active_kid: str | None = None
+        self._signing_key: Key | None = None
+        self._verification_keys: dict[str | None, Key] = {}
+        self.jwks: dict = {"keys": []}
+        self._loaded = False
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm.startswith("HS")
+
+    def load(self) -> None:
+        """Parsea las llaves de Settings (se llama al arrancar o en el primer uso)."""
+        if self._loaded:
+            return
+        from jose import jwk
+
+        if self.is_symmetric:
+            self._signing_key = jwk.construct(settings.SECRET_KEY, self.algorithm)
+            self._verification_keys = {None: self._signing_key}
+            self._loaded = True
+            return
+
+        keys_dir = Path(settings.JWT_KEYS_DIR)
+        pem_files = sorted(keys_dir.glob("*.pem")) if settings.JWT_KEYS_DIR else []
+        if not pem_files:
+            raise RuntimeError(f"{self.algorithm} requiere llaves .pem en JWT_KEYS_DIR")
+
+        public_keys = []
+        for pem_file in pem_files:
+            kid = pem_file.stem
+            key = jwk.construct(pem_file.read_text(), self.algorithm)
+            # Se verifica con la llave pública (con la privada jose emite un warning)
+            public_key = key.public_key()
+            self._verification_keys[kid] = public_key
+            public_keys.append(
+                {**public_key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+            )
+            if kid == settings.JWT_ACTIVE_KID:
+                if key.is_public():
+                    raise RuntimeError(f"La llave activa '{kid}' debe ser una llave privada")
+                self._signing_key = key
+
+        if self._signing_key is None:
+            raise RuntimeError(
+                f"JWT_ACTIVE_KID '{settings.JWT_ACTIVE_KID}' no está en JWT_KEYS_DIR"
+            )
+        self.active_kid = settings.JWT_ACTIVE_KID
+        self.jwks = {"keys": public_keys}
+        self._loaded = True
+
+    def signing_key(self) -> tuple[str | None, "Key"]:
+        """Retorna (`kid`, llave) con la que se firman los tokens nuevos."""
+        self.load()
+        return self.active_kid, self._signing_key
+
+    def verification_key(self, kid: str | None) -> "Key | None":
+        """Llave para verificar un token según su `kid` (o la activa si no trae)."""
+        self.load()
+        return self._verification_keys.get(kid if kid is not None else self.active_kid)
+
+
+key_ring = KeyRing()
+
+# Tokens de acceso ya verificados (clave: SHA-256 del token). Cada entrada vive
+# como máximo hasta el `exp` del token, así que nunca acepta un token expirado.
+verified_tokens = TTLCache(
+    maxsize=settings.VERIFIED_TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def _encode(to_encode: dict) -> str:
+    """Firma el payload con la llave activa, incluyendo `kid` si aplica."""
+    from jose import jwt
+
+    kid, key = key_ring.signing_key()
+    return jwt.encode(
+        to_encode,
+        key,
+        algorithm=key_ring.algorithm,
+        headers={"kid": kid} if kid else None,
+    )
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -35,12 +242,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
-    return encoded_jwt
+    return _encode(to_encode)
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -53,22 +255,50 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
-    return encoded_jwt
+    return _encode(to_encode)
 
 
 def decode_token(token: str) -> dict | None:
-    """Decodifica y verifica un token JWT."""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
+    """Decodifica y verifica un token JWT.
+
+    Los access tokens verificados se guardan en `verified_tokens`: el mismo token
+    presentado de nuevo no vuelve a verificar la firma. El payload retornado es
+    compartido, no debe modificarse.
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(cache_key)
+    if payload is not None:
         return payload
+
+    from jose import JWTError, jwt
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = key_ring.verification_key(kid)
+        if key is None:
+            return None
+        payload = jwt.decode(token, key, algorithms=[key_ring.algorithm])
     except JWTError:
         return None
+
+    if payload.get("type") == "access":
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            verified_tokens.set(cache_key, payload, ttl=ttl)
+    return payload
+
+
+# ────────────────────────────
+# 🔁 Tokens de recuperación de contraseña
+# ────────────────────────────
+
+
+def hash_reset_token(token: str) -> bytes:
+    """SHA-256 (32 bytes) de un token de recuperación: es lo que se guarda en la BD."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def generate_reset_token() -> tuple[str, bytes]:
+    """Genera un token de recuperación; retorna (token para el email, hash a guardar)."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_reset_token(token)
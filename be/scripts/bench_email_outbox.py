@@ -0,0 +1,94 @@
+"""
+Script: bench_email_outbox.py
+Descripción: Benchmark de emails/segundo contra el SMTP de pruebas (scripts/smtp_stub.py).
+¿Para qué? Comparar el envío en línea (una conexión SMTP por email, como el código
+           comentado original) contra la outbox con despachador por lotes y pool SMTP.
+¿Impacto? Inserta y vacía filas `bench-*@calzadojyr.com` en `email_outbox` de la BD
+          de DATABASE_URL; el servidor SMTP de pruebas corre en el mismo proceso.
+
+Uso: python scripts/bench_email_outbox.py [-n 500] [--delay 0.005] [--pool 4]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiosmtplib
+from smtp_stub import SMTPStub
+from sqlalchemy import delete, insert
+
+from app.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import EmailDispatcher
+from app.utils.email import OutgoingEmail, SMTPConnectionPool, build_message
+
+
+def _emails(count: int) -> list[OutgoingEmail]:
+    return [
+        OutgoingEmail(f"bench-{i}@calzadojyr.com", "Benchmark", f"Mensaje de prueba {i}")
+        for i in range(count)
+    ]
+
+
+async def _inline(emails: list[OutgoingEmail], port: int) -> float:
+    """Antes: cada request abre su propia conexión SMTP y espera el envío."""
+    start = time.perf_counter()
+    for email in emails:
+        await aiosmtplib.send(
+            build_message(email), hostname="127.0.0.1", port=port, start_tls=False
+        )
+    return time.perf_counter() - start
+
+
+async def _outbox(emails: list[OutgoingEmail], port: int, pool_size: int, batch_size: int) -> float:
+    """Después: encolar en la outbox y vaciarla con el despachador y el pool SMTP."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(EmailOutbox),
+            [{"recipient": e.recipient, "subject": e.subject, "body": e.body} for e in emails],
+        )
+        await db.commit()
+
+    dispatcher = EmailDispatcher(batch_size=batch_size, poll_seconds=1.0)
+    dispatcher.mailer = SMTPConnectionPool("127.0.0.1", port, start_tls=False, size=pool_size)
+    start = time.perf_counter()
+    while await dispatcher.dispatch_once():
+        pass
+    elapsed = time.perf_counter() - start
+    await dispatcher.mailer.close()
+    print(f"   conexiones SMTP abiertas por la outbox: {dispatcher.mailer.connects}")
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de envío de emails")
+    parser.add_argument("-n", "--emails", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.005, help="Latencia simulada por mensaje")
+    parser.add_argument("--pool", type=int, default=4, help="Conexiones del pool SMTP")
+    parser.add_argument("--batch", type=int, default=50, help="Emails por lote del despachador")
+    args = parser.parse_args()
+
+    stub = SMTPStub(delay=args.delay)
+    port = await stub.start()
+    emails = _emails(args.emails)
+    print(f"📊 {args.emails} emails, latencia SMTP simulada {args.delay * 1000:.0f} ms")
+    try:
+        inline = await _inline(emails, port)
+        print(f"   antes: envío en línea           {args.emails / inline:>9.0f} emails/s")
+        outbox = await _outbox(emails, port, args.pool, args.batch)
+        print(f"   después: outbox + pool ({args.pool})      {args.emails / outbox:>9.0f} emails/s")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(EmailOutbox).where(EmailOutbox.recipient.like("bench-%")))
+            await db.commit()
+        await stub.stop()
+    print(f"   mensajes recibidos por el SMTP de pruebas: {stub.received}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Script: bench_jwt_decode.py
+Descripción: Microbenchmark de verificación de access tokens JWT.
+¿Para qué? Comparar la verificación anterior (python-jose con la llave en texto en
+           cada llamada) contra la actual (llaves parseadas una vez + caché de tokens).
+¿Impacto? No toca la BD; usa ALGORITHM / JWT_KEYS_DIR / JWT_ACTIVE_KID del entorno.
+
+Uso: python scripts/bench_jwt_decode.py [-n 20000] [--tokens 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import jwt
+
+from app.config import settings
+from app.utils.security import create_access_token, decode_token, key_ring, verified_tokens
+
+
+def _raw_key() -> str:
+    """Llave en texto tal como la usaba `decode_token` antes (re-parseada en cada llamada)."""
+    if key_ring.is_symmetric:
+        return settings.SECRET_KEY
+    with open(os.path.join(settings.JWT_KEYS_DIR, f"{settings.JWT_ACTIVE_KID}.pem")) as f:
+        return f.read()
+
+
+def _rate(label: str, calls: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<38} {calls / elapsed:>12,.0f} decodes/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmark de decode_token")
+    parser.add_argument("-n", "--decodes", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100, help="Tokens distintos en rotación")
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"user{i}@calzadojyr.com"}) for i in range(args.tokens)]
+    workload = [tokens[i % len(tokens)] for i in range(args.decodes)]
+    raw_key = _raw_key()
+    _, parsed_key = key_ring.signing_key()
+
+    print(f"📊 {args.decodes} decodes, {args.tokens} tokens distintos, {key_ring.algorithm}")
+    _rate(
+        "antes: llave en texto, sin caché",
+        args.decodes,
+        lambda: [jwt.decode(t, raw_key, algorithms=[key_ring.algorithm]) for t in workload],
+    )
+    _rate(
+        "llave parseada, sin caché",
+        args.decodes,
+        lambda: [jwt.decode(t, parsed_key, algorithms=[key_ring.algorithm]) for t in workload],
+    )
+    verified_tokens.clear()
+    _rate(
+        "después: decode_token (con caché)",
+        args.decodes,
+        lambda: [decode_token(t) for t in workload],
+    )
+
+
+if __name__ == "__main__":
+    main()
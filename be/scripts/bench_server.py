@@ -0,0 +1,151 @@
+"""
+Script: bench_server.py
+Descripción: Prueba de carga local: CMD anterior del Dockerfile (`uvicorn --workers`)
+             contra el lanzador de producción (`python -m app.server`).
+¿Para qué? Comparar con la misma cantidad de workers el tiempo hasta atender, el
+           throughput, la latencia (p50/p99) y la memoria real (PSS) de todo el
+           árbol de procesos, donde se nota la app precargada antes del fork.
+¿Impacto? Levanta cada servidor en un puerto local contra la BD de DATABASE_URL y
+          solo hace GETs. El cliente corre en la misma máquina y compite por CPU:
+          los números sirven para comparar, no como capacidad absoluta.
+
+Uso: python scripts/bench_server.py [--workers 2] [-d 15] [-c 64] [--path /api/v1/type-documents]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BE_DIR = Path(__file__).resolve().parent.parent
+HEALTH_PATH = "/api/v1/health"
+
+
+def _tree(pid: int) -> list[int]:
+    """El proceso y todos sus descendientes (maestro + workers)."""
+    pids = [pid]
+    for task in Path(f"/proc/{pid}/task").glob("*/children"):
+        for child in task.read_text().split():
+            pids += _tree(int(child))
+    return pids
+
+
+def _pss_mb(pid: int) -> float:
+    """Memoria proporcional (PSS) del árbol: las páginas compartidas cuentan una vez."""
+    total_kb = 0
+    for p in _tree(pid):
+        try:
+            for line in Path(f"/proc/{p}/smaps_rollup").read_text().splitlines():
+                if line.startswith("Pss:"):
+                    total_kb += int(line.split()[1])
+        except OSError:
+            pass
+    return total_kb / 1024
+
+
+async def _wait_ready(base_url: str, timeout: float = 60.0) -> float:
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() - start < timeout:
+            try:
+                if (await client.get(HEALTH_PATH)).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise SystemExit(f"❌ El servidor no respondió en {timeout:.0f} s")
+
+
+async def _load(
+    base_url: str, path: str, duration: float, concurrency: int
+) -> tuple[list[float], int]:
+    """`concurrency` clientes keep-alive pidiendo `path` durante `duration` segundos."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def user() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                        continue
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run(label: str, command: list[str], env: dict, args: argparse.Namespace) -> None:
+    base_url = f"http://127.0.0.1:{args.port}"
+    process = subprocess.Popen(
+        command, cwd=BE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        ready = asyncio.run(_wait_ready(base_url))
+        asyncio.run(_load(base_url, args.path, 2.0, args.concurrency))  # calentamiento
+        idle_mb = _pss_mb(process.pid)
+        latencies, errors = asyncio.run(_load(base_url, args.path, args.duration, args.concurrency))
+        loaded_mb = _pss_mb(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+    throughput = len(latencies) / args.duration
+    print(f"\n🏁 {label}")
+    print(f"   listo para atender      {ready:>9.2f} s")
+    print(f"   throughput              {throughput:>9.0f} req/s  ({errors} errores)")
+    print(f"   latencia p50 / p99      {p50 * 1000:>9.1f} / {p99 * 1000:.1f} ms")
+    print(f"   memoria PSS reposo/carga {idle_mb:>8.0f} / {loaded_mb:.0f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga local: uvicorn --workers vs app.server")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("-d", "--duration", type=float, default=15.0, help="segundos de carga")
+    parser.add_argument("-c", "--concurrency", type=int, default=64)
+    parser.add_argument("--path", default="/api/v1/type-documents")
+    parser.add_argument("--port", type=int, default=8077)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(args.port),
+        "SERVER_WORKERS": str(args.workers),
+    }
+    print(
+        f"📊 GET {args.path} — {args.workers} workers, {args.concurrency} clientes, "
+        f"{args.duration:.0f} s"
+    )
+    run(
+        "antes: uvicorn app.main:app --workers",
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--workers", str(args.workers)],
+        env,
+        args,
+    )
+    run("después: python -m app.server", [sys.executable, "-m", "app.server"], env, args)
+
+
+if __name__ == "__main__":
+    main()
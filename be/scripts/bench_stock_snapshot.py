@@ -0,0 +1,206 @@
+"""
+Script: bench_stock_snapshot.py
+Descripción: Benchmark de la consulta de stock según el historial con 1M y 10M movimientos.
+¿Para qué? Comparar sumar todo `inventory_movement` (antes) contra snapshot +
+           movimientos posteriores al checkpoint (después), para un producto y
+           para toda la bodega, y medir cuánto tarda el refresco incremental.
+¿Impacto? Inserta productos `bench-*` y sus movimientos en la BD de DATABASE_URL
+          (requiere al menos un usuario, p. ej. scripts/create_admin.py) y los
+          elimina al terminar. 10M movimientos ocupan varios GB y tardan minutos.
+
+Uso: python scripts/bench_stock_snapshot.py [--sizes 1000000,10000000] [--products 200]
+                                             [--tail 1000] [-n 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal, async_engine
+from app.services.stock_snapshot import StockSnapshotter, ledger_stock
+
+# Movimientos por INSERT (una transacción por lote)
+_CHUNK = 1_000_000
+
+# Antes: el stock según el historial es la suma de todos los movimientos
+_FULL_SUM_SQL = """
+    SELECT product_id, size, colour,
+           sum(CASE WHEN type_of_movement = 'salida' THEN -amount ELSE amount END) AS amount
+    FROM inventory_movement
+    WHERE deleted_at IS NULL {filter}
+    GROUP BY product_id, size, colour
+    ORDER BY product_id, size, colour
+"""
+_FULL_SUM = text(_FULL_SUM_SQL.format(filter=""))
+_FULL_SUM_PRODUCT = text(_FULL_SUM_SQL.format(filter="AND product_id = :product_id"))
+
+# 10 tallas x 2 colores (uno de ellos sin color) por producto
+_GENERATE = text(
+    """
+    INSERT INTO inventory_movement
+        (product_id, user_id, type_of_movement, size, colour, amount, movement_date)
+    SELECT p.ids[1 + (g % cardinality(p.ids))],
+           :user_id,
+           (ARRAY['entrada', 'entrada', 'salida', 'ajuste']
+               ::inventory_movement_type[])[1 + (g / 7) % 4],
+           (35 + (g / 3) % 10)::text,
+           CASE WHEN (g / 11) % 2 = 0 THEN 'negro' END,
+           1 + (g % 5),
+           now() - make_interval(secs => g)
+    FROM generate_series(1, :count) AS g,
+         (SELECT array_agg(id ORDER BY id) AS ids FROM products WHERE name LIKE 'bench-%') AS p
+    """
+)
+
+
+async def _setup(products: int) -> tuple:
+    async with AsyncSessionLocal() as db:
+        user_id = (await db.execute(text("SELECT id FROM users LIMIT 1"))).scalar_one_or_none()
+        if user_id is None:
+            sys.exit("❌ No hay usuarios: ejecutar primero scripts/create_admin.py")
+        category = (
+            await db.execute(text("INSERT INTO categories (name) VALUES ('bench') RETURNING id"))
+        ).scalar_one()
+        brand = (
+            await db.execute(text("INSERT INTO brands (name) VALUES ('bench') RETURNING id"))
+        ).scalar_one()
+        reference = (
+            await db.execute(
+                text(
+                    "INSERT INTO \"references\" (brand_id, name) "
+                    "VALUES (:b, 'bench') RETURNING id"
+                ),
+                {"b": brand},
+            )
+        ).scalar_one()
+        product_ids = (
+            await db.execute(
+                text(
+                    "INSERT INTO products (category_id, brand_id, reference_id, name) "
+                    "SELECT :c, :b, :r, 'bench-' || g FROM generate_series(1, :n) AS g RETURNING id"
+                ),
+                {"c": category, "b": brand, "r": reference, "n": products},
+            )
+        ).scalars().all()
+        await db.commit()
+    return user_id, list(product_ids)
+
+
+async def _generate(user_id, count: int) -> None:
+    done = 0
+    while done < count:
+        chunk = min(_CHUNK, count - done)
+        async with AsyncSessionLocal() as db:
+            await db.execute(_GENERATE, {"user_id": user_id, "count": chunk})
+            await db.commit()
+        done += chunk
+    async with async_engine.connect() as conn:
+        await conn.execute(text("ANALYZE inventory_movement"))
+        await conn.commit()
+
+
+async def _latency_ms(query, runs: int) -> tuple[float, float]:
+    """p50 y p95 en ms de `query(db)`, cada corrida en una sesión nueva."""
+    timings = []
+    for _ in range(runs):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await query(db)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        bench_products = "SELECT id FROM products WHERE name LIKE 'bench-%'"
+        for table in ("inventory_movement", "inventory_stock_snapshot"):
+            await db.execute(text(f"DELETE FROM {table} WHERE product_id IN ({bench_products})"))
+        await db.execute(text("DELETE FROM products WHERE name LIKE 'bench-%'"))
+        await db.execute(text("DELETE FROM \"references\" WHERE name = 'bench'"))
+        await db.execute(text("DELETE FROM brands WHERE name = 'bench'"))
+        await db.execute(text("DELETE FROM categories WHERE name = 'bench'"))
+        await db.commit()
+    async with async_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE inventory_movement"))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Latencia del stock según el historial")
+    parser.add_argument("--sizes", default="1000000,10000000", help="Movimientos totales a medir")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument(
+        "--tail", type=int, default=1000, help="Movimientos posteriores al checkpoint"
+    )
+    parser.add_argument("-n", "--runs", type=int, default=50, help="Consultas por medición")
+    parser.add_argument(
+        "--batch", type=int, default=50_000, help="Movimientos por lote del refresco"
+    )
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    user_id, product_ids = await _setup(args.products)
+    snapshotter = StockSnapshotter(interval_seconds=0, batch_size=args.batch)
+    await snapshotter.run_once()  # los movimientos previos al benchmark no se cuentan
+    total = 0
+    try:
+        for size in sizes:
+            print(f"📊 {size:,} movimientos, {args.products} productos, cola de {args.tail}")
+            start = time.perf_counter()
+            await _generate(user_id, size - args.tail - total)
+            print(f"   generación                     {time.perf_counter() - start:>9.1f} s")
+            start = time.perf_counter()
+            folded = await snapshotter.run_once()
+            print(f"   refresco de {folded:>10,} mov.   {time.perf_counter() - start:>9.1f} s")
+
+            # Cola: movimientos aún no sumados, que la consulta agrega al snapshot
+            await _generate(user_id, args.tail)
+            total = size
+
+            product_id = random.choice(product_ids)
+            async with AsyncSessionLocal() as db:
+                full_sum = await db.execute(_FULL_SUM_PRODUCT, {"product_id": product_id})
+                expected = [tuple(row) for row in full_sum]
+                ledger = [
+                    (r.product_id, r.size, r.colour, r.amount)
+                    for r in await ledger_stock(db, product_id)
+                ]
+                assert ledger == expected, "el snapshot no coincide con la suma completa"
+
+            cases = [
+                ("un producto, suma completa", args.runs,
+                 lambda db: db.execute(
+                     _FULL_SUM_PRODUCT, {"product_id": random.choice(product_ids)}
+                 )),
+                ("un producto, snapshot + cola", args.runs,
+                 lambda db: ledger_stock(db, random.choice(product_ids))),
+                # La suma de toda la bodega tarda segundos con 10M: menos corridas
+                ("bodega, suma completa", max(args.runs // 10, 3),
+                 lambda db: db.execute(_FULL_SUM)),
+                ("bodega, snapshot + cola", args.runs, lambda db: ledger_stock(db)),
+            ]
+            for label, runs, query in cases:
+                p50, p95 = await _latency_ms(query, runs)
+                print(f"   {label:<30} p50 {p50:>9.2f} ms   p95 {p95:>9.2f} ms")
+
+            start = time.perf_counter()
+            folded = await snapshotter.run_once()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"   refresco incremental ({folded:,} mov.) {elapsed_ms:>7.1f} ms")
+    finally:
+        await _cleanup()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
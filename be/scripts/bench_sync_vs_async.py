@@ -0,0 +1,96 @@
+"""
+Script: bench_sync_vs_async.py
+Descripción: Benchmark de throughput entre la ruta síncrona (SessionLocal + threadpool)
+             y la ruta async (AsyncSessionLocal + asyncpg) del backend.
+¿Para qué? Medir con datos si el threadpool de FastAPI (40 hilos) es el techo de
+           throughput en las consultas de login y de `/users/me`.
+¿Impacto? Solo lectura: ejecuta las mismas consultas que los endpoints, sin bcrypt
+          (el hashing va en su propio pool de procesos y no depende del driver).
+
+Uso: python scripts/bench_sync_vs_async.py --email admin@calzadojyr.com [-n 2000] [-c 100]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+
+# Importar modelos para que SQLAlchemy resuelva las relaciones de User
+from app.models import role, type_document  # noqa: F401
+from app.models.user import User
+
+# Hilos por defecto del threadpool de FastAPI/AnyIO para endpoints `def`
+FASTAPI_THREADPOOL_SIZE = 40
+
+
+def _sync_request(email: str) -> None:
+    """Equivale al acceso a BD de un request síncrono (login o /users/me)."""
+    db = SessionLocal()
+    try:
+        user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+        assert user is not None, f"No existe el usuario {email}"
+    finally:
+        db.close()
+
+
+async def _async_request(email: str) -> None:
+    """Equivale al acceso a BD de un request async (login o /users/me)."""
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+        assert user is not None, f"No existe el usuario {email}"
+
+
+def bench_sync(email: str, requests: int) -> float:
+    """Ejecuta `requests` consultas en un threadpool del tamaño del de FastAPI."""
+    with ThreadPoolExecutor(max_workers=FASTAPI_THREADPOOL_SIZE) as pool:
+        _sync_request(email)  # calentar el pool de conexiones
+        start = time.perf_counter()
+        list(pool.map(lambda _: _sync_request(email), range(requests)))
+        return time.perf_counter() - start
+
+
+async def bench_async(email: str, requests: int, concurrency: int) -> float:
+    """Ejecuta `requests` consultas async con `concurrency` en vuelo a la vez."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await _async_request(email)
+
+    await _async_request(email)  # calentar el pool de conexiones
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async (BD)")
+    parser.add_argument("--email", required=True, help="Email de un usuario existente")
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    sync_elapsed = bench_sync(args.email, args.requests)
+    engine.dispose()
+    async_elapsed = asyncio.run(bench_async(args.email, args.requests, args.concurrency))
+
+    print(f"📊 {args.requests} requests (login / users/me — ruta de BD)")
+    print(f"   sync  (threadpool {FASTAPI_THREADPOOL_SIZE}): "
+          f"{args.requests / sync_elapsed:8.1f} req/s  ({sync_elapsed:.2f} s)")
+    print(f"   async (concurrencia {args.concurrency}): "
+          f"{args.requests / async_elapsed:8.1f} req/s  ({async_elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
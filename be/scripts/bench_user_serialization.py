@@ -0,0 +1,121 @@
+"""
+Script: bench_user_serialization.py
+Descripción: Benchmark de serialización de usuarios a JSON (sin BD).
+¿Para qué? Comparar la construcción anterior (UserResponse campo por campo + la
+           validación y codificación de FastAPI) contra `schemas/serializers.py`
+           (`model_construct` + orjson).
+¿Impacto? Solo mide CPU en memoria; los usuarios se construyen como objetos ORM
+          transitorios con su rol y tipo de documento.
+
+Uso: python scripts/bench_user_serialization.py [-n 10000] [--rounds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.role import Role
+from app.models.type_document import TypeDocument
+from app.models.user import User
+from app.schemas.serializers import json_response, user_response
+from app.schemas.user import UserResponse
+
+
+def _build_users(count: int) -> list[User]:
+    """Usuarios ORM transitorios, equivalentes a los que retorna una consulta."""
+    role = Role(id=uuid.uuid4(), name="client")
+    document_type = TypeDocument(id=uuid.uuid4(), name="Cédula de ciudadanía")
+    now = datetime.now(UTC)
+    return [
+        User(
+            id=uuid.uuid4(),
+            email=f"cliente{i}@calzadojyr.com",
+            hashed_password="x",
+            name="Cliente",
+            last_name=f"Número {i}",
+            phone="3001234567",
+            identity_document=f"{10000000 + i}",
+            identity_document_type_id=document_type.id,
+            identity_document_type=document_type,
+            role_id=role.id,
+            role=role,
+            is_active=False,
+            is_validated=False,
+            must_change_password=False,
+            business_name="Calzado Demo",
+            occupation=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def _before(users: list[User]) -> bytes:
+    """Construcción manual + el camino de FastAPI con `response_model` (validar y codificar)."""
+    responses = [
+        UserResponse(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            last_name=user.last_name,
+            phone=user.phone,
+            identity_document=user.identity_document,
+            identity_document_type_id=user.identity_document_type_id,
+            identity_document_type_name=(
+                user.identity_document_type.name if user.identity_document_type else None
+            ),
+            is_active=user.is_active,
+            is_validated=user.is_validated,
+            must_change_password=user.must_change_password,
+            role_name=user.role.name if user.role else None,
+            business_name=user.business_name,
+            occupation=user.occupation,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+        for user in users
+    ]
+    adapter = TypeAdapter(list[UserResponse])
+    validated = adapter.validate_python([response.model_dump() for response in responses])
+    return JSONResponse(jsonable_encoder(adapter.dump_python(validated))).body
+
+
+def _after(users: list[User]) -> bytes:
+    """Capa de serialización compartida."""
+    return json_response([user_response(user) for user in users]).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de usuarios")
+    parser.add_argument("-n", "--users", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    users = _build_users(args.users)
+    print(f"📊 {args.users} usuarios, mejor de {args.rounds} rondas")
+    variants = (
+        ("antes: UserResponse + FastAPI", _before),
+        ("después: serializers + orjson", _after),
+    )
+    for label, func in variants:
+        best = float("inf")
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            body = func(users)
+            best = min(best, time.perf_counter() - start)
+        print(f"   {label:<32} {best * 1000:>9.1f} ms   {len(body) / 1024:>8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,19 @@ Descripción: Crea el usuario administrador inicial en la base de datos.
 Uso: python scripts/create_admin.py
 """
 
-import sys
 import os
+import sys
 
 # Agregar el directorio padre al path para importar app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import select
 from datetime import datetime, timezone
 
+from sqlalchemy import select
+
 from app.database import SessionLocal
-from app.models.role import Role
 from app.models.user import User
+from app.services.role_registry import role_registry
 from app.utils.security import hash_password
 
 
@@ -28,16 +29,16 @@ def create_admin() -> None:
 
     try:
         # Verificar que el rol admin existe
-        stmt = select(Role).where(Role.name == "admin")
-        admin_role = db.execute(stmt).scalar_one_or_none()
+        role_registry.load_sync(db)
+        admin_role_id = role_registry.id_for("admin")
 
-        if not admin_role:
+        if not admin_role_id:
             print("❌ Error: El rol 'admin' no existe en la base de datos.")
             print("   Asegúrate de que el script de inicialización se ejecutó correctamente.")
             return
 
         # Verificar si ya existe un admin
-        stmt = select(User).where(User.role_id == admin_role.id)
+        stmt = select(User).where(User.role_id == admin_role_id)
         existing_admin = db.execute(stmt).scalar_one_or_none()
 
         if existing_admin:
@@ -53,7 +54,7 @@ def create_admin() -> None:
             email=admin_email,
             full_name="Administrador J&R",
             hashed_password=hash_password(admin_password),
-            role_id=admin_role.id,
+            role_id=admin_role_id,
             is_active=True,
             is_validated=True,
             validated_at=datetime.now(timezone.utc),
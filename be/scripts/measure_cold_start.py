@@ -0,0 +1,106 @@
+"""
+Script: measure_cold_start.py
+Descripción: Mide el arranque en frío de un worker: import de la app y lifespan completo.
+¿Para qué? Comparar la verificación de esquema del arranque antes (`create_all`, que
+           consulta la existencia de cada tabla) y después (una fila de `alembic_version`).
+¿Impacto? Cada medición corre en un proceso nuevo (como un worker recién lanzado) contra
+          la BD de DATABASE_URL, que debe estar en la revisión esperada. No modifica datos.
+
+Uso: python scripts/measure_cold_start.py [-n 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def _child() -> dict[str, float]:
+    """Un arranque en frío; se ejecuta en un proceso nuevo."""
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.config import settings
+    from app.database import Base, check_schema_revision
+    from app.utils.query_inspector import record_queries
+    from app.utils.request_timing import instrument_engine
+
+    # Antes: create_all con una conexión nueva (lo que hacía cada worker al arrancar)
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    instrument_engine(engine)
+    with record_queries() as create_all_queries:
+        t0 = time.perf_counter()
+        Base.metadata.create_all(bind=engine)
+        create_all_seconds = time.perf_counter() - t0
+    engine.dispose()
+
+    # Después: una sola consulta a alembic_version
+    with record_queries() as check_queries:
+        t0 = time.perf_counter()
+        await check_schema_revision()
+        check_seconds = time.perf_counter() - t0
+
+    return {
+        "import": imported - start,
+        "lifespan": started - imported,
+        "create_all": create_all_seconds,
+        "create_all_queries": len(create_all_queries),
+        "schema_check": check_seconds,
+        "schema_check_queries": len(check_queries),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Arranque en frío por worker")
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(_child())
+        print("RESULT " + json.dumps(result))
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        line = next(line for line in output.splitlines() if line.startswith("RESULT "))
+        runs.append(json.loads(line.removeprefix("RESULT ")))
+
+    def median_ms(key: str) -> float:
+        return statistics.median(run[key] for run in runs) * 1000
+
+    print(f"📊 Arranque en frío, mediana de {args.runs} procesos")
+    print(f"   import de app.main          {median_ms('import'):>8.1f} ms")
+    print(f"   lifespan (arranque)         {median_ms('lifespan'):>8.1f} ms")
+    print(
+        f"   antes: create_all           {median_ms('create_all'):>8.1f} ms "
+        f"({runs[0]['create_all_queries']} consultas)"
+    )
+    print(
+        f"   después: check de esquema   {median_ms('schema_check'):>8.1f} ms "
+        f"({runs[0]['schema_check_queries']} consulta)"
+    )
+
+
+if __name__ == "__main__":
+    main()
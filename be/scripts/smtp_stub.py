@@ -0,0 +1,108 @@
+"""
+Script: smtp_stub.py
+Descripción: Servidor SMTP mínimo en local que acepta y cuenta emails sin enviarlos.
+¿Para qué? Probar el despachador de emails con `MAIL_BACKEND=smtp` sin un proveedor
+           real, incluyendo latencia simulada y fallos para ejercitar los reintentos.
+¿Impacto? Solo para desarrollo/pruebas. No soporta STARTTLS ni AUTH: usar con
+          MAIL_START_TLS=false y MAIL_USERNAME vacío.
+
+Uso: python scripts/smtp_stub.py [--port 2525] [--delay 0.05] [--fail-rate 0.1] [--print]
+"""
+
+import argparse
+import asyncio
+import random
+
+
+class SMTPStub:
+    """Servidor SMTP que responde el protocolo básico y cuenta los mensajes recibidos."""
+
+    def __init__(self, delay: float = 0.0, fail_rate: float = 0.0, echo: bool = False) -> None:
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.echo = echo
+        self.connections = 0
+        self.received = 0
+        self.rejected = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Arranca el servidor; retorna el puerto (0 = uno libre)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-stub listo")
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    await reply("250-smtp-stub")
+                    await reply("250 8BITMIME")
+                elif verb == "DATA":
+                    await reply("354 Termine con <CRLF>.<CRLF>")
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    if random.random() < self.fail_rate:
+                        self.rejected += 1
+                        await reply("451 Fallo temporal simulado")
+                        continue
+                    self.received += 1
+                    if self.echo:
+                        print(data.decode(errors="replace"))
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Adiós")
+                    break
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                else:
+                    await reply("502 Comando no implementado")
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor SMTP de pruebas")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--delay", type=float, default=0.0, help="Segundos por mensaje")
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="Fracción de mensajes rechazados (451)"
+    )
+    parser.add_argument("--print", action="store_true", help="Imprimir cada mensaje recibido")
+    args = parser.parse_args()
+
+    stub = SMTPStub(delay=args.delay, fail_rate=args.fail_rate, echo=args.print)
+    port = await stub.start(port=args.port)
+    print(f"📭 SMTP de pruebas escuchando en 127.0.0.1:{port} (Ctrl+C para salir)")
+    try:
+        while True:
+            await asyncio.sleep(5)
+            print(
+                f"   conexiones={stub.connections} recibidos={stub.received} "
+                f"rechazados={stub.rejected}"
+            )
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,70 @@
+"""
+Script: stress_duplicate_registration.py
+Descripción: Prueba de concurrencia del registro con el mismo email en paralelo.
+¿Para qué? Verificar que `register_user` (INSERT ... ON CONFLICT DO NOTHING) crea
+           exactamente un usuario y responde 400 al resto, sin errores 500.
+¿Impacto? Crea usuarios `stress-*@calzadojyr.com` y los elimina al terminar.
+          Corre la app en proceso (ASGI), contra la BD de DATABASE_URL.
+
+Uso: python scripts/stress_duplicate_registration.py [-c 30] [--rounds 5]
+     (con -c mayor que PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT habrá 503)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from collections import Counter
+
+# Agregar el directorio padre al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.user import User
+
+
+async def _round(client: httpx.AsyncClient, concurrency: int) -> tuple[Counter, int]:
+    """Lanza `concurrency` registros simultáneos con el mismo email."""
+    email = f"stress-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+    payload = {"email": email, "name": "Stress", "last_name": "Test", "password": "Stress123"}
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/auth/register", json=payload) for _ in range(concurrency))
+    )
+    async with AsyncSessionLocal() as db:
+        created = (await db.execute(select(func.count()).where(User.email == email))).scalar_one()
+    return Counter(response.status_code for response in responses), created
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Registro concurrente con email duplicado")
+    parser.add_argument("-c", "--concurrency", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for number in range(1, args.rounds + 1):
+            statuses, created = await _round(client, args.concurrency)
+            ok = created == 1 and statuses == Counter({201: 1, 400: args.concurrency - 1})
+            failures += not ok
+            mark = "✅" if ok else "❌"
+            print(f"{mark} Ronda {number}: {dict(statuses)} → usuarios creados: {created}")
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email.like("stress-%@calzadojyr.com")))
+        await db.commit()
+
+    if failures:
+        print(f"❌ {failures} ronda(s) con resultados inesperados")
+        sys.exit(1)
+    print("✅ Registro concurrente correcto: un usuario por email y 400 para los duplicados")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Módulo: tests/conftest.py
+Descripción: Configuración y fixtures compartidas de las pruebas del backend.
+¿Para qué? Cargar el plugin de presupuesto de consultas y levantar la app con
+           TestClient (incluye el lifespan: llaves JWT, roles, jobs).
+¿Impacto? Las pruebas usan la BD PostgreSQL de DATABASE_URL, creada con db/init
+          o `alembic upgrade head`; cada prueba limpia los datos que crea.
+"""
+
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+pytest_plugins = ["app.pytest_query_budget"]
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient con el lifespan de la app, compartido por las pruebas del módulo."""
+    from app.main import app
+
+    # Al cerrar, el lifespan descarta el pool async: sus conexiones quedan atadas
+    # al event loop del TestClient y otra prueba con su propio loop no podría usarlas.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+async def async_db_engine():
+    """Engine async de la app; su pool se descarta al terminar (cada prueba async tiene su loop)."""
+    from app.database import async_engine
+
+    yield async_engine
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def product():
+    """Producto y empleado creados en la BD; se eliminan al terminar, con su stock e historial."""
+    from app.database import engine
+
+    name = f"test-{uuid.uuid4().hex[:12]}"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id, "
+                "is_active, is_validated, validated_at) "
+                "SELECT :email, 'x', 'Prueba', 'Inventario', id, true, true, now() "
+                "FROM roles WHERE name = 'employee' RETURNING id"
+            ),
+            {"email": f"{name}@calzadojyr.com"},
+        ).scalar_one()
+        category_id = conn.execute(
+            text("INSERT INTO categories (name) VALUES (:name) RETURNING id"), {"name": name}
+        ).scalar_one()
+        brand_id = conn.execute(
+            text("INSERT INTO brands (name) VALUES (:name) RETURNING id"), {"name": name}
+        ).scalar_one()
+        reference_id = conn.execute(
+            text('INSERT INTO "references" (brand_id, name) VALUES (:b, :name) RETURNING id'),
+            {"b": brand_id, "name": name},
+        ).scalar_one()
+        product_id = conn.execute(
+            text(
+                "INSERT INTO products (category_id, brand_id, reference_id, name) "
+                "VALUES (:c, :b, :r, :name) RETURNING id"
+            ),
+            {"c": category_id, "b": brand_id, "r": reference_id, "name": name},
+        ).scalar_one()
+    yield product_id, user_id
+    with engine.begin() as conn:
+        for table in ("inventory_movement", "inventory_stock_snapshot", "inventory"):
+            conn.execute(text(f"DELETE FROM {table} WHERE product_id = :p"), {"p": product_id})
+        conn.execute(text("DELETE FROM products WHERE id = :id"), {"id": product_id})
+        conn.execute(text('DELETE FROM "references" WHERE id = :id'), {"id": reference_id})
+        conn.execute(text("DELETE FROM brands WHERE id = :id"), {"id": brand_id})
+        conn.execute(text("DELETE FROM categories WHERE id = :id"), {"id": category_id})
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
@@ -0,0 +1,67 @@
+"""
+Pruebas de la lista paginada de pendientes de validación (routers/admin.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from app.utils.security import create_access_token
+
+# Ventana de fechas propia de la prueba: solo incluye los usuarios que crea
+_WINDOW = {
+    "role": "client",
+    "created_from": "2001-01-01T00:00:00Z",
+    "created_to": "2001-01-02T00:00:00Z",
+}
+
+
+@pytest.fixture
+def admin_headers():
+    """Admin y tres clientes pendientes creados en la BD; se eliminan al terminar."""
+    prefix = f"pending-{uuid.uuid4().hex[:12]}"
+    with engine.begin() as conn:
+        admin_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id, "
+                "is_active, is_validated, validated_at) "
+                "SELECT :email, 'x', 'Prueba', 'Admin', id, true, true, now() "
+                "FROM roles WHERE name = 'admin' RETURNING id"
+            ),
+            {"email": f"{prefix}-admin@calzadojyr.com"},
+        ).scalar_one()
+        for hour in range(3):
+            conn.execute(
+                text(
+                    "INSERT INTO users (email, hashed_password, name, last_name, role_id, "
+                    "created_at) "
+                    "SELECT :email, 'x', 'Prueba', 'Pendiente', id, "
+                    "'2001-01-01T00:00:00Z'::timestamptz + make_interval(hours => :hour) "
+                    "FROM roles WHERE name = 'client'"
+                ),
+                {"email": f"{prefix}-{hour}@calzadojyr.com", "hour": hour},
+            )
+    token = create_access_token(
+        {"sub": f"{prefix}-admin@calzadojyr.com", "uid": str(admin_id), "role": "admin", "ver": 0}
+    )
+    yield {"Authorization": f"Bearer {token}"}
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email LIKE :p"), {"p": f"{prefix}-%"})
+
+
+def test_estimacion_solo_en_la_primera_pagina(client, admin_headers, query_budget):
+    url = "/api/v1/admin/users/pending-validation"
+    first = client.get(url, params={**_WINDOW, "limit": 2}, headers=admin_headers).json()
+    assert len(first["items"]) == 2
+    assert first["total_estimate"] is not None
+
+    # Sin EXPLAIN: la página siguiente es una sola consulta
+    with query_budget(1):
+        params = {**_WINDOW, "limit": 2, "cursor": first["next_cursor"]}
+        response = client.get(url, params=params, headers=admin_headers)
+    second = response.json()
+    assert len(second["items"]) == 1
+    assert second["total_estimate"] is None
+    assert second["next_cursor"] is None
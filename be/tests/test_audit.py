@@ -0,0 +1,29 @@
+"""
+Pruebas del registro de auditoría (utils/audit.py).
+"""
+
+import io
+import json
+import logging
+import uuid
+
+from app.utils.audit import audit, audit_logger
+
+
+def test_auditoria_se_escribe_al_arrancar(client):
+    # El lifespan (fixture `client`) configura el logger de auditoría
+    # (pytest agrega sus propios handlers de captura después)
+    handler = audit_logger.handlers[0]
+    assert type(handler) is logging.StreamHandler
+    stream = io.StringIO()
+    previous = handler.setStream(stream)
+    try:
+        actor_id = uuid.uuid4()
+        audit("users.bulk_activate", actor_id, user_ids=[1, 2])
+    finally:
+        handler.setStream(previous)
+
+    record = json.loads(stream.getvalue())
+    assert record["action"] == "users.bulk_activate"
+    assert record["actor_id"] == str(actor_id)
+    assert record["user_ids"] == [1, 2]
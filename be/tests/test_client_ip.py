@@ -0,0 +1,32 @@
+"""
+Pruebas de la IP del cliente detrás de proxies de confianza (utils/client_ip.py).
+"""
+
+from starlette.requests import Request
+
+from app.utils.client_ip import client_ip, parse_networks
+
+_PROXIES = parse_networks("172.16.0.0/12, 10.0.0.5")
+
+
+def _request(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 5000), "headers": headers})
+
+
+def test_sin_proxies_usa_la_conexion():
+    assert client_ip(_request("172.18.0.3", "203.0.113.7"), trusted=()) == "172.18.0.3"
+
+
+def test_conexion_no_confiable_ignora_el_header():
+    assert client_ip(_request("198.51.100.9", "203.0.113.7"), trusted=_PROXIES) == "198.51.100.9"
+
+
+def test_proxy_confiable_usa_el_ultimo_salto_no_confiable():
+    # El cliente falsificó "1.2.3.4"; nginx (10.0.0.5) agregó la IP real
+    request = _request("172.18.0.3", "1.2.3.4, 203.0.113.7, 10.0.0.5")
+    assert client_ip(request, trusted=_PROXIES) == "203.0.113.7"
+
+
+def test_proxy_confiable_sin_header():
+    assert client_ip(_request("172.18.0.3"), trusted=_PROXIES) == "172.18.0.3"
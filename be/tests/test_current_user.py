@@ -0,0 +1,50 @@
+"""
+Pruebas de `get_current_user` con la caché de principals (app/dependencies.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.principal_cache import invalidate_principal
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def user():
+    """Empleado activo creado directamente en la BD; se elimina al terminar."""
+    email = f"principal-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id, "
+                "is_active, is_validated, validated_at) "
+                "SELECT :email, 'x', 'Prueba', 'Principal', id, true, true, now() "
+                "FROM roles WHERE name = 'employee' RETURNING id"
+            ),
+            {"email": email},
+        ).scalar_one()
+    yield {"sub": email, "uid": str(user_id), "role": "employee"}
+    invalidate_principal(email)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+
+def _me(client, claims: dict, version: int):
+    token = create_access_token({**claims, "ver": version})
+    return client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_token_nuevo_con_principal_en_cache(client, user):
+    assert _me(client, user, 0).status_code == 200  # queda en la caché con versión 0
+
+    # Otro worker cambió la contraseña: versión 1 en la BD y un token nuevo
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE users SET token_version = 1 WHERE id = :id"), {"id": user["uid"]}
+        )
+
+    assert _me(client, user, 1).status_code == 200
+    assert _me(client, user, 0).status_code == 401
@@ -0,0 +1,153 @@
+"""
+Pruebas de la outbox de emails (services/email_outbox.py): el email de recuperación
+se encola sin token y el enlace se arma al enviarlo; ningún token llega a la BD ni
+a la consola en claro.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete, select, text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models.email_outbox import EmailOutbox
+from app.models.password_reset_token import PasswordResetToken
+from app.services.auth_service import render_password_reset_email, request_password_reset
+from app.services.email_outbox import EmailDispatcher
+from app.utils.email import PASSWORD_RESET_TEMPLATE, ConsoleMailer, OutgoingEmail
+from app.utils.security import hash_reset_token
+
+
+class _FailingMailer:
+    async def send(self, email: OutgoingEmail) -> None:
+        raise ConnectionRefusedError("SMTP caído")
+
+
+class _RecordingMailer:
+    def __init__(self) -> None:
+        self.sent: list[OutgoingEmail] = []
+
+    async def send(self, email: OutgoingEmail) -> None:
+        self.sent.append(email)
+
+
+@pytest.fixture
+async def outbox(async_db_engine):
+    """Inserta filas de prueba en la outbox y las elimina al terminar."""
+    recipients = []
+
+    async def add(age_seconds: float = 0, status: str = "pending") -> uuid.UUID:
+        recipient = f"outbox-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+        recipients.append(recipient)
+        row = EmailOutbox(recipient=recipient, subject="Prueba", body="Hola", status=status)
+        async with AsyncSessionLocal() as db:
+            db.add(row)
+            await db.flush()
+            await db.execute(
+                text(
+                    "UPDATE email_outbox SET created_at = now() - make_interval(secs => :age) "
+                    "WHERE id = :id"
+                ),
+                {"age": age_seconds, "id": row.id},
+            )
+            await db.commit()
+        return row.id
+
+    yield add
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(EmailOutbox).where(EmailOutbox.recipient.in_(recipients)))
+        await db.commit()
+
+
+@pytest.fixture
+def user(async_db_engine):
+    """Usuario creado directamente en la BD; al eliminarlo se van sus tokens y emails."""
+    email = f"outbox-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id) "
+                "SELECT :email, 'x', 'Prueba', 'Outbox', id FROM roles WHERE name = 'client' "
+                "RETURNING id"
+            ),
+            {"email": email},
+        ).scalar_one()
+    yield user_id, email
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+
+async def _row(outbox_id: uuid.UUID) -> EmailOutbox | None:
+    async with AsyncSessionLocal() as db:
+        return (
+            await db.execute(select(EmailOutbox).where(EmailOutbox.id == outbox_id))
+        ).scalar_one_or_none()
+
+
+async def test_recuperacion_se_encola_sin_token(user):
+    user_id, email = user
+    async with AsyncSessionLocal() as db:
+        await request_password_reset(db, email)
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(select(EmailOutbox).where(EmailOutbox.recipient == email))
+        ).scalar_one()
+        tokens = (
+            await db.execute(
+                select(PasswordResetToken.token_hash).where(PasswordResetToken.user_id == user_id)
+            )
+        ).all()
+    assert (row.template, row.user_id, row.body) == (PASSWORD_RESET_TEMPLATE, user_id, None)
+    assert tokens == []
+
+    dispatcher = EmailDispatcher(batch_size=1000, poll_seconds=1)
+    dispatcher.register_template(PASSWORD_RESET_TEMPLATE, render_password_reset_email)
+    dispatcher.mailer = mailer = _RecordingMailer()
+    await dispatcher.dispatch_once()
+
+    [sent] = [sent for sent in mailer.sent if sent.recipient == email]
+    token = sent.body.split("token=")[1].split()[0]
+    async with AsyncSessionLocal() as db:
+        stored = (
+            await db.execute(
+                select(PasswordResetToken.token_hash).where(PasswordResetToken.user_id == user_id)
+            )
+        ).scalar_one()
+    assert stored == hash_reset_token(token)
+    assert await _row(row.id) is None
+
+
+async def test_consola_oculta_el_token(capsys):
+    email = OutgoingEmail("a@calzadojyr.com", "Prueba", "Enlace: https://x/reset?token=secreto&a=1")
+    await ConsoleMailer().send(email)
+
+    printed = capsys.readouterr().out
+    assert "secreto" not in printed
+    assert "token=[oculto]&a=1" in printed
+
+
+async def test_agotar_intentos_marca_fallido(outbox, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 1)
+    outbox_id = await outbox()
+    dispatcher = EmailDispatcher(batch_size=1000, poll_seconds=1)
+    dispatcher.mailer = _FailingMailer()
+    await dispatcher.dispatch_once()
+
+    row = await _row(outbox_id)
+    assert row.status == "failed"
+    assert row.last_error.startswith("ConnectionRefusedError")
+
+
+async def test_purga_vencidos_y_fallidos_viejos(outbox):
+    max_age = settings.EMAIL_OUTBOX_MAX_AGE_SECONDS
+    retention = settings.EMAIL_OUTBOX_FAILED_RETENTION_SECONDS
+    fresh = await outbox()
+    expired = await outbox(age_seconds=max_age + 60)
+    old_failed = await outbox(age_seconds=retention + 60, status="failed")
+
+    await EmailDispatcher(batch_size=1, poll_seconds=1).purge_once()
+
+    assert (await _row(fresh)).status == "pending"
+    assert (await _row(expired)).status == "failed"
+    assert await _row(old_failed) is None
@@ -0,0 +1,43 @@
+"""
+Pruebas de los errores de BD de `apply_movement` (services/inventory_service.py).
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.database import AsyncSessionLocal
+from app.schemas.inventory import InventoryMovementCreate
+from app.services.inventory_service import apply_movement
+
+
+async def _entrada(product_id: uuid.UUID, user_id: uuid.UUID, amount: str):
+    data = InventoryMovementCreate(
+        product_id=product_id, type_of_movement="entrada", size="40", amount=Decimal(amount)
+    )
+    async with AsyncSessionLocal() as db:
+        return await apply_movement(db, data, user_id)
+
+
+async def test_stock_fuera_de_rango(async_db_engine, product):
+    product_id, user_id = product
+    assert (await _entrada(product_id, user_id, "99999999.99")).stock == Decimal("99999999.99")
+    with pytest.raises(HTTPException) as error:
+        await _entrada(product_id, user_id, "1")
+    assert error.value.status_code == 409
+
+
+async def test_producto_inexistente(async_db_engine, product):
+    _, user_id = product
+    with pytest.raises(HTTPException) as error:
+        await _entrada(uuid.uuid4(), user_id, "1")
+    assert error.value.status_code == 404
+
+
+async def test_usuario_inexistente_no_es_producto_no_encontrado(async_db_engine, product):
+    product_id, _ = product
+    with pytest.raises(HTTPException) as error:
+        await _entrada(product_id, uuid.uuid4(), "1")
+    assert error.value.status_code == 401
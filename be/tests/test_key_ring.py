@@ -0,0 +1,76 @@
+"""
+Pruebas del llavero JWT con llaves asimétricas (utils/security.py).
+"""
+
+import warnings
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from app.config import settings
+from app.utils.security import KeyRing
+
+
+def _write_key(path, *, public_only: bool = False):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if public_only:
+        pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    else:
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    path.write_bytes(pem)
+    return key
+
+
+@pytest.fixture
+def rs256(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ALGORITHM", "RS256")
+    monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "2026-01")
+    return tmp_path
+
+
+def test_verifica_con_la_llave_publica(rs256):
+    _write_key(rs256 / "2026-01.pem")
+    key_ring = KeyRing()
+    kid, signing_key = key_ring.signing_key()
+    token = jwt.encode({"sub": "a"}, signing_key, algorithm="RS256", headers={"kid": kid})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        verification_key = key_ring.verification_key(kid)
+        assert verification_key.is_public()
+        assert jwt.decode(token, verification_key, algorithms=["RS256"])["sub"] == "a"
+
+
+def test_llave_retirada_solo_publica(rs256):
+    _write_key(rs256 / "2026-01.pem")
+    retired = _write_key(rs256 / "2025-07.pem", public_only=True)
+    old_token = jwt.encode(
+        {"sub": "a"},
+        retired.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        algorithm="RS256",
+        headers={"kid": "2025-07"},
+    )
+
+    key_ring = KeyRing()
+    payload = jwt.decode(old_token, key_ring.verification_key("2025-07"), algorithms=["RS256"])
+    assert payload["sub"] == "a"
+    assert {key["kid"] for key in key_ring.jwks["keys"]} == {"2025-07", "2026-01"}
+
+
+def test_llave_activa_solo_publica_falla(rs256):
+    _write_key(rs256 / "2026-01.pem", public_only=True)
+    with pytest.raises(RuntimeError, match="llave privada"):
+        KeyRing().load()
@@ -0,0 +1,31 @@
+"""
+Pruebas de la cadena de migraciones (alembic/versions) contra el código.
+"""
+
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.database import SCHEMA_REVISION
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _scripts() -> ScriptDirectory:
+    return ScriptDirectory.from_config(Config(str(_BACKEND_DIR / "alembic.ini")))
+
+
+def test_head_es_la_revision_esperada():
+    assert _scripts().get_heads() == [SCHEMA_REVISION]
+
+
+def test_db_init_queda_en_la_ultima_revision():
+    schema_version = (_BACKEND_DIR.parent / "db/init/03_schema_version.sql").read_text()
+    assert f"SELECT '{SCHEMA_REVISION}'" in schema_version
+
+
+def test_cadena_lineal_desde_la_linea_base():
+    revisions = list(_scripts().walk_revisions())
+    assert revisions[-1].revision == "0001_baseline"
+    assert all(len(revision.nextrev) <= 1 for revision in revisions)
@@ -0,0 +1,41 @@
+"""
+Pruebas del acceso a monitoreo (`require_monitoring_access` en app/dependencies.py):
+el liveness es público y /metrics y los diagnósticos de salud no.
+"""
+
+import pytest
+
+from app import dependencies
+from app.config import settings
+from app.utils.client_ip import parse_networks
+
+_TOKEN = "token-de-monitoreo"
+
+
+@pytest.fixture
+def monitoring_token(monkeypatch):
+    monkeypatch.setattr(settings, "MONITORING_TOKEN", _TOKEN)
+
+
+def test_liveness_publico(client):
+    assert client.get("/api/v1/health").status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/api/v1/health/db", "/api/v1/health/rate-limit"])
+def test_diagnosticos_requieren_token(client, monitoring_token, path):
+    assert client.get(path).status_code == 403
+    wrong = {"Authorization": "Bearer otro"}
+    assert client.get(path, headers=wrong).status_code == 403
+    right = {"Authorization": f"Bearer {_TOKEN}"}
+    assert client.get(path, headers=right).status_code == 200
+
+
+def test_sin_token_configurado_no_acepta_bearer_vacio(client):
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 403
+
+
+def test_red_permitida(client, monkeypatch):
+    # El TestClient se conecta como "testclient", que no es una IP: se simula la red
+    monkeypatch.setattr(dependencies, "client_ip", lambda request: "10.1.2.3")
+    monkeypatch.setattr(dependencies, "_monitoring_networks", parse_networks("10.0.0.0/8"))
+    assert client.get("/api/v1/health/jobs").status_code == 200
@@ -0,0 +1,27 @@
+"""
+Pruebas de la escucha LISTEN/NOTIFY (utils/pg_notify.py).
+"""
+
+import asyncio
+
+from app.config import settings
+from app.utils import pg_notify
+from app.utils.pg_notify import PgListener
+
+
+async def test_error_inesperado_no_detiene_la_escucha(monkeypatch, caplog):
+    async def connect(dsn):
+        raise ValueError("dsn inválido")
+
+    monkeypatch.setattr(pg_notify.asyncpg, "connect", connect)
+    listener = PgListener(settings.DATABASE_URL)
+    listener.subscribe("canal_de_prueba", lambda payload: None)
+    listener.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert not listener._task.done()
+        assert listener.reconnects == 1
+    finally:
+        await listener.stop()
+    [record] = [r for r in caplog.records if r.name == "app.pg_notify"]
+    assert record.exc_info[1].args == ("dsn inválido",)
@@ -0,0 +1,26 @@
+"""
+Pruebas del presupuesto de consultas SQL (app/pytest_query_budget.py).
+"""
+
+import pytest
+
+from app.services.catalog_cache import type_document_catalog
+from app.utils.query_inspector import QueryBudgetExceeded
+
+
+@pytest.mark.query_budget(1)
+def test_tipos_documento_en_una_consulta(client):
+    type_document_catalog.invalidate()
+    assert client.get("/api/v1/type-documents").status_code == 200
+
+
+def test_tipos_documento_desde_cache(client, query_budget):
+    client.get("/api/v1/type-documents")
+    with query_budget(0):
+        assert client.get("/api/v1/type-documents").status_code == 200
+
+
+def test_presupuesto_excedido_falla(client, query_budget):
+    type_document_catalog.invalidate()
+    with pytest.raises(QueryBudgetExceeded, match="presupuesto: 0"), query_budget(0):
+        client.get("/api/v1/type-documents")
@@ -0,0 +1,71 @@
+"""
+Pruebas de la rotación y revocación de refresh tokens (services/auth_service.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.principal_cache import invalidate_principal
+from app.utils.security import hash_password
+
+_PASSWORD = "Prueba123"
+
+
+@pytest.fixture
+def credentials():
+    """Cliente activo con contraseña conocida, creado en la BD; se elimina al terminar."""
+    email = f"refresh-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id, is_active) "
+                "SELECT :email, :hash, 'Prueba', 'Refresh', id, true "
+                "FROM roles WHERE name = 'client' RETURNING id"
+            ),
+            {"email": email, "hash": hash_password(_PASSWORD)},
+        ).scalar_one()
+    yield {"email": email, "password": _PASSWORD}
+    invalidate_principal(email)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+
+def _login(client, credentials: dict) -> dict:
+    response = client.post("/api/v1/auth/login", json=credentials)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _refresh(client, refresh_token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_reutilizar_un_refresh_token_revoca_la_familia(client, credentials):
+    first = _login(client, credentials)["refresh_token"]
+    second = _refresh(client, first)
+    assert second.status_code == 200
+
+    assert _refresh(client, first).status_code == 401
+    assert _refresh(client, second.json()["refresh_token"]).status_code == 401
+
+
+def test_cambiar_contrasena_cierra_las_sesiones(client, credentials):
+    other_session = _login(client, credentials)
+    tokens = _login(client, credentials)
+
+    response = client.post(
+        "/api/v1/auth/change-password",
+        json={"current_password": _PASSWORD, "new_password": "Nueva12345"},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert response.status_code == 200
+
+    assert _refresh(client, other_session["refresh_token"]).status_code == 401
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+    me = client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {other_session['access_token']}"}
+    )
+    assert me.status_code == 401
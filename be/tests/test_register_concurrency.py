@@ -0,0 +1,45 @@
+"""
+Prueba de concurrencia del registro (services/auth_service.py): el mismo email
+registrado en paralelo crea un solo usuario y responde 400 al resto, sin 500.
+Versión acotada de scripts/stress_duplicate_registration.py.
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+
+import httpx
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.user import User
+
+# Menos que PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT: sin respuestas 503.
+# Cada registro hashea la contraseña (bcrypt) antes del INSERT: pocos bastan.
+_CONCURRENCY = 8
+
+
+@pytest.fixture
+async def email(async_db_engine):
+    email = f"stress-{uuid.uuid4().hex[:12]}@calzadojyr.com"
+    yield email
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email == email))
+        await db.commit()
+
+
+async def test_registro_duplicado_concurrente(email):
+    payload = {"email": email, "name": "Stress", "last_name": "Test", "password": "Stress123"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(client.post("/api/v1/auth/register", json=payload) for _ in range(_CONCURRENCY))
+        )
+
+    statuses = Counter(response.status_code for response in responses)
+    assert statuses == Counter({201: 1, 400: _CONCURRENCY - 1})
+    async with AsyncSessionLocal() as db:
+        created = (await db.execute(select(func.count()).where(User.email == email))).scalar_one()
+    assert created == 1
@@ -0,0 +1,30 @@
+"""
+Prueba del tiempo de arranque (app/startup_profile.py): importar `app.main` cabe en
+el presupuesto y no carga las librerías que la app importa en el primer uso.
+
+Routers y modelos siguen importándose al arrancar: FastAPI necesita todas las
+rutas y todos los mappers al construir la app, y la mayor parte del tiempo que
+queda (fastapi, SQLAlchemy, email_validator) también la requiere armar las rutas.
+"""
+
+import statistics
+
+from app.startup_profile import LAZY_MODULES, profile_import
+
+# Mismo presupuesto que el README (`--budget-ms 1500`), mediana de 3 procesos
+_BUDGET_MS = 1500
+_RUNS = 3
+
+
+def test_import_de_app_main():
+    runs = [profile_import("app.main") for _ in range(_RUNS)]
+
+    totals_ms = [
+        next(row.cumulative_us for row in rows if row.module == "app.main") / 1000
+        for rows in runs
+    ]
+    assert statistics.median(totals_ms) <= _BUDGET_MS
+
+    for rows in runs:
+        loaded = {row.module.split(".")[0] for row in rows}
+        assert [name for name in LAZY_MODULES if name in loaded] == []
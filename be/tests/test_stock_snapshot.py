@@ -0,0 +1,146 @@
+"""
+Pruebas del snapshot de stock (services/stock_snapshot.py): snapshot + cola coincide
+con `inventory.amount` antes y después de sumar, y el refresco no deja el lock tomado.
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text
+
+from app.database import AsyncSessionLocal, engine
+from app.models.inventory import Inventory
+from app.schemas.inventory import InventoryMovementCreate
+from app.services import stock_snapshot
+from app.services.inventory_service import apply_movement
+from app.services.stock_snapshot import StockSnapshotter, ledger_stock
+
+_CHECKPOINT = text("SELECT movement_xid, movement_id FROM inventory_snapshot_checkpoint")
+
+
+async def _move(product, type_of_movement: str, size: str, colour: str | None, amount: str):
+    product_id, user_id = product
+    data = InventoryMovementCreate(
+        product_id=product_id,
+        type_of_movement=type_of_movement,
+        size=size,
+        colour=colour,
+        amount=Decimal(amount),
+    )
+    async with AsyncSessionLocal() as db:
+        return await apply_movement(db, data, user_id)
+
+
+async def _fold() -> None:
+    assert await StockSnapshotter(interval_seconds=0, batch_size=2).run_once() is not None
+
+
+async def _ledger(product_id: uuid.UUID) -> dict:
+    async with AsyncSessionLocal() as db:
+        rows = await ledger_stock(db, product_id)
+    return {(row.size, row.colour): row.amount for row in rows}
+
+
+async def _inventory(product_id: uuid.UUID) -> dict:
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Inventory.size, Inventory.colour, Inventory.amount).where(
+                Inventory.product_id == product_id, Inventory.deleted_at.is_(None)
+            )
+        )
+    return {(row.size, row.colour): row.amount for row in rows}
+
+
+async def test_lote_fallido_libera_el_lock(async_db_engine, monkeypatch):
+    snapshotter = StockSnapshotter(interval_seconds=0, batch_size=100)
+    monkeypatch.setattr(stock_snapshot, "_REFRESH_BATCH", text("SELECT 1 / 0"))
+    with pytest.raises(Exception, match="division by zero"):
+        await snapshotter.run_once()
+
+    monkeypatch.undo()
+    assert await snapshotter.run_once() is not None
+    assert snapshotter.skipped == 0
+
+
+async def test_snapshot_mas_cola_igual_a_inventory(async_db_engine, product):
+    product_id = product[0]
+    await _move(product, "entrada", "40", None, "10")
+    await _move(product, "entrada", "41", "rojo", "5")
+    await _move(product, "salida", "40", None, "3")
+    await _fold()
+    # Después del checkpoint: quedan en la cola
+    await _move(product, "ajuste", "41", "rojo", "-2")
+    await _move(product, "entrada", "40", None, "1.5")
+
+    expected = {("40", None): Decimal("8.50"), ("41", "rojo"): Decimal("3.00")}
+    assert await _inventory(product_id) == expected
+    assert await _ledger(product_id) == expected
+
+    await _fold()
+    assert await _ledger(product_id) == expected
+
+
+async def test_la_cola_cuenta_antes_de_sumarse(async_db_engine, product):
+    product_id = product[0]
+    await _fold()
+    with engine.connect() as conn:
+        before = conn.execute(_CHECKPOINT).one()
+
+    await _move(product, "entrada", "38", None, "4")
+
+    assert await _ledger(product_id) == {("38", None): Decimal("4.00")}
+    with engine.connect() as conn:
+        folded = conn.execute(
+            text("SELECT count(*) FROM inventory_stock_snapshot WHERE product_id = :p"),
+            {"p": product_id},
+        ).scalar_one()
+        after = conn.execute(_CHECKPOINT).one()
+    assert folded == 0
+    assert after == before
+
+
+async def test_reintenta_si_el_checkpoint_avanza(async_db_engine, product):
+    product_id = product[0]
+    await _move(product, "entrada", "39", "negro", "7")
+    reads = 0
+
+    class _MovingCheckpoint:
+        """Sesión que suma los movimientos pendientes justo después de leer el checkpoint."""
+
+        def __init__(self, db) -> None:
+            self.db = db
+
+        async def execute(self, stmt, params=None):
+            nonlocal reads
+            result = await self.db.execute(stmt, params)
+            if stmt is stock_snapshot._CHECKPOINT:
+                reads += 1
+                if reads == 1:
+                    await _fold()
+            return result
+
+    async with AsyncSessionLocal() as db:
+        rows = await ledger_stock(_MovingCheckpoint(db), product_id)
+
+    assert reads == 2
+    assert [(row.size, row.colour, row.amount) for row in rows] == [
+        ("39", "negro", Decimal("7.00"))
+    ]
+
+
+async def test_eliminar_un_movimiento_ya_sumado(async_db_engine, product):
+    product_id = product[0]
+    movement = (await _move(product, "entrada", "42", None, "6")).movement
+    await _move(product, "entrada", "42", None, "1")
+    await _fold()
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE inventory_movement SET deleted_at = now() WHERE id = :id"),
+            {"id": movement.id},
+        )
+
+    assert await _ledger(product_id) == {("42", None): Decimal("1.00")}
+    await _fold()
+    assert await _ledger(product_id) == {("42", None): Decimal("1.00")}
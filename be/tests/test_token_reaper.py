@@ -0,0 +1,62 @@
+"""
+Pruebas de la limpieza periódica de tokens vencidos (services/token_reaper.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from app.services import token_reaper
+from app.services.token_reaper import TokenReaper
+
+
+@pytest.fixture
+def user_id():
+    """Usuario creado directamente en la BD; al eliminarlo se van sus tokens."""
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (email, hashed_password, name, last_name, role_id) "
+                "SELECT :email, 'x', 'Prueba', 'Reaper', id FROM roles WHERE name = 'client' "
+                "RETURNING id"
+            ),
+            {"email": f"reaper-{uuid.uuid4().hex[:12]}@calzadojyr.com"},
+        ).scalar_one()
+    yield user_id
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+
+
+async def test_lote_fallido_libera_el_lock(async_db_engine, monkeypatch):
+    reaper = TokenReaper(interval_seconds=0, batch_size=100)
+    monkeypatch.setattr(token_reaper, "_REAP_BATCHES", (text("SELECT 1 / 0"),))
+    with pytest.raises(Exception, match="division by zero"):
+        await reaper.run_once()
+
+    monkeypatch.undo()
+    assert await reaper.run_once() is not None
+    assert reaper.skipped == 0
+
+
+async def test_elimina_refresh_tokens_expirados(async_db_engine, user_id):
+    family_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO refresh_tokens (jti, family_id, user_id, expires_at, used_at) "
+                "VALUES (gen_random_uuid(), :fam, :uid, now() - interval '1 day', now()), "
+                "(gen_random_uuid(), :fam, :uid, now() + interval '1 day', NULL)"
+            ),
+            {"fam": family_id, "uid": user_id},
+        )
+
+    assert await TokenReaper(interval_seconds=0, batch_size=1).run_once() >= 1
+
+    with engine.connect() as conn:
+        remaining = conn.execute(
+            text("SELECT expires_at > now() FROM refresh_tokens WHERE family_id = :fam"),
+            {"fam": family_id},
+        ).scalars().all()
+    assert remaining == [True]
@@ -122,6 +122,8 @@ CREATE TABLE IF NOT EXISTS type_document (
 --   is_active (BOOLEAN): Indica si la cuenta está activa
 --   is_validated (BOOLEAN): Indica si la cuenta fue validada por admin
 --   must_change_password (BOOLEAN): Fuerza cambio de contraseña en próximo login
+--   token_version (INTEGER): Versión de los tokens JWT; al incrementarla se
+--                            invalidan todos los tokens emitidos antes
 --   business_name (VARCHAR): Nombre del comercio/empresa (solo clientes)
 --   occupation (occupation_type): Ocupación laboral (solo empleados)
 --   validated_by (UUID): ID del admin que validó la cuenta
@@ -143,6 +145,7 @@ CREATE TABLE IF NOT EXISTS users (
     is_active BOOLEAN DEFAULT FALSE NOT NULL,
     is_validated BOOLEAN DEFAULT FALSE NOT NULL,
     must_change_password BOOLEAN DEFAULT FALSE NOT NULL,
+    token_version INTEGER DEFAULT 0 NOT NULL,
     business_name VARCHAR(255),
     occupation occupation_type,
     validated_by UUID REFERENCES users(id),
@@ -166,7 +169,8 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 -- ATRIBUTOS:
 --   id (UUID): Identificador único del token
 --   user_id (UUID): Referencia del usuario propietario del token
---   token (VARCHAR): Token único generado para el reseteo
+--   token_hash (BYTEA): SHA-256 (32 bytes) del token enviado por email;
+--                       el token en claro nunca se guarda
 --   expires_at (TIMESTAMP): Fecha y hora de expiración del token
 --   used (BOOLEAN): Indica si el token ya fue utilizado
 --   created_at (TIMESTAMP): Fecha de creación del token
@@ -174,14 +178,115 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE TABLE IF NOT EXISTS password_reset_tokens (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    token VARCHAR(255) UNIQUE NOT NULL,
+    token_hash BYTEA UNIQUE NOT NULL CHECK (octet_length(token_hash) = 32),
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
     used BOOLEAN DEFAULT FALSE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
 );
 
--- Índice en token para búsquedas rápidas
-CREATE INDEX IF NOT EXISTS idx_password_reset_tokens_token ON password_reset_tokens(token);
+-- El índice UNIQUE de token_hash resuelve el canje del token (ver 02_triggers_and_indexes.sql)
+
+-- ============================================================
+-- TABLA: refresh_tokens
+-- DESCRIPCIÓN EN ESPAÑOL:
+-- Registro de refresh tokens emitidos. Cada login abre una familia
+-- (family_id); cada /refresh marca el token actual como usado y emite
+-- uno nuevo de la misma familia. Presentar un token ya usado indica
+-- robo/reutilización y revoca la familia completa.
+--
+-- ATRIBUTOS:
+--   jti (UUID): Identificador único del token (claim jti del JWT)
+--   family_id (UUID): Familia de rotación (claim fam del JWT)
+--   user_id (UUID): Usuario propietario del token
+--   expires_at (TIMESTAMP): Fecha de expiración del token
+--   used_at (TIMESTAMP): Fecha en que se rotó (NULL = vigente)
+--   revoked_at (TIMESTAMP): Fecha de revocación (NULL = no revocado)
+--   created_at (TIMESTAMP): Fecha de emisión
+-- ============================================================
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    jti UUID PRIMARY KEY,
+    family_id UUID NOT NULL,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    used_at TIMESTAMP WITH TIME ZONE,
+    revoked_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+-- Índices para revocar por familia y por usuario
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family_id ON refresh_tokens(family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_id ON refresh_tokens(user_id);
+
+-- ============================================================
+-- TABLA: email_outbox
+-- DESCRIPCIÓN EN ESPAÑOL:
+-- Cola persistente de emails salientes (patrón outbox). El email se
+-- inserta en la misma transacción que el dato que lo origina y un
+-- despachador en segundo plano lo envía por SMTP con reintentos.
+-- Los enviados se eliminan; los que agotan sus intentos o vencen
+-- quedan con status 'failed' para revisión y se eliminan pasada la
+-- retención (EMAIL_OUTBOX_FAILED_RETENTION_SECONDS). El email de
+-- recuperación se encola como plantilla y usuario: el token y el
+-- enlace se generan al enviarlo, nunca se guardan en claro.
+--
+-- ATRIBUTOS:
+--   id (UUID): Identificador único del email
+--   recipient (VARCHAR): Destinatario
+--   subject (VARCHAR): Asunto
+--   body (TEXT): Cuerpo en texto plano (NULL si usa plantilla)
+--   template (VARCHAR): Plantilla que arma el despachador al enviar
+--   user_id (UUID): Usuario al que se refiere la plantilla
+--   status (VARCHAR): 'pending' o 'failed'
+--   attempts (INTEGER): Intentos de envío realizados
+--   next_attempt_at (TIMESTAMP): Cuándo puede intentarse de nuevo
+--   last_error (TEXT): Último error de envío
+--   created_at (TIMESTAMP): Fecha en que se encoló
+-- ============================================================
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body TEXT,
+    template VARCHAR(50),
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) DEFAULT 'pending' NOT NULL,
+    attempts INTEGER DEFAULT 0 NOT NULL,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    CONSTRAINT email_outbox_body_check CHECK (body IS NOT NULL OR template IS NOT NULL)
+);
+
+-- Índice parcial: el despachador solo busca pendientes por fecha de intento
+CREATE INDEX IF NOT EXISTS idx_email_outbox_pending
+    ON email_outbox(next_attempt_at)
+    WHERE status = 'pending';
+
+-- ============================================================
+-- TABLA: rate_limit_buckets
+-- DESCRIPCIÓN EN ESPAÑOL:
+-- Conteos de ventana deslizante compartidos entre workers para el
+-- limitador de intentos de login (LOGIN_RATE_LIMIT_BACKEND=postgres).
+-- Una fila por clave y ventana fija; la ventana deslizante se
+-- aproxima con la fila actual y la anterior.
+--
+-- ATRIBUTOS:
+--   bucket_key (VARCHAR): Clave con prefijo del contador (IP o email)
+--   window_id (BIGINT): Número de ventana fija (epoch / duración)
+--   attempts (INTEGER): Eventos contados en esa ventana
+--   expires_at (TIMESTAMP): Desde cuándo la fila puede eliminarse
+-- ============================================================
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket_key VARCHAR(320) NOT NULL,
+    window_id BIGINT NOT NULL,
+    attempts INTEGER NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (bucket_key, window_id)
+);
+
+-- Índice para eliminar en bloque las filas vencidas
+CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_expires_at
+    ON rate_limit_buckets(expires_at);
 
 -- ============================================================
 -- TABLA: supplies
@@ -330,9 +435,40 @@ CREATE TABLE IF NOT EXISTS inventory_movement (
     movement_date TIMESTAMP WITH TIME ZONE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
-    deleted_at TIMESTAMP WITH TIME ZONE
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    -- Transacción que insertó el movimiento (refresco del snapshot de stock)
+    xid xid8 NOT NULL DEFAULT pg_current_xact_id()
 );
 
+-- ============================================================
+-- TABLA: inventory_stock_snapshot
+-- Stock por variante calculado desde inventory_movement hasta
+-- el checkpoint (lo refresca el backend de forma incremental)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS inventory_stock_snapshot (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    product_id UUID NOT NULL REFERENCES products(id),
+    size VARCHAR(50),
+    colour VARCHAR(100),
+    amount NUMERIC(14, 2) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+-- ============================================================
+-- TABLA: inventory_snapshot_checkpoint
+-- Último movimiento (xid, id) incluido en inventory_stock_snapshot
+-- ============================================================
+CREATE TABLE IF NOT EXISTS inventory_snapshot_checkpoint (
+    id SMALLINT PRIMARY KEY DEFAULT 1,
+    movement_xid xid8 NOT NULL DEFAULT '0',
+    movement_id UUID NOT NULL DEFAULT '00000000-0000-0000-0000-000000000000',
+    movements_folded BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    CONSTRAINT chk_inventory_snapshot_checkpoint_single_row CHECK (id = 1)
+);
+
+INSERT INTO inventory_snapshot_checkpoint (id) VALUES (1) ON CONFLICT DO NOTHING;
+
 -- ============================================================
 -- TABLA: tasks
 -- Tareas asignadas a empleados (corte, guarnición, soladura, etc.)
@@ -515,8 +651,7 @@ CREATE INDEX IF NOT EXISTS idx_categories_name ON categories(name);
 CREATE INDEX IF NOT EXISTS idx_brands_name ON brands(name);
 CREATE INDEX IF NOT EXISTS idx_products_category_id ON products(category_id);
 CREATE INDEX IF NOT EXISTS idx_products_brand_id ON products(brand_id);
-CREATE INDEX IF NOT EXISTS idx_inventory_product_id ON inventory(product_id);
-CREATE INDEX IF NOT EXISTS idx_inventory_movement_product_id ON inventory_movement(product_id);
+-- inventory / inventory_movement por product_id: índices compuestos en 02 (sección 6)
 CREATE INDEX IF NOT EXISTS idx_inventory_movement_user_id ON inventory_movement(user_id);
 CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON orders(customer_id);
 CREATE INDEX IF NOT EXISTS idx_order_details_order_id ON order_details(order_id);
@@ -88,6 +88,13 @@ CREATE INDEX IF NOT EXISTS idx_users_role_validated
     ON users (role_id, is_validated)
     WHERE deleted_at IS NULL;
 
+-- Lista paginada de pendientes de validación (admin)
+-- ¿Qué hace? Índice parcial sobre los no validados con el orden keyset
+--            (created_at, id) detrás del rol: cada página lee solo sus filas.
+CREATE INDEX IF NOT EXISTS idx_users_pending_validation
+    ON users (role_id, created_at, id)
+    WHERE deleted_at IS NULL AND is_validated = FALSE;
+
 -- Roles activos por nombre (búsqueda de rol por nombre en login)
 CREATE INDEX IF NOT EXISTS idx_roles_name_active
     ON roles (name)
@@ -98,15 +105,14 @@ CREATE INDEX IF NOT EXISTS idx_roles_name_active
 -- SECCIÓN 3: Índices para tokens de recuperación de contraseña
 -- ══════════════════════════════════════════════════════════
 
--- ¿Qué?    Índice compuesto token + used para validar tokens ágil.
+-- ¿Qué?    El canje del token usa el índice UNIQUE de token_hash
+--           (BYTEA de 32 bytes, definido en 01_create_tables.sql).
 -- ¿Para?   Cuando el usuario hace clic en el enlace de reset, la
---           API busca el token y verifica que no fue usado.
---           Esta query combina ambas condiciones.
--- ¿Impacto? Con índice: microsegundos. Sin índice: scan completo
---           de la tabla, lento si hay miles de tokens expirados.
-CREATE INDEX IF NOT EXISTS idx_prt_token_unused
-    ON password_reset_tokens (token)
-    WHERE used = FALSE;
+--           API ejecuta UPDATE ... WHERE token_hash = $1 AND NOT used
+--           AND expires_at > now(): una búsqueda por igualdad exacta.
+-- ¿Impacto? No hace falta otro índice sobre el token: uno adicional
+--           solo duplicaría escrituras. Las claves de 32 bytes fijos
+--           ocupan menos que el VARCHAR(255) con el UUID en texto.
 
 -- Índice en user_id para invalidar todos los tokens de un usuario
 -- (útil al cambiar contraseña: marcar todos sus tokens como usados)
@@ -119,6 +125,12 @@ CREATE INDEX IF NOT EXISTS idx_prt_user_id
 CREATE INDEX IF NOT EXISTS idx_prt_expires_at
     ON password_reset_tokens (expires_at);
 
+-- Familias revocadas con tokens aún vigentes: se cargan al arrancar
+-- cada worker en el filtro de Bloom de revocaciones.
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_revoked
+    ON refresh_tokens (expires_at)
+    WHERE revoked_at IS NOT NULL;
+
 
 -- ══════════════════════════════════════════════════════════
 -- SECCIÓN 4: Check constraints de integridad de datos
@@ -179,3 +191,89 @@ BEGIN
             CHECK (expires_at > created_at);
     END IF;
 END $$;
+
+
+-- ══════════════════════════════════════════════════════════
+-- SECCIÓN 5: Notificaciones de cambios en catálogos
+-- ══════════════════════════════════════════════════════════
+
+-- ¿Qué?    Trigger que emite NOTIFY catalog_changed con el nombre
+--           de la tabla cuando cambia un catálogo.
+-- ¿Para?   Cada worker de la API guarda los catálogos en memoria y
+--           escucha este canal (LISTEN) para invalidar su copia.
+-- ¿Impacto? FOR EACH STATEMENT: un INSERT masivo notifica una sola
+--           vez. NOTIFY se entrega al confirmar la transacción, así
+--           que los workers nunca recargan datos sin confirmar.
+CREATE OR REPLACE FUNCTION notify_catalog_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('catalog_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER trg_type_document_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON type_document
+    FOR EACH STATEMENT
+EXECUTE FUNCTION notify_catalog_changed();
+
+CREATE OR REPLACE TRIGGER trg_roles_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON roles
+    FOR EACH STATEMENT
+EXECUTE FUNCTION notify_catalog_changed();
+
+
+-- ══════════════════════════════════════════════════════════
+-- SECCIÓN 6: Inventario (stock por variante e historial)
+-- ══════════════════════════════════════════════════════════
+
+-- ¿Qué?    Un índice único por variante activa (producto + talla +
+--           color) y uno compuesto por producto + fecha para el
+--           historial de movimientos.
+-- ¿Para?   La consulta de stock y el UPDATE atómico de cada
+--           movimiento buscan por (product_id, size, colour); el
+--           historial filtra por producto y ordena por fecha.
+-- ¿Impacto? UNIQUE permite el upsert de las entradas (ON CONFLICT).
+--           NULLS NOT DISTINCT (PostgreSQL 15+): la variante sin
+--           color también es única. Ambos empiezan por product_id,
+--           así que reemplazan a los índices de una sola columna.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_variant
+    ON inventory (product_id, size, colour) NULLS NOT DISTINCT
+    WHERE deleted_at IS NULL;
+
+-- `id` desempata la paginación keyset del historial
+CREATE INDEX IF NOT EXISTS idx_inventory_movement_product_date
+    ON inventory_movement (product_id, movement_date, id);
+
+-- ¿Qué?    Snapshot de stock por variante + recorrido de los
+--           movimientos posteriores a su checkpoint.
+-- ¿Para?   Calcular el stock desde el historial como snapshot +
+--           movimientos nuevos, sin sumar toda la tabla.
+-- ¿Impacto? (xid, id) es el orden en que el backend suma los
+--           movimientos (services/stock_snapshot.py).
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_stock_snapshot_variant
+    ON inventory_stock_snapshot (product_id, size, colour) NULLS NOT DISTINCT;
+
+CREATE INDEX IF NOT EXISTS idx_inventory_movement_xid
+    ON inventory_movement (xid, id);
+
+-- Movimientos eliminados (soft delete): el snapshot los suma como
+-- todos y la consulta de stock resta los que ya quedaron detrás del
+-- checkpoint. Parcial: normalmente son pocos.
+CREATE INDEX IF NOT EXISTS idx_inventory_movement_deleted
+    ON inventory_movement (xid, id)
+    WHERE deleted_at IS NOT NULL;
+
+DO $$
+BEGIN
+    -- El stock nunca queda negativo (las salidas se rechazan antes)
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_inventory_amount_non_negative'
+    ) THEN
+        ALTER TABLE inventory
+            ADD CONSTRAINT chk_inventory_amount_non_negative
+            CHECK (amount >= 0);
+    END IF;
+END $$;
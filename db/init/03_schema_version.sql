@@ -0,0 +1,21 @@
+-- ============================================================
+-- CALZADO J&R — Versión del esquema (Alembic)
+-- ============================================================
+-- ¿Qué?    Registra en `alembic_version` la revisión que
+--           corresponde al esquema creado por 01 y 02 (la
+--           última migración de be/alembic/versions).
+-- ¿Para?   Que el backend arranque (verifica esta fila al
+--           iniciar cada worker) y que `alembic upgrade head`
+--           aplique solo las migraciones posteriores.
+-- ¿Impacto? Al agregar una migración que cambie el esquema,
+--           actualizar también 01/02 y esta revisión.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS alembic_version (
+    version_num VARCHAR(32) NOT NULL,
+    CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
+);
+
+INSERT INTO alembic_version (version_num)
+SELECT '0012_stock_snapshot_deletes'
+WHERE NOT EXISTS (SELECT 1 FROM alembic_version);